@@ -0,0 +1,64 @@
+"""
+Agent events per second per core through the agent -> Twilio event path.
+
+Feeds synthetic ADK events carrying 40 ms audio chunks, with the occasional
+turn complete, through `agent_to_client_messaging` (pydantic events) and
+`agent_to_client_fast` (slotted dataclass events) with a no-op handler.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/agent_events.py
+```
+"""
+
+import asyncio
+import time
+
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+
+from agent_core.runtime.live_messaging import (
+    agent_to_client_fast,
+    agent_to_client_messaging,
+)
+
+EVENTS = 100_000
+CHUNK = b"\x00\x01" * 960  # 40 ms of 24kHz PCM
+TURN_EVERY = 50
+
+
+def _events() -> list[Event]:
+    blob = Blob(data=CHUNK, mime_type="audio/pcm;rate=24000")
+    audio = Event(
+        author="agent",
+        content=Content(role="model", parts=[Part(inline_data=blob)]),
+    )
+    complete = Event(author="agent", turn_complete=True)
+    return [complete if i % TURN_EVERY == 0 else audio for i in range(EVENTS)]
+
+
+async def _run(messaging, events: list[Event]) -> float:
+    async def live_events():
+        for event in events:
+            yield event
+
+    async def on_agent_event(_event):
+        pass
+
+    start = time.process_time()
+    await messaging(on_agent_event, live_events())
+    return time.process_time() - start
+
+
+async def main():
+    events = _events()
+    for name, messaging in (
+        ("pydantic (before)", agent_to_client_messaging),
+        ("slotted (after)", agent_to_client_fast),
+    ):
+        cpu = min([await _run(messaging, events) for _ in range(3)])
+        print(f"{name:<18} {EVENTS / cpu:>12,.0f} events/s/core")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,280 @@
+"""
+Micro-benchmarks for the Twilio <-> ADK audio path.
+
+Each case converts a stream of realistic frames: 160-byte μ-law frames
+inbound, and agent PCM chunks of varying size outbound. For every case it
+reports:
+
+- ns per frame (mean wall time) and p50/p99 latency
+- frames per second per core, from CPU time
+- allocated bytes per frame: mean tracemalloc peak while converting one
+  frame, so scratch buffers reused between frames do not count
+- allocated blocks per frame: blocks still allocated after converting one
+  frame, from tracemalloc snapshots, including the converted frame itself
+
+The executor cases stream frames from `--calls` concurrent calls through a
+`CodecExecutor` in each of its modes; "batch" is `BatchTranscoder`. They
+report frames per second of wall time instead of per core, as the work is
+spread over threads or processes, and allocations of this process only:
+for "process" that is the event loop side.
+
+Results are printed as a table and written as JSON, to compare releases.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/audio_pipeline.py --output audio-bench.json
+```
+
+To benchmark an alternative codec, add a factory to `INBOUND` or `OUTBOUND`.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+
+import numpy as np
+import soxr
+
+from voice_api.utils.audio import (
+    AudioCodecPipeline,
+    adk_pcm24k_to_twilio_ulaw8k,
+    twilio_ulaw8k_to_adk_pcm16k,
+)
+from voice_api.utils.codec_executor import CallCodec, CodecExecutor
+
+Convert = Callable[[bytes], bytes]
+
+INBOUND_FRAME = 160  # 20 ms of 8kHz μ-law
+# Agent audio chunk sizes seen from the Live API, in ms of 24kHz PCM
+OUTBOUND_CHUNK_MS = (20, 40, 60, 100, 200)
+WARMUP = 50
+# Frames per case traced with snapshots, which are slow to take
+SNAPSHOT_FRAMES = 200
+
+# Factories return a fresh converter, so streaming state starts empty
+INBOUND: dict[str, Callable[[], Convert]] = {
+    "oneshot float32": lambda: twilio_ulaw8k_to_adk_pcm16k,
+    "oneshot int16": lambda: lambda b: twilio_ulaw8k_to_adk_pcm16k(b, "int16"),
+    "pipeline LQ int16": lambda: AudioCodecPipeline("LQ", "int16").inbound,
+    "pipeline LQ float32": lambda: AudioCodecPipeline("LQ", "float32").inbound,
+    "pipeline HQ int16": lambda: AudioCodecPipeline("HQ", "int16").inbound,
+}
+OUTBOUND: dict[str, Callable[[], Convert]] = {
+    "oneshot float32": lambda: adk_pcm24k_to_twilio_ulaw8k,
+    "oneshot int16": lambda: lambda b: adk_pcm24k_to_twilio_ulaw8k(b, "int16"),
+    "pipeline LQ int16": lambda: AudioCodecPipeline("LQ", "int16").outbound,
+    "pipeline LQ float32": lambda: AudioCodecPipeline("LQ", "float32").outbound,
+    "pipeline HQ int16": lambda: AudioCodecPipeline("HQ", "int16").outbound,
+}
+EXECUTORS: dict[str, Callable[[], CodecExecutor]] = {
+    "inline": lambda: CodecExecutor("inline"),
+    "thread": lambda: CodecExecutor("thread", max_workers=4),
+    "process": lambda: CodecExecutor("process", max_workers=4),
+    "batch": lambda: CodecExecutor("batch", tick_ms=5),
+}
+DIRECTION: dict[str, Callable[[CallCodec], Callable]] = {
+    "inbound": lambda codec: codec.inbound,
+    "outbound": lambda codec: codec.outbound,
+}
+
+
+def inbound_frames(count: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 256, INBOUND_FRAME, dtype=np.uint8).tobytes()
+        for _ in range(count)
+    ]
+
+
+def outbound_frames(count: int) -> list[bytes]:
+    rng = np.random.default_rng(1)
+    return [
+        rng.integers(-8000, 8000, 24 * int(ms), dtype=np.int16).tobytes()
+        for ms in rng.choice(OUTBOUND_CHUNK_MS, count)
+    ]
+
+
+def _blocks(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> int:
+    """Blocks allocated between two snapshots and still allocated"""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+    return sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+
+
+def run_case(factory: Callable[[], Convert], frames: list[bytes]) -> dict:
+    convert = factory()
+    for frame in frames[:WARMUP]:
+        convert(frame)
+
+    latencies = np.empty(len(frames), dtype=np.int64)
+    cpu_start = time.process_time_ns()
+    for i, frame in enumerate(frames):
+        start = time.perf_counter_ns()
+        convert(frame)
+        latencies[i] = time.perf_counter_ns() - start
+    cpu_ns = time.process_time_ns() - cpu_start
+
+    # Separate pass, tracemalloc slows everything down
+    convert = factory()
+    for frame in frames[:WARMUP]:
+        convert(frame)
+    peaks = []
+    tracemalloc.start()
+    for frame in frames[:1000]:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        convert(frame)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    blocks = []
+    for frame in frames[:SNAPSHOT_FRAMES]:
+        before = tracemalloc.take_snapshot()
+        converted = convert(frame)  # noqa: F841, held for the snapshot
+        blocks.append(_blocks(before, tracemalloc.take_snapshot()))
+        del converted
+    tracemalloc.stop()
+
+    return {
+        "frames": len(frames),
+        "mean_frame_bytes": statistics.fmean(map(len, frames)),
+        "ns_per_frame": float(latencies.mean()),
+        "p50_ns": float(np.percentile(latencies, 50)),
+        "p99_ns": float(np.percentile(latencies, 99)),
+        "frames_per_second_per_core": len(frames) / (cpu_ns / 1e9) if cpu_ns else None,
+        "alloc_bytes_per_frame": statistics.fmean(peaks),
+        "alloc_blocks_per_frame": statistics.fmean(blocks),
+    }
+
+
+async def _stream(convert: Callable, frames: list[bytes], latencies: list[int]):
+    for frame in frames:
+        start = time.perf_counter_ns()
+        await convert(frame)
+        latencies.append(time.perf_counter_ns() - start)
+
+
+async def run_executor_case(
+    factory: Callable[[], CodecExecutor],
+    direction: str,
+    frames: list[bytes],
+    calls: int,
+) -> dict:
+    executor = factory()
+    await executor.prime()
+    codecs = [executor.open(f"CA{i}") for i in range(calls)]
+    converts = [DIRECTION[direction](codec) for codec in codecs]
+    # The frames are shared out, so every case converts the same total
+    per_call = [frames[i::calls] for i in range(calls)]
+    await asyncio.gather(
+        *(_stream(c, f[:WARMUP], []) for c, f in zip(converts, per_call))
+    )
+
+    latencies: list[int] = []
+    start = time.perf_counter_ns()
+    await asyncio.gather(
+        *(_stream(c, f, latencies) for c, f in zip(converts, per_call))
+    )
+    wall_ns = time.perf_counter_ns() - start
+
+    # Separate pass, tracemalloc slows everything down
+    traced = [f[:SNAPSHOT_FRAMES // calls + 1] for f in per_call]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await asyncio.gather(*(_stream(c, f, []) for c, f in zip(converts, traced)))
+    blocks = _blocks(before, tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    mean_batch = None
+    if executor.transcoder is not None and executor.transcoder.ticks:
+        mean_batch = executor.transcoder.frames / executor.transcoder.ticks
+    for codec in codecs:
+        codec.close()
+    executor.shutdown()
+    return {
+        "frames": len(latencies),
+        "calls": calls,
+        "mean_frame_bytes": statistics.fmean(map(len, frames)),
+        "ns_per_frame": statistics.fmean(latencies),
+        "p50_ns": float(np.percentile(latencies, 50)),
+        "p99_ns": float(np.percentile(latencies, 99)),
+        "frames_per_second": len(latencies) / (wall_ns / 1e9),
+        "alloc_blocks_per_frame": blocks / sum(map(len, traced)),
+        "max_queue_depth": executor.max_queue_depth,
+        "mean_batch_frames": mean_batch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--calls", type=int, default=20, help="For executor cases")
+    parser.add_argument("--filter", default="", help="Only run matching cases")
+    args = parser.parse_args()
+
+    streams = {
+        "inbound": (INBOUND, inbound_frames(args.frames)),
+        "outbound": (OUTBOUND, outbound_frames(args.frames)),
+    }
+    results = []
+    print(
+        f"{'case':<30} {'ns/frame':>10} {'p50':>8} {'p99':>8} "
+        f"{'frames/s/core':>14} {'bytes/frame':>12} {'blocks/frame':>12}"
+    )
+    for direction, (cases, frames) in streams.items():
+        for name, factory in cases.items():
+            case = f"{direction} {name}"
+            if args.filter not in case:
+                continue
+            result = {"case": case, "direction": direction, **run_case(factory, frames)}
+            results.append(result)
+            print(
+                f"{case:<30} {result['ns_per_frame']:>10.0f} "
+                f"{result['p50_ns']:>8.0f} {result['p99_ns']:>8.0f} "
+                f"{result['frames_per_second_per_core'] or 0:>14.0f} "
+                f"{result['alloc_bytes_per_frame']:>12.0f} "
+                f"{result['alloc_blocks_per_frame']:>12.1f}"
+            )
+
+    print(
+        f"\n{'case':<30} {'ns/frame':>10} {'p50':>8} {'p99':>8} "
+        f"{'frames/s':>14} {'max queue':>12} {'blocks/frame':>12}"
+    )
+    for direction, (_, frames) in streams.items():
+        for name, factory in EXECUTORS.items():
+            case = f"{direction} executor {name}"
+            if args.filter not in case:
+                continue
+            run = run_executor_case(factory, direction, frames, args.calls)
+            result = {"case": case, "direction": direction, **asyncio.run(run)}
+            results.append(result)
+            print(
+                f"{case:<30} {result['ns_per_frame']:>10.0f} "
+                f"{result['p50_ns']:>8.0f} {result['p99_ns']:>8.0f} "
+                f"{result['frames_per_second']:>14.0f} "
+                f"{result['max_queue_depth']:>12} "
+                f"{result['alloc_blocks_per_frame']:>12.1f}"
+            )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "soxr": soxr.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
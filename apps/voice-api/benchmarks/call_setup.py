@@ -0,0 +1,69 @@
+"""
+Call setup cost with and without the shared `runner_registry`.
+
+Times what `start_agent_session` does before the live connection opens:
+building the runner, creating the session and building the RunConfig.
+No model is contacted.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/call_setup.py
+```
+"""
+
+import asyncio
+import statistics
+import time
+
+from google.adk.runners import InMemoryRunner
+
+from agent_core.agents import voice_agent
+from agent_core.runtime.live_messaging import (
+    APP_NAME,
+    RunnerRegistry,
+    build_run_config,
+)
+
+CALLS = 200
+
+
+async def per_call_setup(i: int) -> None:
+    runner = InMemoryRunner(voice_agent, app_name=APP_NAME)
+    await runner.session_service.create_session(
+        app_name=APP_NAME, user_id="+15550000000", session_id=f"CA{i}"
+    )
+    build_run_config()
+
+
+async def shared_setup(registry: RunnerRegistry, i: int) -> None:
+    runner = registry.runner(voice_agent)
+    await runner.session_service.create_session(
+        app_name=APP_NAME, user_id="+15550000000", session_id=f"CA{i}"
+    )
+    registry.run_config()
+    await registry.end_session(voice_agent, "+15550000000", f"CA{i}")
+
+
+async def main():
+    before = []
+    for i in range(CALLS):
+        start = time.perf_counter()
+        await per_call_setup(i)
+        before.append(time.perf_counter() - start)
+
+    registry = RunnerRegistry()
+    prepare_seconds = registry.prepare([voice_agent])
+    after = []
+    for i in range(CALLS):
+        start = time.perf_counter()
+        await shared_setup(registry, i)
+        after.append(time.perf_counter() - start)
+
+    print(f"startup prepare      {prepare_seconds * 1e3:>8.3f} ms once")
+    print(f"per-call runner      {statistics.median(before) * 1e3:>8.3f} ms/call")
+    print(f"shared registry      {statistics.median(after) * 1e3:>8.3f} ms/call")
+    print(f"registry-reported    {registry.seconds_saved * 1e3 / CALLS:>8.3f} ms/call saved")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""
+Cold start of `voice_api.main:app`: import cost per module, and time until
+the server is healthy and ready.
+
+1. Imports `voice_api.main` in a fresh interpreter with `-X importtime` and
+   sums the import time per package (fastapi, twilio, numpy, soxr,
+   google.adk, ...). Settings are parsed while `voice_api.config.settings` is
+   imported, so that module is listed as well.
+2. Starts uvicorn in a fresh process and polls `/health/` and
+   `/health/ready`, reporting the time from process start to the first 200
+   of each, and the warmup step timings.
+
+The Twilio settings must be set, e.g. from `.env`. No model is contacted.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/cold_start.py --runs 3
+```
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+TOP_PACKAGES = 15
+# Modules reported on their own, beside the package totals
+MODULES = ["voice_api.config.settings", "voice_api.routers.twilio"]
+TIMEOUT = 120.0  # seconds
+
+
+def import_times() -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for each module `voice_api.main` imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import voice_api.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, module = line.removeprefix("import time:").split("|")
+        times.append((module.strip(), int(own), int(cumulative)))
+    return times
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    return ".".join(parts[:2] if parts[0] == "google" else parts[:1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> tuple[int, dict] | None:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as ex:
+        return ex.code, json.load(ex)
+    except OSError:  # not listening yet
+        return None
+
+
+def time_to_ready() -> tuple[float, float, dict]:
+    """Seconds from process start to healthy and to ready, and the warmup"""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "voice_api.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    healthy = None
+    try:
+        while time.perf_counter() - start < TIMEOUT:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with {server.returncode}")
+            if healthy is None:
+                if (_get(f"{base}/") or (0,))[0] == 200:
+                    healthy = time.perf_counter() - start
+            else:
+                status, body = _get(f"{base}/ready") or (0, {})
+                if status == 200:
+                    return healthy, time.perf_counter() - start, body
+                if body.get("status") == "failed":
+                    raise RuntimeError(f"Warmup failed: {body['error']}")
+            time.sleep(0.01)
+        raise TimeoutError("Server not ready")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="server starts to time")
+    args = parser.parse_args()
+
+    times = import_times()
+    total = max(cumulative for _, _, cumulative in times)
+    packages: dict[str, int] = {}
+    for module, own, _ in times:
+        packages[_package(module)] = packages.get(_package(module), 0) + own
+    print(f"import voice_api.main: {total / 1000:.0f} ms")
+    print(f"{'package':<30} {'ms':>8}")
+    for package, own in sorted(packages.items(), key=lambda p: -p[1])[:TOP_PACKAGES]:
+        print(f"{package:<30} {own / 1000:>8.1f}")
+    cumulative = {module: cumulative for module, _, cumulative in times}
+    for module in MODULES:
+        print(f"{module:<30} {cumulative.get(module, 0) / 1000:>8.1f} (cumulative)")
+
+    healthy, ready = [], []
+    for _ in range(args.runs):
+        run_healthy, run_ready, warmup = time_to_ready()
+        healthy.append(run_healthy)
+        ready.append(run_ready)
+    print()
+    print(f"first healthy /health/      {statistics.median(healthy) * 1000:>8.0f} ms")
+    print(f"first ready /health/ready   {statistics.median(ready) * 1000:>8.0f} ms")
+    print(f"warmup steps (last run)     {warmup['steps_ms']}")
+
+
+if __name__ == "__main__":
+    main()
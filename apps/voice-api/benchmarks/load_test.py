@@ -0,0 +1,275 @@
+"""
+Load test: concurrent simulated Twilio calls against `voice_api.main:app`.
+
+Starts the app in a subprocess with `LIVE_BACKEND=echo`, a fake live model
+which echoes caller audio back as 24kHz agent audio, so no model or network
+is needed. Then opens
+`--calls` websockets to `/twilio/stream`, each replaying the Twilio sequence
+`connected` -> `start` -> `media` every 20 ms -> `stop`, with speech-like
+μ-law audio.
+
+Per call it reports:
+- latency: from sending an inbound frame to receiving the outbound frame
+  echoing it (batching, transcoding, the agent and the outbound pacer)
+- jitter: standard deviation of the gaps between outbound frames. The
+  server sends ahead by up to its outbound lead, so some burstiness is
+  expected; `late` is what the caller hears
+- late: how far the latest outbound frame arrived behind its play time,
+  counting from the first frame; a late frame is a gap in the audio
+- missing: outbound frames never received; the resamplers hold back a
+  frame or two, more means audio was dropped or the call fell behind
+and the server's CPU time per call second.
+
+Run from the repository root, with the Twilio settings set, e.g. in `.env`:
+```sh
+python apps/voice-api/benchmarks/load_test.py --calls 50 --seconds 20
+```
+"""
+
+import argparse
+import asyncio
+import binascii
+import json
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+
+import numpy as np
+
+FRAME_SECONDS = 0.02
+FRAME_BYTES = 160  # 20 ms of 8kHz μ-law
+
+
+@dataclass
+class CallStats:
+    call: int
+    frames_sent: int = 0
+    frames_received: int = 0
+    latency_ms: list[float] = field(default_factory=list)
+    gaps_ms: list[float] = field(default_factory=list)
+    late_ms: float = 0.0
+
+    @property
+    def missing(self) -> int:
+        return max(0, self.frames_sent - self.frames_received)
+
+    @property
+    def jitter_ms(self) -> float:
+        return statistics.pstdev(self.gaps_ms) if len(self.gaps_ms) > 1 else 0.0
+
+
+# Server side
+
+
+def serve(port: int) -> None:
+    """Run the app on the echo backend, plus a CPU time endpoint"""
+    import uvicorn
+
+    from voice_api.main import app
+
+    app.add_api_route("/loadtest/cpu", lambda: {"cpu": time.process_time()})
+    uvicorn.run(app, port=port, log_level="warning")
+
+
+# Client side
+
+
+def caller_audio(seconds: float) -> list[bytes]:
+    """Speech-like μ-law frames: voiced harmonics in ~200 ms syllables"""
+    from voice_api.utils.audio import ulaw_encode
+
+    rate = 8000
+    t = np.arange(int(seconds * rate)) / rate
+    pitch = 120 + 20 * np.sin(2 * math.pi * 0.5 * t)
+    phase = 2 * math.pi * np.cumsum(pitch) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = 0.2 + 0.8 * np.abs(np.sin(2 * math.pi * 2.5 * t))
+    pcm = (voice * syllables * 6000).astype(np.int16)
+    ulaw = ulaw_encode(pcm).tobytes()
+    return [ulaw[i : i + FRAME_BYTES] for i in range(0, len(ulaw), FRAME_BYTES)]
+
+
+async def run_call(url: str, call: int, frames: list[bytes]) -> CallStats:
+    from websockets.asyncio.client import connect
+
+    stats = CallStats(call)
+    sent: list[float] = []
+    stream_sid = f"MZ{call:032d}"
+
+    async with connect(url, max_queue=None) as ws:
+        await ws.send(json.dumps({"event": "connected", "protocol": "Call"}))
+        start = {
+            "callSid": f"CA{call:032d}",
+            "customParameters": {"from_phone": f"+1555{call:07d}"},
+            "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000},
+        }
+        await ws.send(
+            json.dumps({"event": "start", "start": start, "streamSid": stream_sid})
+        )
+
+        async def receive():
+            first = last = None
+            async for message in ws:
+                now = time.perf_counter()
+                if json.loads(message)["event"] != "media":
+                    continue
+                index = stats.frames_received
+                if index < len(sent):
+                    stats.latency_ms.append((now - sent[index]) * 1000)
+                if last is None:
+                    first = now
+                else:
+                    stats.gaps_ms.append((now - last) * 1000)
+                    due = first + index * FRAME_SECONDS
+                    stats.late_ms = max(stats.late_ms, (now - due) * 1000)
+                last = now
+                stats.frames_received += 1
+
+        receiver = asyncio.create_task(receive())
+        begin = time.perf_counter()
+        for i, frame in enumerate(frames):
+            # Paced against the start, so delays don't accumulate
+            due = begin + i * FRAME_SECONDS
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            payload = json.dumps(
+                {
+                    "event": "media",
+                    "sequenceNumber": str(i + 2),
+                    "media": {
+                        "track": "inbound",
+                        "chunk": str(i + 1),
+                        "timestamp": str(i * 20),
+                        "payload": binascii.b2a_base64(frame, newline=False).decode(),
+                    },
+                    "streamSid": stream_sid,
+                },
+                separators=(",", ":"),
+            )
+            sent.append(time.perf_counter())
+            await ws.send(payload)
+            stats.frames_sent += 1
+
+        await asyncio.sleep(1.0)  # let the last outbound audio arrive
+        await ws.send(json.dumps({"event": "stop", "streamSid": stream_sid}))
+        receiver.cancel()
+        await asyncio.gather(receiver, return_exceptions=True)
+    return stats
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_cpu(base: str) -> float:
+    with urllib.request.urlopen(f"{base}/loadtest/cpu", timeout=5) as response:
+        return json.load(response)["cpu"]
+
+
+def _wait_ready(base: str, server: subprocess.Popen, timeout: float = 120) -> None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base}/health/ready", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError("Server not ready")
+
+
+def _pct(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else math.nan
+
+
+async def load(args) -> dict:
+    port = args.port or _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", str(port)],
+        env={**os.environ, "LIVE_BACKEND": "echo"},
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.server_logs else subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(base, server)
+        frames = caller_audio(args.seconds)
+        url = f"ws://127.0.0.1:{port}/twilio/stream"
+
+        async def staggered(call: int) -> CallStats:
+            await asyncio.sleep(args.ramp * call / args.calls)
+            return await run_call(url, call, frames)
+
+        cpu_before = _server_cpu(base)
+        wall_start = time.perf_counter()
+        calls = await asyncio.gather(*(staggered(i) for i in range(args.calls)))
+        wall = time.perf_counter() - wall_start
+        cpu = _server_cpu(base) - cpu_before
+    finally:
+        server.terminate()
+        server.wait()
+
+    latency = [ms for call in calls for ms in call.latency_ms]
+    call_seconds = args.calls * args.seconds
+    return {
+        "calls": args.calls,
+        "seconds": args.seconds,
+        "latency_ms_p50": _pct(latency, 50),
+        "latency_ms_p99": _pct(latency, 99),
+        "jitter_ms_mean": statistics.fmean(call.jitter_ms for call in calls),
+        "jitter_ms_max": max(call.jitter_ms for call in calls),
+        "late_ms_max": max(call.late_ms for call in calls),
+        "frames_missing_total": sum(call.missing for call in calls),
+        "frames_missing_max": max(call.missing for call in calls),
+        "server_cpu_seconds": cpu,
+        "server_cpu_ms_per_call_second": cpu * 1000 / call_seconds,
+        "server_cores_busy": cpu / wall,
+        "per_call": [
+            {
+                "call": call.call,
+                "latency_ms_p50": _pct(call.latency_ms, 50),
+                "latency_ms_p99": _pct(call.latency_ms, 99),
+                "jitter_ms": call.jitter_ms,
+                "late_ms": call.late_ms,
+                "frames_sent": call.frames_sent,
+                "frames_missing": call.missing,
+            }
+            for call in calls
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=20, help="concurrent calls")
+    parser.add_argument("--seconds", type=float, default=10.0, help="audio per call")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds to start all")
+    parser.add_argument("--port", type=int, help="server port, free one by default")
+    parser.add_argument("--output", help="write the full results as JSON")
+    parser.add_argument("--server-logs", action="store_true", help="show server logs")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve)
+
+    results = asyncio.run(load(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    summary = {k: v for k, v in results.items() if k != "per_call"}
+    for key, value in summary.items():
+        value = f"{value:.2f}" if isinstance(value, float) else value
+        print(f"{key:<32} {value:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Per-turn context size over a synthetic 30 minute ordering call.
+
+Appends the events a live call leaves in its session, turn by turn, to a
+`BoundedSessionService` without and with a `ContextCompactor`: transcription
+fragments from both sides, turn completions, and every few turns an
+`add_item_to_order` call whose response rewrites the whole `order` state.
+Reports what a (re)connect would send as history and how long reading the
+session back takes, every 5 minutes of call time. No model is contacted.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/long_call.py
+```
+"""
+
+import asyncio
+import json
+import time
+
+from google.adk.events import Event, EventActions
+from google.genai.types import (
+    Content,
+    FunctionCall,
+    FunctionResponse,
+    Part,
+    Transcription,
+)
+
+from agent_core.runtime.context import ContextCompactor, estimate_tokens
+from agent_core.runtime.live_messaging import APP_NAME
+from agent_core.runtime.session_store import BoundedSessionService
+
+CALL_MINUTES = 30
+TURN_SECONDS = 12
+ORDER_EVERY = 3  # turns
+REPORT_EVERY = 5  # minutes
+CALLER_FRAGMENTS = ["I'd like to", " add a large", " oat milk latte", " please."]
+AGENT_FRAGMENTS = ["Sure,", " one large", " oat milk latte.", " Anything else?"] * 2
+
+
+def _turn(turn: int, order: list[dict]) -> list[Event]:
+    events = [
+        Event(author="user", input_transcription=Transcription(text=text))
+        for text in CALLER_FRAGMENTS
+    ]
+    if turn % ORDER_EVERY == 0:
+        order.append({"item": f"latte {turn}", "quantity": 1})
+        call = FunctionCall(name="add_item_to_order", args=order[-1])
+        response = FunctionResponse(
+            name="add_item_to_order", response={"result": f"Added latte {turn}"}
+        )
+        events += [
+            Event(
+                author="menu_agent",
+                content=Content(role="model", parts=[Part(function_call=call)]),
+            ),
+            Event(
+                author="menu_agent",
+                content=Content(role="user", parts=[Part(function_response=response)]),
+                actions=EventActions(state_delta={"order": list(order)}),
+            ),
+        ]
+    events += [
+        Event(author="menu_agent", output_transcription=Transcription(text=text))
+        for text in AGENT_FRAGMENTS
+    ]
+    events.append(Event(author="menu_agent", turn_complete=True))
+    return events
+
+
+async def run(compactor: ContextCompactor | None) -> list[tuple]:
+    service = BoundedSessionService(compactor=compactor)
+    session = await service.create_session(
+        app_name=APP_NAME, user_id="+15550000000", session_id="CA1"
+    )
+    order: list[dict] = []
+    rows = []
+    turns = CALL_MINUTES * 60 // TURN_SECONDS
+    for turn in range(1, turns + 1):
+        for event in _turn(turn, order):
+            await service.append_event(session, event)
+
+        minute = turn * TURN_SECONDS / 60
+        if minute % REPORT_EVERY:
+            continue
+        start = time.perf_counter()
+        stored = await service.get_session(
+            app_name=APP_NAME, user_id="+15550000000", session_id="CA1"
+        )
+        read_ms = (time.perf_counter() - start) * 1000
+        tokens = sum(estimate_tokens(event) for event in stored.events)
+        delta_kb = (
+            sum(len(json.dumps(e.actions.state_delta)) for e in stored.events) / 1024
+        )
+        rows.append((minute, len(stored.events), tokens, delta_kb, read_ms))
+    return rows
+
+
+async def main():
+    print(
+        f"{'':<11} {'minute':>6} {'events':>7} {'tokens':>7} "
+        f"{'deltas KB':>10} {'read ms':>8}"
+    )
+    for name, compactor in (
+        ("all events", None),
+        ("compacted", ContextCompactor(max_events=200, max_tokens=8000)),
+    ):
+        for minute, events, tokens, delta_kb, read_ms in await run(compactor):
+            print(
+                f"{name:<11} {minute:>6.0f} {events:>7} {tokens:>7} "
+                f"{delta_kb:>10.1f} {read_ms:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
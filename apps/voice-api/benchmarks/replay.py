@@ -0,0 +1,198 @@
+"""
+Replay a recorded call through the bridge, and compare its timings.
+
+Recordings come from `RECORDING_DIR`; see `voice_api.utils.call_recorder`.
+The app is started in a subprocess with `LIVE_BACKEND=replay`, so the
+agent's recorded events are sent again at their recorded times, and the
+caller's recorded Twilio messages are sent to `/twilio/stream` at theirs.
+The replayed call is itself recorded, and both are summarized side by side:
+- response: from the agent's first audio of a turn to the first media
+  message to Twilio after it
+- clear: from the agent's `interrupted` to the `clear` sent to Twilio
+- outbound gap: between media messages to Twilio; long gaps mid-turn are
+  audible
+
+`--speed` replays faster than real time. The pacer still sends agent audio
+in real time, so use 1x for latency forensics and faster speeds to stress
+the bridge. With `--summary` only the recording is summarized.
+
+Run from the repository root, with the Twilio settings set, e.g. in `.env`:
+```sh
+python apps/voice-api/benchmarks/replay.py recordings/CA123-20250101T120000.jsonl.gz
+```
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from voice_api.utils.call_recorder import read_recording
+
+TIMEOUT = 120.0  # seconds
+
+
+def summarize(path: str) -> dict[str, float]:
+    """Timings of a recorded call"""
+    records = list(read_recording(path))
+    inbound = outbound = clears = 0
+    start = first_media = last_media = None
+    in_turn = False
+    # Agent events waiting for the message to Twilio they lead to
+    turn_audio = interrupted_at = None
+    response, clear, gaps = [], [], []
+    for t, source, value in records:
+        if source == "in":
+            event = json.loads(value)["event"]
+            inbound += event == "media"
+            if event == "start":
+                start = t
+        elif source == "agent":
+            if value.turn_complete or value.interrupted:
+                in_turn = False
+                turn_audio = None
+                if value.interrupted:
+                    interrupted_at = t
+            elif value.content and not in_turn:
+                in_turn = True
+                turn_audio = t
+        else:
+            event = json.loads(value)["event"]
+            if event == "clear":
+                clears += 1
+                if interrupted_at is not None:
+                    clear.append(t - interrupted_at)
+                    interrupted_at = None
+                continue
+            outbound += 1
+            if first_media is None:
+                first_media = t
+            if last_media is not None:
+                gaps.append(t - last_media)
+            last_media = t
+            if turn_audio is not None:
+                response.append(t - turn_audio)
+                turn_audio = None
+
+    def ms(values: list[float], q: float) -> float:
+        return float(np.percentile(values, q)) * 1000 if values else float("nan")
+
+    if first_media is not None:
+        first_audio = (first_media - (start or 0.0)) * 1000
+    else:
+        first_audio = float("nan")
+    return {
+        "duration_s": records[-1][0] if records else 0.0,
+        "media_in": inbound,
+        "media_out": outbound,
+        "clears": clears,
+        "first_audio_ms": first_audio,
+        "response_ms_p50": ms(response, 50),
+        "response_ms_max": ms(response, 100),
+        "clear_ms_p50": ms(clear, 50),
+        "clear_ms_max": ms(clear, 100),
+        "outbound_gap_ms_p99": ms(gaps, 99),
+        "outbound_gap_ms_max": ms(gaps, 100),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base: str, server: subprocess.Popen) -> None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIMEOUT:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base}/health/ready", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError("Server not ready")
+
+
+async def send_caller(url: str, path: str, speed: float) -> None:
+    """Send the recorded Twilio messages at their recorded times"""
+    from websockets.asyncio.client import connect
+
+    messages = [(t, msg) for t, source, msg in read_recording(path) if source == "in"]
+    async with connect(url, max_queue=None) as ws:
+
+        async def drain():
+            async for _ in ws:
+                pass
+
+        receiver = asyncio.create_task(drain())
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+        for t, message in messages:
+            await asyncio.sleep(begin + t / speed - loop.time())
+            await ws.send(message)
+        await receiver  # until the server hangs up, after the `stop`
+
+
+def replay(path: str, speed: float, server_logs: bool) -> str:
+    """Replay the recording, and return the recording of the replay"""
+    port = _free_port()
+    directory = tempfile.mkdtemp(prefix="replay-")
+    env = {
+        **os.environ,
+        "LIVE_BACKEND": "replay",
+        "LIVE_REPLAY_PATH": path,
+        "LIVE_SPEED": str(speed),
+        "RECORDING_DIR": directory,
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "voice_api.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if server_logs else subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}", server)
+        url = f"ws://127.0.0.1:{port}/twilio/stream"
+        asyncio.run(send_caller(url, path, speed))
+    finally:
+        server.terminate()
+        server.wait()
+    [replayed] = glob.glob(os.path.join(directory, "*.jsonl*"))
+    return replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recording", help="call recording, .jsonl or .jsonl.gz")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 for real time")
+    parser.add_argument("--summary", action="store_true", help="don't replay")
+    parser.add_argument("--server-logs", action="store_true", help="show server logs")
+    args = parser.parse_args()
+
+    recorded = summarize(args.recording)
+    if args.summary:
+        for key, value in recorded.items():
+            print(f"{key:<24} {value:>10.1f}")
+        return
+
+    replayed_path = replay(args.recording, args.speed, args.server_logs)
+    replayed = summarize(replayed_path)
+    print(f"{'':<24} {'recorded':>10} {'replayed':>10}")
+    for key, value in recorded.items():
+        print(f"{key:<24} {value:>10.1f} {replayed[key]:>10.1f}")
+    print(f"\nReplay recorded to {replayed_path}")
+
+
+if __name__ == "__main__":
+    main()
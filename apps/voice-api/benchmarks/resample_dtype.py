@@ -0,0 +1,78 @@
+"""
+Compare the int16 and float32 resampling paths of `AudioCodecPipeline`.
+
+Pushes one simulated call (20 ms Twilio frames in, agent-sized chunks out)
+through each pipeline and reports CPU time per call and how far the int16
+output is from the float32 reference.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/resample_dtype.py
+```
+"""
+
+import math
+import time
+
+import numpy as np
+
+from voice_api.utils.audio import AudioCodecPipeline, ulaw_encode
+
+CALL_SECONDS = 60
+INBOUND_FRAME = 160  # 20 ms of 8kHz μ-law
+OUTBOUND_CHUNK = 1920  # 40 ms of 24kHz PCM, 2 bytes per sample
+
+
+def _speech_like(sample_rate: int, seconds: float) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    x = sum(0.2 * np.sin(2 * math.pi * f * t) for f in (180, 420, 1100, 2600))
+    envelope = 0.5 + 0.5 * np.sin(2 * math.pi * 3 * t)  # syllable-ish rate
+    return (x * envelope * 32767).astype(np.int16)
+
+
+def _run_call(pipeline: AudioCodecPipeline, inbound: bytes, outbound: bytes):
+    start = time.process_time()
+    pcm16 = [
+        pipeline.inbound(inbound[i : i + INBOUND_FRAME])
+        for i in range(0, len(inbound), INBOUND_FRAME)
+    ]
+    ulaw = [
+        pipeline.outbound(outbound[i : i + OUTBOUND_CHUNK])
+        for i in range(0, len(outbound), OUTBOUND_CHUNK)
+    ]
+    cpu = time.process_time() - start
+    return cpu, b"".join(pcm16), b"".join(ulaw)
+
+
+def _snr_db(reference: bytes, other: bytes) -> float:
+    x = np.frombuffer(reference, dtype=np.int16).astype(np.float64)
+    y = np.frombuffer(other, dtype=np.int16).astype(np.float64)
+    noise = np.sum((x - y) ** 2)
+    return math.inf if noise == 0 else 10 * math.log10(np.sum(x**2) / noise)
+
+
+def main():
+    inbound = ulaw_encode(_speech_like(8000, CALL_SECONDS)).tobytes()
+    outbound = _speech_like(24000, CALL_SECONDS).tobytes()
+
+    results = {
+        dtype: _run_call(AudioCodecPipeline(dtype=dtype), inbound, outbound)
+        for dtype in ("float32", "int16")
+    }
+
+    for dtype, (cpu, _, _) in results.items():
+        print(f"{dtype:<8} {cpu * 1000:>8.1f} ms CPU per {CALL_SECONDS}s call")
+
+    _, ref_in, ref_out = results["float32"]
+    _, fast_in, fast_out = results["int16"]
+    # Compare outbound in the PCM domain by decoding both μ-law streams
+    ref_out = AudioCodecPipeline().inbound(ref_out)
+    fast_out = AudioCodecPipeline().inbound(fast_out)
+    inbound_snr = _snr_db(ref_in, fast_in)
+    outbound_snr = _snr_db(ref_out, fast_out)
+    print(f"inbound  int16 vs float32 SNR: {inbound_snr:.1f} dB")
+    print(f"outbound int16 vs float32 SNR: {outbound_snr:.1f} dB")
+
+
+if __name__ == "__main__":
+    main()
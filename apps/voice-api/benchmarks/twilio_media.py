@@ -0,0 +1,65 @@
+"""
+Per-message cost of Twilio media message handling, generic JSON against the
+fast path in `voice_api.utils.twilio_media`.
+
+Inbound is text -> μ-law bytes, outbound is μ-law bytes -> text, as
+Starlette's `receive_json`/`send_json` and the fast path do them.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/twilio_media.py
+```
+"""
+
+import base64
+import json
+import timeit
+
+from voice_api.utils.twilio_media import MediaMessageEncoder, parse_media_payload
+
+NUMBER = 100_000
+FRAME = bytes(range(160))  # 20 ms of μ-law
+STREAM_SID = "MZ" + "0" * 32
+
+
+def main():
+    inbound = json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": "2",
+            "media": {
+                "track": "inbound",
+                "chunk": "1",
+                "timestamp": "57",
+                "payload": base64.b64encode(FRAME).decode(),
+            },
+            "streamSid": STREAM_SID,
+        },
+        separators=(",", ":"),
+    )
+    encoder = MediaMessageEncoder(STREAM_SID)
+
+    cases = {
+        "inbound json.loads": lambda: base64.b64decode(
+            json.loads(inbound)["media"]["payload"]
+        ),
+        "inbound fast path": lambda: parse_media_payload(inbound),
+        # Starlette's send_json serializes like this
+        "outbound json.dumps": lambda: json.dumps(
+            {
+                "event": "media",
+                "streamSid": STREAM_SID,
+                "media": {"payload": base64.b64encode(FRAME).decode("ascii")},
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ),
+        "outbound template": lambda: encoder.encode(FRAME),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=NUMBER, repeat=5))
+        print(f"{name:<22} {seconds / NUMBER * 1e9:>8.0f} ns/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Throughput comparison of the lookup-table μ-law codec against `audioop`.
+
+Run from the repository root:
+```sh
+python apps/voice-api/benchmarks/ulaw_codec.py
+```
+"""
+
+import timeit
+
+import numpy as np
+
+from voice_api.utils.audio import ulaw_decode, ulaw_encode
+
+FRAME_SIZES = (160, 1600)  # one 20 ms Twilio frame, one 200 ms agent chunk
+NUMBER = 20_000
+
+
+def main():
+    import audioop  # audioop-lts on Python 3.13+, dev dependency only
+
+    rng = np.random.default_rng(0)
+    for samples in FRAME_SIZES:
+        mulaw = rng.integers(0, 256, samples, dtype=np.uint8).tobytes()
+        pcm = rng.integers(-32768, 32768, samples, dtype=np.int16)
+        decoded = np.empty(samples, dtype=np.float32)
+        encoded = np.empty(samples, dtype=np.uint8)
+
+        # Both sides go from the wire format to what the resampler consumes and back
+        cases = {
+            "decode audioop -> float32": lambda: (
+                np.frombuffer(audioop.ulaw2lin(mulaw, 2), dtype=np.int16).astype(
+                    np.float32
+                )
+                / 32768.0
+            ),
+            "decode table -> float32": lambda: ulaw_decode(mulaw, decoded),
+            "encode audioop": lambda: audioop.lin2ulaw(pcm.tobytes(), 2),
+            "encode table": lambda: ulaw_encode(pcm, encoded).tobytes(),
+        }
+
+        print(f"{samples} samples per frame")
+        for name, case in cases.items():
+            seconds = min(timeit.repeat(case, number=NUMBER, repeat=5))
+            ns_per_frame = seconds / NUMBER * 1e9
+            print(f"  {name:<28} {ns_per_frame:>8.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from typing import Literal
-from pydantic import Field, computed_field
+from pydantic import Field, computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 base_model_config = SettingsConfigDict(
@@ -21,6 +21,193 @@ class TwilioSettings(BaseSettings):
     phone_number: str = Field(description="The Twilio phone number")
 
 
+class AudioSettings(BaseSettings):
+    """Settings for the Twilio <-> ADK audio path."""
+
+    model_config = SettingsConfigDict(**base_model_config, env_prefix="AUDIO_")
+
+    resample_quality: Literal["QQ", "LQ", "MQ", "HQ", "VHQ"] = Field(
+        default="LQ", description="soxr quality recipe for the per-call resamplers"
+    )
+    resample_dtype: Literal["int16", "float32"] = Field(
+        default="int16",
+        description="Resample int16 directly, or via the float32 reference path",
+    )
+    codec_mode: Literal["inline", "thread", "process", "batch"] = Field(
+        default="inline",
+        description=(
+            "Transcode on the event loop, a thread pool, worker processes, "
+            "or in cross-call batches"
+        ),
+    )
+    codec_workers: int | None = Field(
+        default=None, description="Codec threads or processes, None for the default"
+    )
+    codec_tick_ms: float = Field(
+        default=5.0, description="Batch codec mode: time to gather frames per batch"
+    )
+    inbound_batch_ms: int = Field(
+        default=40,
+        description="Caller audio to coalesce per message to the model, 0 disables",
+    )
+    silence_gate: bool = Field(
+        default=False,
+        description="Drop silent caller audio instead of sending it; opt in, since "
+        "too short a hangover hides turn ends from the model's VAD",
+    )
+    silence_threshold_dbfs: float = Field(
+        default=-50.0, description="Caller frames below this energy count as silence"
+    )
+    silence_hangover_ms: int = Field(
+        default=600,
+        description="Silence still sent after speech; keep above the model's VAD",
+    )
+    activity_detection: Literal["server", "local"] = Field(
+        default="server",
+        description="Detect caller turns on the model (server) or here (local)",
+    )
+    endpoint_threshold_dbfs: float = Field(
+        default=-40.0, description="Local endpointing: speech energy threshold"
+    )
+    endpoint_min_speech_ms: int = Field(
+        default=60, description="Local endpointing: speech needed to start a turn"
+    )
+    endpoint_silence_ms: int = Field(
+        default=400, description="Local endpointing: silence needed to end a turn"
+    )
+    outbound_lead_ms: int = Field(
+        default=60,
+        description="How far ahead of real time agent audio is sent to Twilio",
+    )
+    outbound_max_ms: int = Field(
+        default=60_000,
+        description="Most agent audio buffered per call before overflow, 0 unbounded",
+    )
+    outbound_overflow: Literal["drop_oldest", "drop_newest", "block"] = Field(
+        default="drop_oldest",
+        description="What to do with agent audio beyond outbound_max_ms",
+    )
+
+    @model_validator(mode="after")
+    def check_silence_hangover(self) -> "AudioSettings":
+        # Silence the gate drops never reaches the local endpointer, so the
+        # hangover must cover the silence which ends a turn
+        if (
+            self.silence_gate
+            and self.activity_detection == "local"
+            and self.silence_hangover_ms <= self.endpoint_silence_ms
+        ):
+            raise ValueError(
+                "silence_hangover_ms must be above endpoint_silence_ms when the "
+                "silence gate is used with local activity detection"
+            )
+        return self
+
+
+class SessionSettings(BaseSettings):
+    """Settings for agent sessions."""
+
+    model_config = SettingsConfigDict(**base_model_config, env_prefix="SESSION_")
+
+    prewarm: bool = Field(
+        default=False,
+        description="Start the agent session from /twilio/connect, before the stream",
+    )
+    prewarm_timeout: float = Field(
+        default=30.0, description="Seconds until an unclaimed pre-warmed session closes"
+    )
+    warmup_wait: float = Field(
+        default=10.0,
+        description="Seconds a call waits for startup warmup before it is turned away",
+    )
+    max_sessions: int = Field(
+        default=1000,
+        description="Sessions kept in memory; keep above concurrent call capacity",
+    )
+    ttl_seconds: float = Field(
+        default=3600.0, description="Idle time after which a session is evicted"
+    )
+    archive_path: str | None = Field(
+        default=None, description="SQLite file to archive completed call sessions to"
+    )
+    resume_attempts: int = Field(
+        default=3,
+        description="Reconnects to the model after its connection drops, 0 disables",
+    )
+    resume_buffer_ms: int = Field(
+        default=5000, description="Caller audio held while reconnecting to the model"
+    )
+    context_trigger_tokens: int = Field(
+        default=32_000,
+        description="Model context size at which older turns are dropped, 0 disables",
+    )
+    context_target_tokens: int = Field(
+        default=16_000, description="Model context size kept after dropping turns"
+    )
+    history_max_events: int = Field(
+        default=200,
+        description="Session events kept per call as history, 0 keeps all",
+    )
+    history_max_tokens: int = Field(
+        default=8000, description="Estimated tokens of history kept per call"
+    )
+
+
+class LiveSettings(BaseSettings):
+    """Settings for the live model backend."""
+
+    model_config = SettingsConfigDict(**base_model_config, env_prefix="LIVE_")
+
+    backend: Literal["gemini", "echo", "script", "replay"] = Field(
+        default="gemini",
+        description="The Gemini live model, or a local fake for offline benchmarks",
+    )
+    script_paths: list[str] = Field(
+        default=[],
+        description="Fake backend: 24kHz mono WAV responses, a tone if none",
+    )
+    replay_path: str | None = Field(
+        default=None, description="Fake backend: call recording to replay the agent of"
+    )
+    think_ms: int = Field(
+        default=300, description="Fake backend: delay before each scripted response"
+    )
+    speed: float = Field(
+        default=1.0,
+        description="Fake backend: response and replay speed vs real time",
+    )
+    turn_silence_ms: int = Field(
+        default=500, description="Fake backend: caller silence ending a turn"
+    )
+
+
+class RecordingSettings(BaseSettings):
+    """Settings for recording call traffic, to replay it later."""
+
+    model_config = SettingsConfigDict(**base_model_config, env_prefix="RECORDING_")
+
+    dir: str | None = Field(
+        default=None, description="Directory to record calls to, None disables"
+    )
+    compress: bool = Field(default=True, description="Gzip the recordings")
+
+
+class TranscriptSettings(BaseSettings):
+    """Settings for storing call transcripts."""
+
+    model_config = SettingsConfigDict(**base_model_config, env_prefix="TRANSCRIPT_")
+
+    path: str | None = Field(
+        default=None, description="File to store transcripts in, None disables"
+    )
+    format: Literal["jsonl", "sqlite"] = Field(
+        default="jsonl", description="JSON Lines file or SQLite database"
+    )
+    flush_interval_ms: int = Field(
+        default=1000, description="How often pending transcript fragments are written"
+    )
+
+
 class Settings(BaseSettings):
     """The settings for Voice API."""
 
@@ -36,6 +223,11 @@ class Settings(BaseSettings):
         return self.app_environment == "LOCAL"
 
     twilio: TwilioSettings = Field(default_factory=TwilioSettings)
+    audio: AudioSettings = Field(default_factory=AudioSettings)
+    session: SessionSettings = Field(default_factory=SessionSettings)
+    live: LiveSettings = Field(default_factory=LiveSettings)
+    transcript: TranscriptSettings = Field(default_factory=TranscriptSettings)
+    recording: RecordingSettings = Field(default_factory=RecordingSettings)
 
 
 settings = Settings()
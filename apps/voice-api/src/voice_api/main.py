@@ -1,5 +1,6 @@
 """Main entry point for voice-api."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -7,13 +8,101 @@ from fastapi import FastAPI
 # from fastapi.middleware.gzip import GZipMiddleware
 # from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 
-from voice_api.routers import health_router, twilio_router
+from agent_core import agents
+
+from voice_api.config.settings import settings
+from voice_api.routers import health_router, metrics_router, twilio_router
+from voice_api.routers.twilio import (
+    codec_executor,
+    session_prewarmer,
+    transcript_sink,
+)
+from voice_api.utils.logging import logger
+from voice_api.utils.warmup import warmup
+
+
+def configure_sessions():
+    """
+    Set up agent session storage and return the session service.
+
+    Imports google-adk, which takes seconds on a cold start, so it runs as a
+    warmup step rather than at import or before the app starts serving.
+    """
+    from agent_core.runtime.context import ContextCompactor
+    from agent_core.runtime.live_messaging import runner_registry
+    from agent_core.runtime.session_store import (
+        BoundedSessionService,
+        SQLiteSessionArchive,
+    )
+
+    archive = (
+        SQLiteSessionArchive(settings.session.archive_path)
+        if settings.session.archive_path
+        else None
+    )
+    compactor = (
+        ContextCompactor(
+            settings.session.history_max_events, settings.session.history_max_tokens
+        )
+        if settings.session.history_max_events
+        else None
+    )
+    session_service = BoundedSessionService(
+        settings.session.max_sessions,
+        settings.session.ttl_seconds,
+        archive,
+        compactor,
+    )
+    runner_registry.set_session_service(session_service)
+    runner_registry.set_context_window(
+        settings.session.context_trigger_tokens, settings.session.context_target_tokens
+    )
+    return session_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """This is the startup and shutdown code for the FastAPI application."""
+    session_service = None
+    eviction_task = None
+
+    async def prepare_sessions():
+        nonlocal session_service, eviction_task
+        session_service = await asyncio.to_thread(configure_sessions)
+        # Expires idle sessions between calls, not only when a call starts
+        eviction_task = asyncio.create_task(session_service.run_eviction())
+
+    def prepare_agents():
+        from agent_core.runtime.live_messaging import runner_registry
+
+        setup_seconds = runner_registry.prepare(agents.load_agents("voice_agent"))
+        logger.info(f"Prepared agent runners in {setup_seconds * 1000:.1f} ms")
+
+    # In the background, so /health/ answers while /health/ready says warming
+    warmup_task = warmup.start(
+        [
+            ("sessions", prepare_sessions),
+            ("agents", prepare_agents),
+            ("codec", codec_executor.prime),
+        ]
+    )
     yield
+    warmup_task.cancel()
+    if eviction_task is not None:
+        eviction_task.cancel()
+    session_prewarmer.close()
+    if transcript_sink is not None:
+        await transcript_sink.close()
+    if session_service is not None:
+        from agent_core.runtime.live_messaging import runner_registry
+
+        if session_service.archive is not None:
+            session_service.archive.close()
+        logger.info(
+            f"Reusing agent runners saved {runner_registry.seconds_saved * 1000:.1f} "
+            "ms of call setup"
+        )
+    codec_executor.shutdown()
 
 
 app = FastAPI(
@@ -25,6 +114,7 @@ app = FastAPI(
 # app.add_middleware(CORSMiddleware)
 
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(twilio_router)
 
 
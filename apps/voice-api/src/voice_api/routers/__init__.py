@@ -1,4 +1,5 @@
 from .health import health_router
+from .metrics import metrics_router
 from .twilio import twilio_router
 
-__all__ = ["health_router", "twilio_router"]
+__all__ = ["health_router", "metrics_router", "twilio_router"]
@@ -1,4 +1,7 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from voice_api.utils.warmup import warmup
 
 health_router = APIRouter(prefix="/health", tags=["health"])
 
@@ -6,3 +9,9 @@ health_router = APIRouter(prefix="/health", tags=["health"])
 @health_router.get("/")
 async def health():
     return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def ready():
+    """503 until startup warmup has finished, for readiness probes"""
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from voice_api.utils.metrics import CONTENT_TYPE, registry
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics")
+async def metrics():
+    """Call metrics in the Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
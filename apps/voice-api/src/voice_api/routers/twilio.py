@@ -1,42 +1,187 @@
 import asyncio
 import base64
-from typing import Annotated
-
-from fastapi import APIRouter, Form, Request, Response, WebSocket, WebSocketDisconnect
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import (
+    APIRouter,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.params import Depends
 from fastapi.responses import HTMLResponse
 from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
 
-from agent_core.agents import voice_agent
-from agent_core.runtime.live_messaging import (
-    AgentEvent,
-    agent_to_client_messaging,
-    send_pcm_to_agent,
-    start_agent_session,
-    text_to_content,
+from agent_core import agents
+from agent_core.runtime.transcripts import (
+    JsonlTranscriptWriter,
+    SQLiteTranscriptWriter,
+    TranscriptRole,
+    TranscriptSink,
 )
 
+from voice_api.config.settings import settings
 from voice_api.entities.twilio import (
     TwilioStreamCallbackPayload,
     TwilioVoiceWebhookPayload,
 )
-from voice_api.utils.audio import (
-    adk_pcm24k_to_twilio_ulaw8k,
-    twilio_ulaw8k_to_adk_pcm16k,
-)
+from voice_api.utils import metrics
+from voice_api.utils.call_recorder import CallRecorder, agent_events
+from voice_api.utils.codec_executor import CodecExecutor
+from voice_api.utils.packetizer import OutboundPacketizer
+from voice_api.utils.prewarm import SessionPrewarmer
+from voice_api.utils.twilio_media import MediaMessageEncoder, parse_media_payload
+from voice_api.utils.vad import Endpointer, LocalTurnSender, SilenceGate
+from voice_api.utils.warmup import warmup
 from voice_api.utils.twilio_security import validate_twilio
 from voice_api.utils.logging import logger
 
+# The agent_core runtime modules other than transcripts import google-adk,
+# which takes seconds to load. They are imported inside the handlers, so the
+# warmup or the first call loads them rather than importing this router.
+if TYPE_CHECKING:
+    from agent_core.runtime.fake_live import FakeLiveBackend
+
 twilio_path = "/twilio"
 callback_path = "/callback"
 stream_path = "/stream"
 twilio_router = APIRouter(prefix=twilio_path, tags=["Twilio Webhooks"])
 
+# Shared by all calls; see CodecExecutor for the modes
+codec_executor = CodecExecutor(
+    settings.audio.codec_mode,
+    settings.audio.codec_workers,
+    settings.audio.resample_quality,
+    settings.audio.resample_dtype,
+    settings.audio.codec_tick_ms,
+)
+metrics.codec_queue_depth.set_function(lambda: codec_executor.queue_depth)
+
+
+def _fake_live_backend() -> "FakeLiveBackend | None":
+    live = settings.live
+    if live.backend == "gemini":
+        return None
+    from agent_core.runtime.fake_live import FakeLiveBackend, load_pcm
+
+    return FakeLiveBackend(
+        live.backend,
+        [load_pcm(path) for path in live.script_paths],
+        think_ms=live.think_ms,
+        speed=live.speed,
+        turn_silence_ms=live.turn_silence_ms,
+        replay=agent_events(live.replay_path) if live.replay_path else None,
+    )
+
+
+# Stands in for the live model when LIVE_BACKEND is echo, script or replay
+fake_live_backend = _fake_live_backend()
+
+
+async def start_live_session(*args, **kwargs):
+    """`start_agent_session`, or the fake backend's when one is selected"""
+    if fake_live_backend is not None:
+        return await fake_live_backend.start_session(*args, **kwargs)
+    from agent_core.runtime import live_messaging
+
+    return await live_messaging.start_agent_session(*args, **kwargs)
+
+
+async def start_call_session(from_phone: str, call_sid: str):
+    """Start the agent session for a call and ask it for the greeting"""
+    from agent_core.runtime import live_messaging
+
+    live_events, live_request_queue = await start_live_session(
+        agents.voice_agent, from_phone, call_sid, settings.audio.activity_detection
+    )
+
+    initial_message = live_messaging.text_to_content(
+        "Introduce yourself and ask the user how you can help them.", "user"
+    )
+    live_request_queue.send_content(initial_message)
+    return live_events, live_request_queue
+
+
+async def resume_call_session(from_phone: str, call_sid: str):
+    """Reconnect a call's agent session after the model connection dropped"""
+    return await start_live_session(
+        agents.voice_agent,
+        from_phone,
+        call_sid,
+        settings.audio.activity_detection,
+        resume=True,
+    )
+
+
+async def end_call_session(from_phone: str, call_sid: str):
+    if fake_live_backend is not None:
+        await fake_live_backend.end_session(agents.voice_agent, from_phone, call_sid)
+        return
+    from agent_core.runtime import live_messaging
+
+    await live_messaging.end_agent_session(agents.voice_agent, from_phone, call_sid)
+
+
+def _transcript_sink() -> TranscriptSink | None:
+    path = settings.transcript.path
+    if not path:
+        return None
+    if settings.transcript.format == "sqlite":
+        writer = SQLiteTranscriptWriter(path)
+    else:
+        writer = JsonlTranscriptWriter(path)
+    return TranscriptSink(writer, settings.transcript.flush_interval_ms / 1000)
+
+
+transcript_sink = _transcript_sink()
+
+
+def _call_recorder(call_sid: str) -> CallRecorder | None:
+    directory = settings.recording.dir
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    suffix = ".jsonl.gz" if settings.recording.compress else ".jsonl"
+    name = f"{call_sid}-{time.strftime('%Y%m%dT%H%M%S')}{suffix}"
+    return CallRecorder(os.path.join(directory, name))
+
+
+# Outbound queues of calls in progress, summed on /metrics
+active_packetizers: set[OutboundPacketizer] = set()
+metrics.outbound_queue_frames.set_function(
+    lambda: sum(packetizer.depth_frames for packetizer in active_packetizers)
+)
+
+
+# Sessions started from /connect, waiting for their media stream
+session_prewarmer = SessionPrewarmer(
+    start_call_session, end_call_session, settings.session.prewarm_timeout
+)
+
 
 @twilio_router.post("/connect", dependencies=[Depends(validate_twilio)])
-def create_call(req: Request, payload: Annotated[TwilioVoiceWebhookPayload, Form()]):
+async def create_call(
+    req: Request, payload: Annotated[TwilioVoiceWebhookPayload, Form()]
+):
     """Generate TwiML to connect a call to a Twilio Media Stream"""
 
+    # Sessions are only stored in the configured service once warm
+    try:
+        await warmup.wait(settings.session.warmup_wait)
+    except (TimeoutError, RuntimeError) as ex:
+        logger.warning(f"Turning away call {payload.CallSid}: {ex}")
+        raise HTTPException(status_code=503, detail=str(ex))
+
+    if settings.session.prewarm and payload.CallSid:
+        # Overlap session setup with Twilio connecting the media stream
+        session_prewarmer.start(payload.CallSid, payload.From, payload.CallSid)
+
     host = req.url.hostname
     ws_protocol = "wss"
     http_protocol = "https"
@@ -75,11 +220,24 @@ def twilio_callback(payload: Annotated[TwilioStreamCallbackPayload, Form()]):
 @twilio_router.websocket(stream_path)
 async def twilio_websocket(ws: WebSocket):
     """Handle Twilio Media Stream WebSocket connection"""
+    try:
+        await warmup.wait(settings.session.warmup_wait)
+    except (TimeoutError, RuntimeError) as ex:
+        logger.warning(f"Turning away media stream: {ex}")
+        await ws.close(code=1013)  # try again later
+        return
+
+    # Loaded by the warmup by now, so importing does not block the event loop
+    from agent_core.runtime import live_messaging
+    from agent_core.runtime.live_messaging import FastAgentEvent, RealtimeAudioBatcher
+    from agent_core.runtime.resumption import ResumableLiveSession
 
     await ws.accept()
-    await ws.receive_json()  # throw away `connected` event
+    accepted_at = time.monotonic()
+    connected_message = await ws.receive_text()  # only kept in recordings
 
-    start_event = await ws.receive_json()
+    start_message = await ws.receive_text()
+    start_event = json.loads(start_message)
     assert start_event["event"] == "start"
 
     # account_sid = start_event["start"]["accountSid"]
@@ -91,45 +249,174 @@ async def twilio_websocket(ws: WebSocket):
     # to_phone = start_event["start"]["customParameters"]["to_phone"]
     stream_sid = start_event["streamSid"]
 
-    live_events, live_request_queue = await start_agent_session(
-        voice_agent, from_phone, call_sid
+    recorder = _call_recorder(call_sid)
+    if recorder is not None:
+        recorder.twilio_in(connected_message)
+        recorder.twilio_in(start_message)
+
+    activity_detection = settings.audio.activity_detection
+    warm = await session_prewarmer.claim(call_sid)
+    if warm is not None:
+        logger.info(
+            f"Claimed pre-warmed session after "
+            f"{time.monotonic() - warm.started_at:.2f}s, "
+            f"{warm.buffered_events} agent events buffered"
+        )
+        live_events = warm.live_events()
+        live_request_queue = warm.live_request_queue
+    else:
+        live_events, live_request_queue = await start_call_session(
+            from_phone, call_sid
+        )
+
+    resume_buffer_bytes = (
+        settings.session.resume_buffer_ms * live_messaging.INPUT_BYTES_PER_MS
+    )
+    # Keeps the call going if the model connection drops, the Twilio leg is up
+    live_session = ResumableLiveSession(
+        live_events,
+        live_request_queue,
+        lambda: resume_call_session(from_phone, call_sid),
+        max_reconnects=settings.session.resume_attempts,
+        buffer_bytes=resume_buffer_bytes,
     )
 
-    initial_message = text_to_content(
-        "Introduce yourself and ask the user how you can help them.", "user"
+    codec = codec_executor.open(call_sid)
+    media_encoder = MediaMessageEncoder(stream_sid)
+
+    async def send_media_frame(ulaw_frame: bytes):
+        """Send one 20 ms μ-law frame to Twilio"""
+        metrics.outbound_lag_seconds.observe(packetizer.lag_seconds)
+        message = media_encoder.encode(ulaw_frame)
+        if recorder is not None:
+            recorder.twilio_out(message)
+        await ws.send_text(message)
+
+    silence_gate = SilenceGate(
+        settings.audio.silence_threshold_dbfs, settings.audio.silence_hangover_ms
+    )
+    batcher = RealtimeAudioBatcher(live_session, settings.audio.inbound_batch_ms)
+    endpointer = Endpointer(
+        settings.audio.endpoint_threshold_dbfs,
+        settings.audio.endpoint_min_speech_ms,
+        settings.audio.endpoint_silence_ms,
+    )
+
+    # Local mode marks turns itself, holding back onsets until they count
+    turn_sender = LocalTurnSender(
+        endpointer,
+        batcher.send,
+        batcher.flush,
+        live_session.send_activity_start,
+        live_session.send_activity_end,
+    )
+    send_caller_audio = (
+        batcher.send if activity_detection == "server" else turn_sender.send
     )
-    live_request_queue.send_content(initial_message)
 
-    async def handle_agent_event(event: AgentEvent):
-        """Handle outgoing AgentEvent to Twilio WebSocket"""
+    packetizer = OutboundPacketizer(
+        send_media_frame,
+        lead=settings.audio.outbound_lead_ms / 1000,
+        max_seconds=settings.audio.outbound_max_ms / 1000 or None,
+        overflow=settings.audio.outbound_overflow,
+    )
+
+    def speech_ended_at() -> float | None:
+        """When the caller last stopped speaking, as far as can be seen here"""
+        if activity_detection == "local":
+            if endpointer.last_turn_end is None:
+                return None
+            return endpointer.last_turn_end - endpointer.silence_ms / 1000
+        return silence_gate.last_speech_at
+
+    # Whether the agent's current turn has sent audio, and when the last did
+    agent_answering = False
+    answered_at: float | None = None
+
+    def on_agent_answer():
+        nonlocal answered_at
+        now = time.monotonic()
+        if answered_at is None:
+            metrics.call_setup_seconds.observe(now - accepted_at)
+        speech_end = speech_ended_at()
+        if speech_end is not None and speech_end > (answered_at or 0.0):
+            metrics.response_seconds.observe(now - speech_end)
+        answered_at = now
+
+    async def handle_agent_event(event: FastAgentEvent):
+        """Handle outgoing agent event to Twilio WebSocket"""
+        nonlocal agent_answering
 
         if event.type == "complete":
             logger.info(f"Agent turn complete at {event.timestamp}")
+            agent_answering = False
+            packetizer.flush()
             # https://www.twilio.com/docs/voice/media-streams/websocket-messages#mark-message
             return
 
         if event.type == "interrupted":
             logger.info(f"Agent interrupted at {event.timestamp}")
+            agent_answering = False
+            packetizer.clear()
+            await codec.reset_outbound()
             # https://www.twilio.com/docs/voice/media-streams/websocket-messages#send-a-clear-message
-            return await ws.send_json({"event": "clear", "streamSid": stream_sid})
-
-        ulaw_bytes = adk_pcm24k_to_twilio_ulaw8k(event.payload)
-        payload = base64.b64encode(ulaw_bytes).decode("ascii")
+            message = json.dumps({"event": "clear", "streamSid": stream_sid})
+            if recorder is not None:
+                recorder.twilio_out(message)
+            await ws.send_text(message)
+            metrics.interruptions.inc()
+            # The event was stamped on arrival, so queueing behind agent audio
+            # and the codec counts too
+            metrics.interrupt_clear_seconds.observe(time.time() - event.timestamp)
+            return
 
-        await ws.send_json(
-            {
-                "event": "media",
-                "streamSid": stream_sid,
-                "media": {"payload": payload},
-            }
-        )
+        if not agent_answering:
+            agent_answering = True
+            on_agent_answer()
+        started = time.perf_counter()
+        ulaw_bytes = await codec.outbound(event.payload)
+        metrics.outbound_codec_seconds.observe(time.perf_counter() - started)
+        overflowed = packetizer.bytes_overflowed
+        await packetizer.put(ulaw_bytes)
+        metrics.outbound_queue_seconds.observe(packetizer.buffered_seconds)
+        overflowed = packetizer.bytes_overflowed - overflowed
+        if overflowed:
+            metrics.outbound_overflow_bytes.inc(overflowed)
+
+    def on_transcript(role: TranscriptRole, text: str, finished: bool):
+        if transcript_sink is not None:
+            transcript_sink.add(call_sid, role, text, finished)
+
+    async def handle_caller_audio(mulaw_bytes: bytes):
+        if settings.audio.silence_gate:
+            frames = silence_gate.process(mulaw_bytes)
+        else:
+            if activity_detection == "server":
+                # For voice_response_seconds, local mode has the endpointer's
+                silence_gate.is_speech(mulaw_bytes)
+            frames = [mulaw_bytes]
+        for frame in frames:
+            started = time.perf_counter()
+            pcm_bytes = await codec.inbound(frame)
+            metrics.inbound_codec_seconds.observe(time.perf_counter() - started)
+            if pcm_bytes:  # empty while the resampler is filling up
+                send_caller_audio(pcm_bytes)
 
     async def websocket_loop():
         """
         Handle incoming WebSocket messages to Agent.
         """
         while True:
-            event = await ws.receive_json()
+            message = await ws.receive_text()
+            if recorder is not None:
+                recorder.twilio_in(message)
+            # Media messages skip JSON parsing, see parse_media_payload
+            mulaw_bytes = parse_media_payload(message)
+            if mulaw_bytes is not None:
+                await handle_caller_audio(mulaw_bytes)
+                continue
+
+            event = json.loads(message)
             event_type = event["event"]
 
             if event_type == "stop":
@@ -151,16 +438,23 @@ async def twilio_websocket(ws: WebSocket):
 
             elif event_type == "media":
                 payload = event["media"]["payload"]
-                mulaw_bytes = base64.b64decode(payload)
-                pcm_bytes = twilio_ulaw8k_to_adk_pcm16k(mulaw_bytes)
-                send_pcm_to_agent(pcm_bytes, live_request_queue)
+                await handle_caller_audio(base64.b64decode(payload))
 
+    metrics.calls.inc()
+    metrics.active_calls.inc()
+    active_packetizers.add(packetizer)
     try:
         websocket_coro = websocket_loop()
         websocket_task = asyncio.create_task(websocket_coro)
-        messaging_coro = agent_to_client_messaging(handle_agent_event, live_events)
+        live_events = live_session.live_events()
+        if recorder is not None:
+            live_events = recorder.tap(live_events)
+        messaging_coro = live_messaging.agent_to_client_fast(
+            handle_agent_event, live_events, on_transcript
+        )
         messaging_task = asyncio.create_task(messaging_coro)
-        tasks = [websocket_task, messaging_task]
+        pacer_task = asyncio.create_task(packetizer.run())
+        tasks = [websocket_task, messaging_task, pacer_task]
         done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
         for p in pending:
             p.cancel()
@@ -176,7 +470,43 @@ async def twilio_websocket(ws: WebSocket):
     except Exception as ex:
         logger.exception(f"Unexpected Error: {ex}")
     finally:
-        live_request_queue.close()
+        metrics.active_calls.dec()
+        active_packetizers.discard(packetizer)
+        logger.info(
+            f"Silence gate suppressed {silence_gate.frames_suppressed} of "
+            f"{silence_gate.frames_in} frames. Stream SID: {stream_sid}"
+        )
+        logger.info(
+            f"Outbound queue max {packetizer.max_buffered_seconds:.2f}s, "
+            f"max lag {packetizer.max_lag_seconds * 1000:.0f} ms, "
+            f"{packetizer.bytes_overflowed} bytes overflowed. Stream SID: {stream_sid}"
+        )
+        transcoder = codec_executor.transcoder
+        if transcoder is not None:
+            logger.info(
+                f"Codec batches: {transcoder.ticks} ticks, mean "
+                f"{transcoder.mean_batch:.1f} frames, max {transcoder.max_batch}"
+            )
+        if live_session.reconnects:
+            logger.info(
+                f"Model connection resumed {live_session.reconnects} times, "
+                f"{live_session.bytes_dropped} bytes of caller audio dropped"
+            )
+        batcher.flush()
+        live_session.close()
+        if warm is not None:
+            warm.close()
+        try:
+            await end_call_session(from_phone, call_sid)
+        except Exception as ex:
+            logger.warning(f"Error while ending agent session: {ex}")
+        codec.close()
+        if recorder is not None:
+            try:
+                await recorder.close()
+                logger.info(f"Recorded {recorder.lines} messages to {recorder.path}")
+            except Exception as ex:
+                logger.warning(f"Error while writing recording: {ex}")
         try:
             await ws.close()
         except Exception as ex:
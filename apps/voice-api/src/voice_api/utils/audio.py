@@ -1,24 +1,207 @@
 # https://github.com/openai/openai-agents-python/issues/304#issuecomment-2746073108
 
-import audioop
+from typing import Literal
+
 import numpy as np
 import soxr
+from numpy.typing import DTypeLike
+
+TWILIO_SAMPLE_RATE = 8000
+ADK_INPUT_SAMPLE_RATE = 16000
+ADK_OUTPUT_SAMPLE_RATE = 24000
+
+# "int16" feeds samples straight to soxr; "float32" is the reference path
+ResampleDtype = Literal["int16", "float32"]
+
+
+# G.711 μ-law lookup tables, bit-exact with `audioop.ulaw2lin` / `audioop.lin2ulaw`
+def _ulaw_decode_table() -> np.ndarray:
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _ulaw_encode_table() -> np.ndarray:
+    # Indexed by the uint16 view of an int16 sample; μ-law keeps 14 bits
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), 8159) + 33  # clip + bias
+    segment_ends = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+    segment = np.searchsorted(segment_ends, magnitude)
+    ulaw = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    ulaw = np.where(segment >= 8, 0x7F, ulaw)
+    return (ulaw ^ mask).astype(np.uint8)
+
+
+ULAW_TO_PCM16 = _ulaw_decode_table()
+# Decode and int16 -> float32 scaling fused into one table
+ULAW_TO_FLOAT32 = (ULAW_TO_PCM16 / np.float32(32768.0)).astype(np.float32)
+PCM16_TO_ULAW = _ulaw_encode_table()
+
+
+def ulaw_decode(mulaw_bytes: bytes, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Decode μ-law bytes with a table lookup.
+
+    Args:
+        mulaw_bytes: 8-bit μ-law samples
+        out: Optional preallocated array; its dtype selects the table.
+            int16 (the default) gives 16-bit PCM, float32 gives [-1, 1) samples.
+    """
+    codes = np.frombuffer(mulaw_bytes, dtype=np.uint8)
+    table = ULAW_TO_PCM16
+    if out is not None and out.dtype == np.float32:
+        table = ULAW_TO_FLOAT32
+    # Every code is a valid index, so skip bounds checking with mode="clip"
+    return table.take(codes, None, out, "clip")
+
+
+def ulaw_encode(pcm: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Encode 16-bit PCM samples to μ-law with a table lookup.
+
+    Args:
+        pcm: int16 samples
+        out: Optional preallocated uint8 array
+    """
+    return PCM16_TO_ULAW.take(pcm.view(np.uint16), None, out, "clip")
 
 
 # Inbound: Twilio 8-bit 8kHz μ-law -> 16-bit 16kHz PCM for ADK
-def twilio_ulaw8k_to_adk_pcm16k(mulaw_bytes: bytes) -> bytes:
-    pcm8 = audioop.ulaw2lin(mulaw_bytes, 2)  # μ-law -> 16-bit PCM @ 8kHz
-    # resample: int16 <-> float32 for soxr
-    x = np.frombuffer(pcm8, dtype=np.int16).astype(np.float32) / 32768.0
+def twilio_ulaw8k_to_adk_pcm16k(
+    mulaw_bytes: bytes, dtype: ResampleDtype = "float32"
+) -> bytes:
+    if dtype == "int16":
+        return soxr.resample(ulaw_decode(mulaw_bytes), 8000, 16000).tobytes()
+    # μ-law -> float32 PCM @ 8kHz for soxr
+    x = ulaw_decode(mulaw_bytes, np.empty(len(mulaw_bytes), dtype=np.float32))
     y = soxr.resample(x, 8000, 16000)  # 8kHz -> 16kHz
     pcm16 = (np.clip(y, -1, 1) * 32767).astype(np.int16).tobytes()
     return pcm16
 
 
 # Outbound: ADK 16-bit 24kHz PCM -> Twilio 8-bit 8kHz μ-law
-def adk_pcm24k_to_twilio_ulaw8k(pcm24: bytes) -> bytes:
+def adk_pcm24k_to_twilio_ulaw8k(
+    pcm24: bytes, dtype: ResampleDtype = "float32"
+) -> bytes:
+    if dtype == "int16":
+        x = np.frombuffer(pcm24, dtype=np.int16)
+        return ulaw_encode(soxr.resample(x, 24000, 8000)).tobytes()
     x = np.frombuffer(pcm24, dtype=np.int16).astype(np.float32) / 32768.0
     y = soxr.resample(x, 24000, 8000)  # 24kHz -> 8kHz
-    pcm8 = (np.clip(y, -1, 1) * 32767).astype(np.int16).tobytes()
-    ulaw = audioop.lin2ulaw(pcm8, 2)  # PCM -> μ-law
+    pcm8 = (np.clip(y, -1, 1) * 32767).astype(np.int16)
+    ulaw = ulaw_encode(pcm8).tobytes()  # PCM -> μ-law
     return ulaw
+
+
+class _Scratch:
+    """Growable scratch array reused between frames."""
+
+    def __init__(self, size: int, dtype: DTypeLike):
+        self._buffer = np.empty(size, dtype=dtype)
+
+    def take(self, size: int) -> np.ndarray:
+        if self._buffer.shape[0] < size:
+            capacity = max(size, 2 * self._buffer.shape[0])
+            self._buffer = np.empty(capacity, dtype=self._buffer.dtype)
+        return self._buffer[:size]
+
+
+def _to_float(pcm: np.ndarray, scratch: _Scratch) -> np.ndarray:
+    x = scratch.take(pcm.shape[0])
+    np.multiply(pcm, 1 / 32768.0, out=x)
+    return x
+
+
+def _to_int16(y: np.ndarray, scratch: _Scratch) -> np.ndarray:
+    out = scratch.take(y.shape[0])
+    np.clip(y, -1, 1, out=y)
+    y *= 32767
+    np.copyto(out, y, casting="unsafe")
+    return out
+
+
+class AudioCodecPipeline:
+    """
+    Per-call audio converter between Twilio and ADK.
+
+    Unlike the one-shot functions above, the pipeline keeps streaming resampler
+    state for the whole call, so frames are filtered as one continuous signal
+    instead of being zero-padded at every 20 ms boundary. Scratch buffers are
+    reused between frames.
+
+    Create one pipeline per media stream and feed it frames in order.
+    Output sizes vary per call because the resampler holds back a few
+    milliseconds of audio; over a call the totals match the sample rates.
+
+    Args:
+        quality: soxr quality recipe. "LQ" keeps soxr's internal block
+            buffering around 60 ms at 20 ms frames, which is plenty for 8kHz
+            μ-law telephony audio. "HQ" buffers closer to 100 ms.
+        dtype: "int16" resamples the 16-bit samples directly, so no float
+            arrays are allocated per frame. "float32" is the reference path
+            which scales to [-1, 1) around the resampler.
+    """
+
+    def __init__(self, quality: str = "LQ", dtype: ResampleDtype = "int16"):
+        self.quality = quality
+        self.dtype = dtype
+        self._inbound = soxr.ResampleStream(
+            TWILIO_SAMPLE_RATE, ADK_INPUT_SAMPLE_RATE, 1, dtype, quality
+        )
+        self._outbound = soxr.ResampleStream(
+            ADK_OUTPUT_SAMPLE_RATE, TWILIO_SAMPLE_RATE, 1, dtype, quality
+        )
+        self._inbound_in = _Scratch(160, np.dtype(dtype))
+        self._inbound_out = _Scratch(320, np.int16)
+        self._outbound_in = _Scratch(960, np.float32)
+        self._outbound_out = _Scratch(320, np.int16)
+        self._outbound_ulaw = _Scratch(320, np.uint8)
+
+    def inbound(self, mulaw_bytes: bytes) -> bytes:
+        """Twilio 8-bit 8kHz μ-law -> 16-bit 16kHz PCM for ADK"""
+        x = ulaw_decode(mulaw_bytes, self._inbound_in.take(len(mulaw_bytes)))
+        return self.resample_inbound(x)
+
+    def outbound(self, pcm24: bytes) -> bytes:
+        """ADK 16-bit 24kHz PCM -> Twilio 8-bit 8kHz μ-law"""
+        pcm8 = self.resample_outbound(pcm24)
+        return ulaw_encode(pcm8, self._outbound_ulaw.take(pcm8.shape[0])).tobytes()
+
+    def resample_inbound(self, pcm8: np.ndarray) -> bytes:
+        """
+        Resampling half of `inbound`, for callers which decode μ-law themselves.
+
+        Args:
+            pcm8: Decoded 8kHz samples of the pipeline's dtype, as returned by
+                `ulaw_decode` with an output array of that dtype.
+        """
+        y = self._inbound.resample_chunk(pcm8)
+        if self.dtype == "int16":
+            return y.tobytes()
+        return _to_int16(y, self._inbound_out).tobytes()
+
+    def resample_outbound(self, pcm24: bytes) -> np.ndarray:
+        """
+        Resampling half of `outbound`, for callers which encode μ-law themselves.
+
+        Returns:
+            16-bit 8kHz samples. May be a scratch buffer which is overwritten
+            by the next call, so encode or copy it first.
+        """
+        x = np.frombuffer(pcm24, dtype=np.int16)
+        if self.dtype == "int16":
+            return self._outbound.resample_chunk(x)
+        y = self._outbound.resample_chunk(_to_float(x, self._outbound_in))
+        return _to_int16(y, self._outbound_out)
+
+    def reset_outbound(self) -> None:
+        """Drop buffered agent audio, e.g. when the agent is interrupted."""
+        self._outbound.clear()
+
+    def reset(self) -> None:
+        """Drop all buffered audio in both directions."""
+        self._inbound.clear()
+        self._outbound.clear()
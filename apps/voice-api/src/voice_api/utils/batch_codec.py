@@ -0,0 +1,176 @@
+"""
+Cross-call batched transcoding.
+
+With many calls in one process, each 20 ms frame costs a handful of tiny
+NumPy calls whose fixed overhead dominates the actual work. The batch
+transcoder collects frames from every call for one short tick, decodes or
+encodes all of their μ-law in a single vectorized call, and hands each call
+its own slice back. Resampling stays per call, since each call's soxr
+streams carry state between frames.
+
+Usage:
+```python
+transcoder = BatchTranscoder(tick_ms=5)
+pcm16 = await transcoder.inbound(pipeline, mulaw_frame)
+ulaw = await transcoder.outbound(pipeline, agent_pcm)
+```
+"""
+
+import asyncio
+from collections import Counter
+
+import numpy as np
+
+from voice_api.utils.audio import (
+    AudioCodecPipeline,
+    ResampleDtype,
+    _Scratch,
+    ulaw_decode,
+    ulaw_encode,
+)
+
+_Pending = list[tuple[AudioCodecPipeline, bytes, asyncio.Future]]
+
+
+class BatchTranscoder:
+    """
+    Converts frames from all calls together, once per tick.
+
+    Frames submitted for the same pipeline are converted in submission order.
+    The runner task starts with the first frame on each event loop.
+
+    Args:
+        tick_ms: How long to gather frames before converting them. Adds up to
+            this much latency to every frame.
+        dtype: Resampling dtype of the pipelines passed in.
+    """
+
+    def __init__(self, tick_ms: float = 5.0, dtype: ResampleDtype = "int16"):
+        self.tick = tick_ms / 1000
+        self.dtype = dtype
+        # Per-tick batch statistics
+        self.ticks = 0
+        self.frames = 0
+        self.last_batch = 0
+        self.max_batch = 0
+        # Frames per tick -> number of ticks with that many frames
+        self.batch_sizes: Counter[int] = Counter()
+        self._inbound: _Pending = []
+        self._outbound: _Pending = []
+        self._ready: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._decoded = _Scratch(160, np.dtype(dtype))
+        self._encoded = _Scratch(160, np.uint8)
+
+    @property
+    def pending(self) -> int:
+        """Frames waiting for the next tick"""
+        return len(self._inbound) + len(self._outbound)
+
+    @property
+    def mean_batch(self) -> float:
+        return self.frames / self.ticks if self.ticks else 0.0
+
+    def inbound(self, pipeline: AudioCodecPipeline, mulaw_bytes: bytes):
+        """Queue Twilio μ-law for `pipeline.inbound`, resolving to its output"""
+        return self._submit(self._inbound, pipeline, mulaw_bytes)
+
+    def outbound(self, pipeline: AudioCodecPipeline, pcm24: bytes):
+        """Queue agent PCM for `pipeline.outbound`, resolving to its output"""
+        return self._submit(self._outbound, pipeline, pcm24)
+
+    def process(self) -> int:
+        """Convert everything queued so far, returning the number of frames"""
+        inbound, self._inbound = self._inbound, []
+        outbound, self._outbound = self._outbound, []
+        batch = len(inbound) + len(outbound)
+        if not batch:
+            return 0
+
+        if inbound:
+            self._process_inbound(inbound)
+        if outbound:
+            self._process_outbound(outbound)
+
+        self.ticks += 1
+        self.frames += batch
+        self.last_batch = batch
+        self.max_batch = max(self.max_batch, batch)
+        self.batch_sizes[batch] += 1
+        return batch
+
+    async def run(self) -> None:
+        """Convert queued frames once per tick until cancelled"""
+        while True:
+            await self._ready.wait()
+            await asyncio.sleep(self.tick)
+            self._ready.clear()
+            self.process()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _submit(
+        self, queue: _Pending, pipeline: AudioCodecPipeline, data: bytes
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not loop
+        ):
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self.run())
+        future = loop.create_future()
+        queue.append((pipeline, data, future))
+        self._ready.set()
+        return future
+
+    def _process_inbound(self, pending: _Pending) -> None:
+        data = b"".join(frame for _, frame, _ in pending)
+        decoded = ulaw_decode(data, self._decoded.take(len(data)))
+        offset = 0
+        for pipeline, frame, future in pending:
+            x = decoded[offset : offset + len(frame)]
+            offset += len(frame)
+            # Resample even if the caller went away, to keep the stream intact
+            try:
+                result = pipeline.resample_inbound(x)
+            except Exception as ex:
+                _resolve(future, exception=ex)
+            else:
+                _resolve(future, result)
+
+    def _process_outbound(self, pending: _Pending) -> None:
+        chunks = []
+        for pipeline, pcm24, future in pending:
+            try:
+                chunks.append(pipeline.resample_outbound(pcm24).copy())
+            except Exception as ex:
+                _resolve(future, exception=ex)
+                chunks.append(None)
+
+        converted = [chunk for chunk in chunks if chunk is not None]
+        if not converted:
+            return
+        sizes = [0 if chunk is None else chunk.shape[0] for chunk in chunks]
+        pcm8 = np.concatenate(converted)
+        encoded = ulaw_encode(pcm8, self._encoded.take(pcm8.shape[0]))
+        offset = 0
+        for (_, _, future), chunk, size in zip(pending, chunks, sizes):
+            if chunk is not None:
+                _resolve(future, encoded[offset : offset + size].tobytes())
+            offset += size
+
+
+def _resolve(
+    future: asyncio.Future, result=None, exception: Exception | None = None
+) -> None:
+    if future.done():  # cancelled by the caller
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
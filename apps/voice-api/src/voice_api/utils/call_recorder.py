@@ -0,0 +1,121 @@
+"""
+Record a call's traffic, to replay it later.
+
+`CallRecorder` writes one JSON line per message, with the seconds since the
+recording started:
+- `{"t": 0.02, "in": "<Twilio message>"}`, as received from Twilio
+- `{"t": 0.31, "agent": {<ADK Event>}}`, as received from the agent
+- `{"t": 0.32, "out": "<Twilio message>"}`, as sent to Twilio
+
+Lines are gathered in memory and written in a worker thread, gzipped when
+the path ends in `.gz`. `agent_events` reads back what the agent sent, to
+replay it with the fake live backend; see `benchmarks/replay.py`.
+
+Usage:
+```python
+recorder = CallRecorder("recordings/CA123.jsonl.gz")
+recorder.twilio_in(message)
+live_events = recorder.tap(live_events)
+await recorder.close()
+```
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from typing import IO, TYPE_CHECKING, Any, AsyncGenerator, Iterator
+
+if TYPE_CHECKING:  # google-adk is only loaded with the first call
+    from google.adk.events import Event
+
+LiveEvents = AsyncGenerator["Event", None]
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class CallRecorder:
+    """Records the Twilio and agent messages of one call to a JSON Lines file"""
+
+    def __init__(self, path: str, flush_lines: int = 1000):
+        self.path = path
+        self.flush_lines = flush_lines
+        self.lines = 0
+        self._start = time.monotonic()
+        self._pending: list[str] = []
+        self._file: IO[str] | None = None
+        self._flush: asyncio.Task | None = None
+
+    def _record(self, line: str) -> None:
+        self._pending.append(line)
+        self.lines += 1
+        if len(self._pending) >= self.flush_lines and (
+            self._flush is None or self._flush.done()
+        ):
+            lines, self._pending = self._pending, []
+            self._flush = asyncio.create_task(asyncio.to_thread(self._write, lines))
+
+    def _time(self) -> str:
+        return f"{time.monotonic() - self._start:.4f}"
+
+    def twilio_in(self, message: str) -> None:
+        self._record(f'{{"t":{self._time()},"in":{json.dumps(message)}}}')
+
+    def twilio_out(self, message: str) -> None:
+        self._record(f'{{"t":{self._time()},"out":{json.dumps(message)}}}')
+
+    def agent(self, event: "Event") -> None:
+        event_json = event.model_dump_json(exclude_none=True)
+        self._record(f'{{"t":{self._time()},"agent":{event_json}}}')
+
+    async def tap(self, live_events: LiveEvents) -> LiveEvents:
+        """Pass the live events on, recording each"""
+        async for event in live_events:
+            self.agent(event)
+            yield event
+
+    def _write(self, lines: list[str]) -> None:
+        if self._file is None:  # created even when empty, to read back as such
+            self._file = _open(self.path, "a")
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+
+    async def close(self) -> None:
+        """Write what is pending and close the file"""
+        if self._flush is not None:
+            await self._flush
+        lines, self._pending = self._pending, []
+        await asyncio.to_thread(self._write, lines)
+        self._file.close()
+
+
+def read_recording(path: str) -> Iterator[tuple[float, str, Any]]:
+    """(seconds, `in`/`out`/`agent`, message or event) for each recorded line"""
+    from google.adk.events import Event
+
+    with _open(path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            t = record.pop("t")
+            [(source, value)] = record.items()
+            if source == "agent":
+                value = Event.model_validate(value)
+            yield t, source, value
+
+
+def agent_events(path: str) -> list[tuple[float, "Event"]]:
+    """The recorded agent events, timed from the Twilio `start` message"""
+    start = None
+    events = []
+    for t, source, value in read_recording(path):
+        if start is None and source == "in" and json.loads(value)["event"] == "start":
+            start = t
+        elif source == "agent":
+            events.append((t - (start or 0.0), value))
+    return events
@@ -0,0 +1,225 @@
+"""
+Runs per-call audio transcoding off the asyncio event loop.
+
+Modes:
+- "inline": convert on the event loop, as before.
+- "thread": convert on a shared thread pool. soxr and NumPy release the GIL
+  while they work, so calls can use more than one core.
+- "process": shard calls across single-worker processes. Each call's
+  pipeline lives in one worker process for the whole call.
+- "batch": gather frames from all calls on the event loop for one tick and
+  convert their μ-law together, see `BatchTranscoder`.
+
+Frames of one call are always converted in the order they were submitted,
+per direction, because each direction has stateful resamplers.
+
+Usage:
+```python
+executor = CodecExecutor("thread", max_workers=4)
+codec = executor.open(call_sid)
+pcm = await codec.inbound(mulaw_frame)
+ulaw = await codec.outbound(agent_pcm)
+codec.close()
+```
+"""
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal
+
+from voice_api.utils import metrics
+from voice_api.utils.audio import AudioCodecPipeline, ResampleDtype
+from voice_api.utils.batch_codec import BatchTranscoder
+
+CodecMode = Literal["inline", "thread", "process", "batch"]
+
+# Pipelines owned by this process, keyed by CallCodec.key. In "process" mode
+# each worker process has its own copy holding the calls sharded to it.
+_pipelines: dict[str, AudioCodecPipeline] = {}
+_keys = itertools.count()
+
+
+def _open(key: str, quality: str, dtype: ResampleDtype) -> None:
+    _pipelines[key] = AudioCodecPipeline(quality, dtype)
+
+
+def _inbound(key: str, mulaw_bytes: bytes) -> bytes:
+    return _pipelines[key].inbound(mulaw_bytes)
+
+
+def _outbound(key: str, pcm24: bytes) -> bytes:
+    return _pipelines[key].outbound(pcm24)
+
+
+def _reset_outbound(key: str) -> None:
+    _pipelines[key].reset_outbound()
+
+
+def _close(key: str) -> None:
+    _pipelines.pop(key, None)
+
+
+class CallCodec:
+    """Async handle to one call's AudioCodecPipeline"""
+
+    def __init__(self, call_id: str, owner: "CodecExecutor", executor: Executor | None):
+        self.call_id = call_id
+        self.key = f"{call_id}-{next(_keys)}"
+        # Conversions submitted for this call but not finished
+        self.pending = 0
+        self._owner = owner
+        self._executor = executor
+        self._inbound_lock = asyncio.Lock()
+        self._outbound_lock = asyncio.Lock()
+        self._closed = False
+
+    async def inbound(self, mulaw_bytes: bytes) -> bytes:
+        """Twilio 8-bit 8kHz μ-law -> 16-bit 16kHz PCM for ADK"""
+        async with self._inbound_lock:
+            if self._owner.mode == "batch":
+                return await self._batch(self._owner.transcoder.inbound, mulaw_bytes)
+            return await self._run(_inbound, mulaw_bytes)
+
+    async def outbound(self, pcm24: bytes) -> bytes:
+        """ADK 16-bit 24kHz PCM -> Twilio 8-bit 8kHz μ-law"""
+        async with self._outbound_lock:
+            if self._owner.mode == "batch":
+                return await self._batch(self._owner.transcoder.outbound, pcm24)
+            return await self._run(_outbound, pcm24)
+
+    async def reset_outbound(self) -> None:
+        """Drop buffered agent audio, after any outbound work already queued"""
+        async with self._outbound_lock:
+            await self._run(_reset_outbound)
+
+    def close(self) -> None:
+        """Release the pipeline. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._owner.mode == "process":
+            try:
+                self._executor.submit(_close, self.key)
+            except RuntimeError:  # executor already shut down
+                pass
+        else:
+            _close(self.key)
+
+    async def _batch(self, submit: Callable[..., Any], data: bytes) -> bytes:
+        self.pending += 1
+        self._owner._on_submit()
+        try:
+            return await submit(_pipelines[self.key], data)
+        finally:
+            self.pending -= 1
+            self._owner._on_done()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return fn(self.key, *args)
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self._owner._on_submit()
+        try:
+            return await loop.run_in_executor(self._executor, fn, self.key, *args)
+        finally:
+            self.pending -= 1
+            self._owner._on_done()
+
+
+class CodecExecutor:
+    """
+    Shared transcoding executor for all calls in the process.
+
+    Args:
+        mode: "inline", "thread" or "process"
+        max_workers: Thread pool size, or number of worker processes.
+            None uses the executor defaults (process mode: one per CPU).
+        quality: soxr quality recipe for new pipelines
+        dtype: Resampling dtype for new pipelines
+        tick_ms: Batch mode only, how long to gather frames per batch
+    """
+
+    def __init__(
+        self,
+        mode: CodecMode = "inline",
+        max_workers: int | None = None,
+        quality: str = "LQ",
+        dtype: ResampleDtype = "int16",
+        tick_ms: float = 5.0,
+    ):
+        self.mode = mode
+        self.max_workers = max_workers
+        self.quality = quality
+        self.dtype = dtype
+        # Conversions submitted but not finished, across all calls
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.transcoder = BatchTranscoder(tick_ms, dtype) if mode == "batch" else None
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._shards: list[ProcessPoolExecutor] = []
+        self._next_shard = itertools.count()
+
+    def open(self, call_id: str) -> CallCodec:
+        """Create the codec for a new call"""
+        if self.mode in ("inline", "batch"):
+            codec = CallCodec(call_id, self, None)
+            _open(codec.key, self.quality, self.dtype)
+            return codec
+
+        if self.mode == "thread":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="codec"
+                )
+            codec = CallCodec(call_id, self, self._thread_pool)
+            _open(codec.key, self.quality, self.dtype)
+            return codec
+
+        if not self._shards:
+            shard_count = self.max_workers or os.process_cpu_count() or 1
+            self._shards = [ProcessPoolExecutor(1) for _ in range(shard_count)]
+        shard = self._shards[next(self._next_shard) % len(self._shards)]
+        codec = CallCodec(call_id, self, shard)
+        # Single-worker pools run tasks in submission order, so this is done
+        # before the call's first frame
+        shard.submit(_open, codec.key, self.quality, self.dtype)
+        return codec
+
+    async def prime(self) -> None:
+        """
+        Convert one frame of silence each way before the first call.
+
+        Starts the pool threads or worker processes, and loads what soxr and
+        NumPy load on their first resample, so the first caller doesn't wait.
+        """
+        codecs = [self.open("warmup")]
+        # One codec per worker process, they are assigned round robin
+        codecs += [self.open("warmup") for _ in self._shards[1:]]
+        for codec in codecs:
+            await codec.inbound(b"\xff" * 160)  # 20 ms of μ-law silence
+            await codec.outbound(bytes(960))  # 20 ms of 24kHz PCM
+            codec.close()
+
+    def shutdown(self) -> None:
+        if self.transcoder is not None:
+            self.transcoder.stop()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
+        self._shards = []
+
+    def _on_submit(self) -> None:
+        self.submitted += 1
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        metrics.codec_queue_depth_at_submit.observe(self.queue_depth)
+
+    def _on_done(self) -> None:
+        self.queue_depth -= 1
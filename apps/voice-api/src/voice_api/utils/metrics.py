@@ -0,0 +1,271 @@
+"""
+In-process metrics, exposed in the Prometheus text format on `/metrics`.
+
+Counters, gauges and histograms with optional labels, kept per process; with
+several workers each reports its own. Updating one is a few list and float
+operations, cheap enough for every audio frame.
+
+Usage:
+```python
+codec_seconds.labels(direction="inbound").observe(elapsed)
+active_calls.inc()
+registry.render()  # the text served on /metrics
+```
+
+https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+import json
+from bisect import bisect_left
+from typing import Callable, ClassVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a couple of milliseconds up, for latencies seen by a caller
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds, for work done per 20 ms frame
+FRAME_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02)
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f"{k}={json.dumps(v)}" for k, v in pairs) + "}"
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _FunctionValue:
+    def __init__(self, function: Callable[[], float]):
+        self.function = function
+
+    @property
+    def value(self) -> float:
+        return self.function()
+
+
+class _Buckets:
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named metric, with one child per combination of label values"""
+
+    type: ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _Value | _FunctionValue | _Buckets] = {}
+        if not labelnames:
+            self._children[()] = self._child()
+
+    def _child(self) -> _Value | _Buckets:
+        return _Value()
+
+    def labels(self, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._child()
+        return child
+
+    @property
+    def family(self) -> str:
+        """The name in HELP and TYPE, which samples start with"""
+        return self.name
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.family} {self.documentation}",
+            f"# TYPE {self.family} {self.type}",
+        ]
+        for values, child in self._children.items():
+            lines.extend(self._samples(values, child))
+        return lines
+
+    def _samples(self, values: tuple[str, ...], child) -> list[str]:
+        label_text = _labels(self.labelnames, values)
+        return [f"{self.family}{label_text} {_format(child.value)}"]
+
+
+class Counter(Metric):
+    """Only goes up, e.g. calls handled. Rendered with a `_total` suffix."""
+
+    type = "counter"
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}_total"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+
+class Gauge(Metric):
+    """Goes up and down, e.g. calls in progress"""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Report what `function` returns when rendered, instead of a value"""
+        self._children[()] = _FunctionValue(function)
+
+
+class Histogram(Metric):
+    """Distribution of observed values, e.g. latencies, in cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def _samples(self, values: tuple[str, ...], child) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*child.bounds, float("inf")), child.counts):
+            cumulative += count
+            label_text = _labels(self.labelnames, values, le=_format(bound))
+            lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+        label_text = _labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{label_text} {_format(child.sum)}")
+        lines.append(f"{self.name}_count{label_text} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics served together on `/metrics`"""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Per-call metrics of the Twilio bridge
+calls = registry.counter("voice_calls", "Calls connected to the media stream")
+active_calls = registry.gauge("voice_active_calls", "Calls in progress")
+call_setup_seconds = registry.histogram(
+    "voice_call_setup_seconds",
+    "From accepting the media stream to the first agent audio",
+)
+response_seconds = registry.histogram(
+    "voice_response_seconds",
+    "From the caller's last loud frame, or local turn end, to the agent's answer",
+)
+codec_seconds = registry.histogram(
+    "voice_codec_seconds",
+    "Transcoding time per inbound frame or outbound agent chunk, queueing included",
+    ("direction",),
+    buckets=FRAME_BUCKETS,
+)
+outbound_queue_seconds = registry.histogram(
+    "voice_outbound_queue_seconds",
+    "Agent audio waiting to be paced out to Twilio, after each agent chunk",
+    buckets=(0.02, 0.06, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+outbound_queue_frames = registry.gauge(
+    "voice_outbound_queue_frames",
+    "Agent audio frames waiting to be paced out to Twilio, over all calls",
+)
+outbound_lag_seconds = registry.histogram(
+    "voice_outbound_lag_seconds",
+    "How late each agent frame is sent to Twilio, against real time",
+    buckets=(0.0, *FRAME_BUCKETS[4:], *LATENCY_BUCKETS[3:]),
+)
+outbound_overflow_bytes = registry.counter(
+    "voice_outbound_overflow_bytes",
+    "Agent audio dropped because the outbound queue was full, in μ-law bytes",
+)
+codec_queue_depth = registry.gauge(
+    "voice_codec_queue_depth",
+    "Conversions submitted to the codec executor and not finished, over all calls",
+)
+codec_queue_depth_at_submit = registry.histogram(
+    "voice_codec_queue_depth_at_submit",
+    "Conversions in flight when each one is submitted, itself included",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+interruptions = registry.counter(
+    "voice_interruptions", "Agent turns interrupted by the caller"
+)
+interrupt_clear_seconds = registry.histogram(
+    "voice_interrupt_clear_seconds",
+    "From the model's interrupted event arriving to the clear sent to Twilio",
+    buckets=FRAME_BUCKETS + LATENCY_BUCKETS[3:],
+)
+# Children updated for every frame, looked up once
+inbound_codec_seconds = codec_seconds.labels(direction="inbound")
+outbound_codec_seconds = codec_seconds.labels(direction="outbound")
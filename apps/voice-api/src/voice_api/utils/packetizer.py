@@ -0,0 +1,237 @@
+"""
+Outbound packetizer which re-slices agent audio into 20 ms Twilio frames.
+
+Agent audio arrives in chunks of arbitrary size, often several seconds faster
+than real time. Sending it to Twilio as it arrives lets Twilio queue up seconds
+of audio, so a `clear` on barge-in has a lot to throw away and marks fire long
+after they were sent. The packetizer instead buffers μ-law bytes locally and a
+pacer sends fixed 160-byte frames just ahead of real time.
+
+Usage:
+```python
+packetizer = OutboundPacketizer(send_frame)
+pacer_task = asyncio.create_task(packetizer.run())
+
+await packetizer.put(ulaw_bytes)  # agent audio
+packetizer.flush()  # agent turn complete, send the partial tail too
+packetizer.clear()  # agent interrupted, drop everything not yet sent
+```
+
+The buffer can be bounded with `max_seconds`. What happens to audio that
+does not fit is up to the overflow policy:
+- "drop_oldest": drop the oldest unsent audio to make room
+- "drop_newest": drop the part of the new audio which does not fit
+- "block": `put` waits for the pacer to make room. This also holds up
+  reading agent events, including interruptions, so keep the bound generous.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Literal
+
+FRAME_BYTES = 160  # 20 ms of 8kHz μ-law
+FRAME_SECONDS = 0.02
+ULAW_SILENCE = 0xFF
+
+SendFrame = Callable[[bytes], Awaitable[None]]
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+
+
+class FrameRingBuffer:
+    """
+    Byte ring buffer which hands out fixed-size frames.
+
+    Grows when a write does not fit, since the agent can produce audio much
+    faster than it is played back.
+    """
+
+    def __init__(self, capacity: int = 50 * FRAME_BYTES):
+        self._buffer = bytearray(capacity)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> None:
+        if self._size + len(data) > len(self._buffer):
+            self._grow(self._size + len(data))
+        capacity = len(self._buffer)
+        end = (self._start + self._size) % capacity
+        first = min(len(data), capacity - end)
+        self._buffer[end : end + first] = data[:first]
+        self._buffer[: len(data) - first] = data[first:]
+        self._size += len(data)
+
+    def read(self, size: int) -> bytes:
+        """Read up to `size` bytes"""
+        size = min(size, self._size)
+        capacity = len(self._buffer)
+        first = min(size, capacity - self._start)
+        data = bytes(self._buffer[self._start : self._start + first])
+        if first < size:
+            data += self._buffer[: size - first]
+        self._start = (self._start + size) % capacity
+        self._size -= size
+        return data
+
+    def skip(self, size: int) -> int:
+        """Drop up to `size` of the oldest bytes, returning how many were dropped"""
+        size = min(size, self._size)
+        self._start = (self._start + size) % len(self._buffer)
+        self._size -= size
+        return size
+
+    def clear(self) -> int:
+        """Drop all buffered bytes, returning how many were dropped"""
+        dropped = self._size
+        self._start = 0
+        self._size = 0
+        return dropped
+
+    def _grow(self, size: int) -> None:
+        capacity = max(size, 2 * len(self._buffer))
+        data = self.read(self._size)
+        self._buffer = bytearray(capacity)
+        self._buffer[: len(data)] = data
+        self._start = 0
+        self._size = len(data)
+
+
+class OutboundPacketizer:
+    """
+    Paces agent μ-law audio out to Twilio in fixed 20 ms frames.
+
+    Args:
+        send_frame: Async callback which sends one 160-byte frame to Twilio.
+        lead: How far ahead of real time to stay, in seconds. A small lead
+            absorbs network jitter while keeping Twilio's own queue short.
+        max_seconds: Most audio to buffer, in seconds. None is unbounded.
+        overflow: What to do with audio beyond `max_seconds`, see above.
+    """
+
+    def __init__(
+        self,
+        send_frame: SendFrame,
+        lead: float = 0.06,
+        max_seconds: float | None = None,
+        overflow: OverflowPolicy = "drop_oldest",
+    ):
+        self.send_frame = send_frame
+        self.lead = lead
+        self.max_bytes = (
+            None
+            if max_seconds is None
+            else int(max_seconds / FRAME_SECONDS) * FRAME_BYTES
+        )
+        self.overflow = overflow
+        self.frames_sent = 0
+        # Dropped by clear(), and dropped because the buffer was full
+        self.bytes_dropped = 0
+        self.bytes_overflowed = 0
+        self.max_buffered_seconds = 0.0
+        # How late the last frame was sent compared to its playout time. Grows
+        # when sending to Twilio cannot keep up with real time.
+        self.lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._buffer = FrameRingBuffer()
+        self._data_ready = asyncio.Event()
+        self._room = asyncio.Event()
+        # Time at which the next frame starts playing on the caller's end
+        self._playout_time: float | None = None
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Agent audio waiting to be sent, in seconds"""
+        return len(self._buffer) / FRAME_BYTES * FRAME_SECONDS
+
+    @property
+    def depth_frames(self) -> int:
+        """Whole frames waiting to be sent"""
+        return len(self._buffer) // FRAME_BYTES
+
+    def write(self, ulaw_bytes: bytes) -> None:
+        """
+        Queue agent audio (8-bit 8kHz μ-law) for sending.
+
+        Over `max_seconds`, applies the overflow policy as "drop_oldest" or
+        "drop_newest"; use `put` for "block".
+        """
+        excess = self._excess(len(ulaw_bytes))
+        if excess > 0 and self.overflow == "drop_newest":
+            keep = max(len(ulaw_bytes) - excess, 0)
+            self.bytes_overflowed += len(ulaw_bytes) - keep
+            ulaw_bytes = ulaw_bytes[:keep]
+        elif excess > 0 and self.overflow == "drop_oldest":
+            self.bytes_overflowed += self._buffer.skip(excess)
+            if len(ulaw_bytes) > self.max_bytes:
+                self.bytes_overflowed += len(ulaw_bytes) - self.max_bytes
+                ulaw_bytes = ulaw_bytes[-self.max_bytes :]
+
+        self._buffer.write(ulaw_bytes)
+        self.max_buffered_seconds = max(
+            self.max_buffered_seconds, self.buffered_seconds
+        )
+        if len(self._buffer) >= FRAME_BYTES:
+            self._data_ready.set()
+
+    async def put(self, ulaw_bytes: bytes) -> None:
+        """Like `write`, but waits for room under the "block" policy"""
+        if self.overflow == "block":
+            # Once the buffer is empty, a chunk larger than the bound goes in
+            while self._excess(len(ulaw_bytes)) > 0 and len(self._buffer):
+                self._room.clear()
+                await self._room.wait()
+        self.write(ulaw_bytes)
+
+    def _excess(self, size: int) -> int:
+        if self.max_bytes is None:
+            return 0
+        return len(self._buffer) + size - self.max_bytes
+
+    def flush(self) -> None:
+        """Pad a trailing partial frame with silence so it gets sent"""
+        partial = len(self._buffer) % FRAME_BYTES
+        if partial:
+            self.write(bytes([ULAW_SILENCE]) * (FRAME_BYTES - partial))
+
+    def clear(self) -> int:
+        """Drop all audio not yet sent, returning the number of bytes dropped"""
+        dropped = self._buffer.clear()
+        self.bytes_dropped += dropped
+        self._data_ready.clear()
+        self._room.set()
+        self._playout_time = None
+        return dropped
+
+    async def run(self) -> None:
+        """Send frames until cancelled. Run alongside the websocket loops."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if len(self._buffer) < FRAME_BYTES:
+                # Out of audio. Frames already sent play until the playout
+                # time, so the clock only restarts if that has passed.
+                self._data_ready.clear()
+                await self._data_ready.wait()
+                if self._playout_time is not None and self._playout_time < loop.time():
+                    self._playout_time = None
+                continue
+
+            now = loop.time()
+            if self._playout_time is not None and self._playout_time < now:
+                self.lag_seconds = now - self._playout_time
+                self.max_lag_seconds = max(self.max_lag_seconds, self.lag_seconds)
+            else:
+                self.lag_seconds = 0.0
+            if self._playout_time is None or self._playout_time < now:
+                self._playout_time = now
+            ahead = self._playout_time - now
+            if ahead > self.lead:
+                await asyncio.sleep(ahead - self.lead)
+                continue
+
+            frame = self._buffer.read(FRAME_BYTES)
+            self._room.set()
+            await self.send_frame(frame)
+            self.frames_sent += 1
+            if self._playout_time is not None:  # not cleared while sending
+                self._playout_time += FRAME_SECONDS
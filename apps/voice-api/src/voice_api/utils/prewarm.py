@@ -0,0 +1,186 @@
+"""
+Pre-warmed agent sessions, started from the `/twilio/connect` webhook.
+
+Without pre-warming the live session is only created once the media stream's
+`start` event arrives, so session creation and the model connection sit
+between the caller picking up and the greeting. Twilio needs a moment to
+negotiate the media stream after the webhook returns its TwiML; starting the
+session in the webhook overlaps the two.
+
+A warm session starts reading agent events right away, so the live
+connection opens and the greeting is generated, and buffers them until the
+websocket handler claims the session by CallSid. Sessions nobody claims
+within the timeout are closed.
+
+Usage:
+```python
+prewarmer = SessionPrewarmer(start_call_session, end_call_session, timeout=30)
+
+# /twilio/connect
+prewarmer.start(call_sid, from_phone, call_sid)
+
+# /twilio/stream
+warm = await prewarmer.claim(call_sid)
+if warm:
+    live_events, live_request_queue = warm.live_events(), warm.live_request_queue
+...
+warm.close()
+```
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable
+
+from voice_api.utils.logging import logger
+
+if TYPE_CHECKING:  # google-adk is only loaded with the first call
+    from google.adk.agents.live_request_queue import LiveRequestQueue
+    from google.adk.events import Event
+
+LiveEvents = AsyncGenerator["Event", None]
+StartSession = Callable[..., Awaitable[tuple[LiveEvents, "LiveRequestQueue"]]]
+EndSession = Callable[..., Awaitable[None]]
+
+_END = object()
+
+
+class WarmSession:
+    """A live session started ahead of its media stream"""
+
+    def __init__(self, key: str, args: tuple):
+        self.key = key
+        self.args = args
+        self.live_request_queue: "LiveRequestQueue | None" = None
+        self.started_at = time.monotonic()
+        # Set once the session is started, or failed to start
+        self.ready = asyncio.Event()
+        self.error: BaseException | None = None
+        self._events: asyncio.Queue[Any] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._reap_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def buffered_events(self) -> int:
+        """Agent events received but not read yet"""
+        return self._events.qsize()
+
+    async def live_events(self) -> LiveEvents:
+        """Agent events, starting with any received before the claim"""
+        while True:
+            item = await self._events.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        """Stop reading agent events and close the request queue"""
+        if self._reap_handle is not None:
+            self._reap_handle.cancel()
+        if self._task is not None:
+            self._task.cancel()
+        if self.live_request_queue is not None:
+            self.live_request_queue.close()
+
+    async def _run(self, start_session: StartSession) -> None:
+        try:
+            live_events, self.live_request_queue = await start_session(*self.args)
+        except Exception as ex:
+            self.error = ex
+            return
+        finally:
+            self.ready.set()
+
+        try:
+            async for event in live_events:
+                self._events.put_nowait(event)
+        except Exception as ex:
+            self._events.put_nowait(ex)
+        self._events.put_nowait(_END)
+
+
+class SessionPrewarmer:
+    """
+    Starts agent sessions before their media stream connects.
+
+    Args:
+        start_session: Starts a session, like `start_agent_session`, and
+            returns its live events and request queue.
+        end_session: Releases a session nobody claimed, called with the same
+            arguments as start_session.
+        timeout: Seconds to wait for a claim before closing the session.
+    """
+
+    def __init__(
+        self,
+        start_session: StartSession,
+        end_session: EndSession | None = None,
+        timeout: float = 30.0,
+    ):
+        self.start_session = start_session
+        self.end_session = end_session
+        self.timeout = timeout
+        self.started = 0
+        self.claimed = 0
+        self.reaped = 0
+        self._sessions: dict[str, WarmSession] = {}
+        self._end_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def start(self, key: str, *args: Any) -> WarmSession:
+        """Start a session in the background, passing `args` to start_session"""
+        existing = self._sessions.pop(key, None)
+        if existing is not None:  # webhook retried
+            existing.close()
+
+        warm = WarmSession(key, args)
+        loop = asyncio.get_running_loop()
+        warm._task = loop.create_task(warm._run(self.start_session))
+        warm._reap_handle = loop.call_later(self.timeout, self._reap, key, warm)
+        self._sessions[key] = warm
+        self.started += 1
+        return warm
+
+    async def claim(self, key: str) -> WarmSession | None:
+        """
+        Take over the session started for `key`, waiting for it to be ready.
+
+        Returns:
+            The session, or None if there is none or it failed to start.
+        """
+        warm = self._sessions.pop(key, None)
+        if warm is None:
+            return None
+        warm._reap_handle.cancel()
+        try:
+            await asyncio.wait_for(warm.ready.wait(), self.timeout)
+        except TimeoutError:
+            warm.error = TimeoutError("session did not start in time")
+        if warm.error is not None:
+            logger.warning(f"Pre-warmed session failed to start: {warm.error!r}")
+            warm.close()
+            return None
+        self.claimed += 1
+        return warm
+
+    def close(self) -> None:
+        """Close all unclaimed sessions"""
+        for warm in self._sessions.values():
+            warm.close()
+        self._sessions.clear()
+
+    def _reap(self, key: str, warm: WarmSession) -> None:
+        if self._sessions.get(key) is not warm:
+            return
+        del self._sessions[key]
+        warm.close()
+        if self.end_session is not None:
+            task = asyncio.get_running_loop().create_task(self.end_session(*warm.args))
+            self._end_tasks.add(task)
+            task.add_done_callback(self._end_tasks.discard)
+        self.reaped += 1
+        logger.info(f"Closed unclaimed pre-warmed session {key}")
@@ -0,0 +1,61 @@
+"""
+Fast path for Twilio Media Stream `media` messages.
+
+Media messages make up nearly all traffic on a stream, 50 per second in
+each direction per call. Parsing each into a dict to read one field, and
+serializing a nested dict for each reply, costs more CPU than the audio
+conversion around it.
+
+Inbound, `parse_media_payload` finds the payload in the message text
+directly. Twilio sends compact JSON with `event` first; anything else, like
+control events, returns None and is parsed as JSON as before. Outbound,
+`MediaMessageEncoder` fills the payload into a message prefix built once per
+stream.
+
+https://www.twilio.com/docs/voice/media-streams/websocket-messages
+"""
+
+import binascii
+import json
+
+_MEDIA_PREFIX = '{"event":"media"'
+_PAYLOAD_KEY = '"payload":"'
+
+
+def parse_media_payload(message: str) -> bytes | None:
+    """
+    Decoded μ-law audio of a media message, without parsing the JSON.
+
+    Returns None for messages which are not compact media messages, which
+    callers should parse with `json.loads`.
+    """
+    if not message.startswith(_MEDIA_PREFIX):
+        return None
+    start = message.find(_PAYLOAD_KEY)
+    if start < 0:
+        return None
+    start += len(_PAYLOAD_KEY)
+    end = message.find('"', start)
+    if end < 0:
+        return None
+    payload = message[start:end]
+    if "\\" in payload:  # escaped, e.g. "\/"; leave it to the JSON parser
+        return None
+    return binascii.a2b_base64(payload)
+
+
+class MediaMessageEncoder:
+    """Media messages for one stream, from a template built once"""
+
+    def __init__(self, stream_sid: str):
+        self.stream_sid = stream_sid
+        self._prefix = (
+            '{"event":"media","streamSid":'
+            + json.dumps(stream_sid)
+            + ',"media":{"payload":"'
+        )
+
+    def encode(self, ulaw_frame: bytes) -> str:
+        """The media message text carrying `ulaw_frame`"""
+        payload = binascii.b2a_base64(ulaw_frame, newline=False).decode("ascii")
+        return self._prefix + payload + '"}}'
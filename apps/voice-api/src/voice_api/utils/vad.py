@@ -0,0 +1,236 @@
+"""
+Energy-based voice activity helpers for the inbound Twilio audio path.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+from voice_api.utils.audio import ULAW_TO_FLOAT32
+
+FRAME_MS = 20
+PCM16K_BYTES_PER_MS = 32
+
+
+def ulaw_frame_dbfs(mulaw_bytes: bytes) -> float:
+    """Mean energy of a μ-law frame in dBFS"""
+    codes = np.frombuffer(mulaw_bytes, dtype=np.uint8)
+    if codes.shape[0] == 0:
+        return -math.inf
+    x = ULAW_TO_FLOAT32.take(codes, None, None, "clip")
+    energy = float(np.dot(x, x)) / codes.shape[0]
+    return 10 * math.log10(energy) if energy > 0 else -math.inf
+
+
+def pcm16_dbfs(pcm_bytes: bytes) -> float:
+    """Mean energy of 16-bit PCM in dBFS"""
+    x = np.frombuffer(pcm_bytes, dtype=np.int16)
+    if x.shape[0] == 0:
+        return -math.inf
+    x = x.astype(np.float32)
+    energy = float(np.dot(x, x)) / (x.shape[0] * 32768.0**2)
+    return 10 * math.log10(energy) if energy > 0 else -math.inf
+
+
+class SilenceGate:
+    """
+    Drops runs of silent inbound frames before they are resampled and sent.
+
+    Frames quieter than `threshold_dbfs` are held back once the caller has been
+    silent for longer than `hangover_ms`. The hangover must stay longer than the
+    model's end-of-speech silence so it still sees the end of each utterance.
+    The last `preroll_ms` of held-back audio is released in front of the next
+    loud frame so speech onsets are not clipped.
+
+    Args:
+        threshold_dbfs: Frames at or above this energy count as speech.
+        hangover_ms: Silence still forwarded after speech.
+        preroll_ms: Silence forwarded before speech.
+        keep_every: Forward every n-th suppressed frame to thin out silence
+            instead of dropping it. 0 drops all of it.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -50.0,
+        hangover_ms: int = 600,
+        preroll_ms: int = 100,
+        keep_every: int = 0,
+    ):
+        self.threshold_dbfs = threshold_dbfs
+        self.hangover_frames = hangover_ms // FRAME_MS
+        self.keep_every = keep_every
+        self.frames_in = 0
+        self.frames_out = 0
+        # time.monotonic() of the last frame counted as speech
+        self.last_speech_at: float | None = None
+        self._hangover = 0
+        self._silent_run = 0
+        self._preroll: deque[bytes] = deque(maxlen=preroll_ms // FRAME_MS)
+
+    @property
+    def frames_suppressed(self) -> int:
+        return self.frames_in - self.frames_out
+
+    def is_speech(self, mulaw_bytes: bytes) -> bool:
+        """Whether a frame counts as speech, keeping `last_speech_at`"""
+        if ulaw_frame_dbfs(mulaw_bytes) < self.threshold_dbfs:
+            return False
+        self.last_speech_at = time.monotonic()
+        return True
+
+    def process(self, mulaw_bytes: bytes) -> list[bytes]:
+        """
+        Gate one Twilio frame.
+
+        Returns:
+            The frames to forward, oldest first: empty while suppressing, the
+            frame itself, or held-back pre-roll followed by the frame.
+        """
+        self.frames_in += 1
+
+        if self.is_speech(mulaw_bytes):
+            self._hangover = self.hangover_frames
+            self._silent_run = 0
+            frames = [*self._preroll, mulaw_bytes]
+            self._preroll.clear()
+        elif self._hangover > 0:
+            self._hangover -= 1
+            frames = [mulaw_bytes]
+        else:
+            self._silent_run += 1
+            if self.keep_every and self._silent_run % self.keep_every == 0:
+                self._preroll.clear()  # keep frames in order
+                frames = [mulaw_bytes]
+            else:
+                self._preroll.append(mulaw_bytes)
+                frames = []
+
+        self.frames_out += len(frames)
+        return frames
+
+
+class Endpointer:
+    """
+    Local turn detection on decoded caller audio (16-bit 16kHz PCM).
+
+    A turn starts once `min_speech_ms` of audio at or above `threshold_dbfs`
+    has been seen in a row, and ends after `silence_ms` below it. Used with
+    the model's automatic activity detection disabled, so turn boundaries are
+    decided here and can be measured.
+
+    Args:
+        threshold_dbfs: Audio at or above this energy counts as speech.
+        min_speech_ms: Speech needed to start a turn; filters out clicks.
+        silence_ms: Silence needed to end a turn.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -40.0,
+        min_speech_ms: int = 60,
+        silence_ms: int = 400,
+    ):
+        self.threshold_dbfs = threshold_dbfs
+        self.min_speech_ms = min_speech_ms
+        self.silence_ms = silence_ms
+        self.in_turn = False
+        self.turns = 0
+        # time.monotonic() of the most recent turn end
+        self.last_turn_end: float | None = None
+        self._speech_ms = 0.0
+        self._silence_ms = 0.0
+
+    def process(self, pcm_bytes: bytes) -> tuple[bool, bool]:
+        """
+        Feed one chunk of caller audio.
+
+        Returns:
+            (started, ended): whether a turn started before this chunk, and
+            whether one ended with it.
+        """
+        duration_ms = len(pcm_bytes) / PCM16K_BYTES_PER_MS
+        is_speech = pcm16_dbfs(pcm_bytes) >= self.threshold_dbfs
+
+        if not self.in_turn:
+            self._speech_ms = self._speech_ms + duration_ms if is_speech else 0.0
+            if self._speech_ms >= self.min_speech_ms:
+                self.in_turn = True
+                self._silence_ms = 0.0
+                return True, False
+            return False, False
+
+        self._silence_ms = 0.0 if is_speech else self._silence_ms + duration_ms
+        if self._silence_ms >= self.silence_ms:
+            self.in_turn = False
+            self._speech_ms = 0.0
+            self.turns += 1
+            self.last_turn_end = time.monotonic()
+            return False, True
+        return False, False
+
+
+class LocalTurnSender:
+    """
+    Sends caller audio to the model with locally detected turn boundaries.
+
+    While the endpointer is still counting speech towards `min_speech_ms`,
+    the audio is held back, then sent right after the activity start with
+    `preroll_ms` from before the onset, so the turn has its first syllable.
+    Audio between turns is not sent beyond that pre-roll, since the model
+    only takes audio between the activity signals as caller speech.
+
+    Args:
+        endpointer: Decides where turns start and end.
+        send_audio: Sends 16-bit 16kHz PCM to the model, possibly batched.
+        flush_audio: Sends audio still pending in `send_audio`.
+        start_turn: Sends the activity start signal.
+        end_turn: Sends the activity end signal.
+        preroll_ms: Audio from before the speech onset sent with the turn.
+    """
+
+    def __init__(
+        self,
+        endpointer: Endpointer,
+        send_audio: Callable[[bytes], None],
+        flush_audio: Callable[[], None],
+        start_turn: Callable[[], None],
+        end_turn: Callable[[], None],
+        preroll_ms: int = 100,
+    ):
+        self.endpointer = endpointer
+        self.send_audio = send_audio
+        self.flush_audio = flush_audio
+        self.start_turn = start_turn
+        self.end_turn = end_turn
+        self.max_held_bytes = (
+            endpointer.min_speech_ms + preroll_ms
+        ) * PCM16K_BYTES_PER_MS
+        self._held: deque[bytes] = deque()
+        self._held_bytes = 0
+
+    def send(self, pcm_bytes: bytes) -> None:
+        started, ended = self.endpointer.process(pcm_bytes)
+        if started:
+            self._hold(pcm_bytes)
+            self.start_turn()
+            for chunk in self._held:
+                self.send_audio(chunk)
+            self._held.clear()
+            self._held_bytes = 0
+        elif self.endpointer.in_turn or ended:
+            self.send_audio(pcm_bytes)
+        else:
+            self._hold(pcm_bytes)
+        if ended:
+            self.flush_audio()
+            self.end_turn()
+
+    def _hold(self, pcm_bytes: bytes) -> None:
+        self._held.append(pcm_bytes)
+        self._held_bytes += len(pcm_bytes)
+        while self._held_bytes > self.max_held_bytes:
+            self._held_bytes -= len(self._held.popleft())
@@ -0,0 +1,99 @@
+"""
+Startup warmup and readiness.
+
+Work that would otherwise land on the first call of a new instance, like
+building the agent tree or the first resample, runs as warmup steps when
+the app starts. `/health/` answers as soon as the server is up, while
+`/health/ready` reports not ready until every step has finished, so new
+instances only take calls once they are warm. Calls which arrive anyway
+wait for the warmup with `wait`.
+
+Usage:
+```python
+task = warmup.start([("agents", load_agents), ("codec", codec_executor.prime)])
+```
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable
+
+from voice_api.utils.logging import logger
+
+
+class Warmup:
+    """Runs named startup steps in order, and tracks whether they finished"""
+
+    def __init__(self):
+        self.ready = False
+        self.running = False
+        self.error: str | None = None
+        # Step name -> seconds it took, in the order they ran
+        self.step_seconds: dict[str, float] = {}
+        self.seconds: float | None = None
+
+    async def run(self, steps: list[tuple[str, Callable[[], Any]]]) -> None:
+        """Run the steps. Sync steps run in a worker thread, off the event loop."""
+        self.ready, self.error, self.seconds = False, None, None
+        self.step_seconds = {}
+        self.running = True
+        try:
+            await self._run_steps(steps)
+        finally:
+            self.running = False
+
+    def start(self, steps: list[tuple[str, Callable[[], Any]]]) -> asyncio.Task:
+        """Run the steps in a background task; `wait` waits for it from now on"""
+        self.running = True
+        return asyncio.create_task(self.run(steps))
+
+    async def _run_steps(self, steps: list[tuple[str, Callable[[], Any]]]) -> None:
+        start = time.perf_counter()
+        for name, step in steps:
+            step_start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(step):
+                    await step()
+                else:
+                    await asyncio.to_thread(step)
+            except Exception as ex:
+                self.error = f"{name}: {ex!r}"
+                logger.exception(f"Warmup step {name} failed")
+                return
+            self.step_seconds[name] = time.perf_counter() - step_start
+
+        self.seconds = time.perf_counter() - start
+        self.ready = True
+        timings = ", ".join(
+            f"{name} {seconds * 1000:.0f} ms"
+            for name, seconds in self.step_seconds.items()
+        )
+        logger.info(f"Warm in {self.seconds * 1000:.0f} ms ({timings})")
+
+    async def wait(self, timeout: float) -> None:
+        """
+        Wait for a warmup in progress to finish.
+
+        Raises:
+            TimeoutError: Still warming after `timeout` seconds.
+            RuntimeError: The warmup failed.
+        """
+        deadline = time.monotonic() + timeout
+        while self.running:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Still warming up after {timeout}s")
+            await asyncio.sleep(0.05)
+        if self.error is not None:
+            raise RuntimeError(f"Warmup failed: {self.error}")
+
+    def status(self) -> dict[str, Any]:
+        status = "ready" if self.ready else "failed" if self.error else "warming"
+        return {
+            "status": status,
+            "error": self.error,
+            "steps_ms": {k: round(v * 1000, 1) for k, v in self.step_seconds.items()},
+        }
+
+
+warmup = Warmup()
@@ -0,0 +1,27 @@
+import pytest
+from pydantic import ValidationError
+
+from voice_api.config.settings import AudioSettings
+
+
+def test_audio_settings_reject_gate_hiding_local_turn_ends():
+    with pytest.raises(ValidationError, match="silence_hangover_ms"):
+        AudioSettings(
+            silence_gate=True,
+            activity_detection="local",
+            silence_hangover_ms=300,
+            endpoint_silence_ms=400,
+        )
+
+
+def test_audio_settings_allow_short_hangover_without_local_turns():
+    AudioSettings(silence_gate=True, silence_hangover_ms=300, endpoint_silence_ms=400)
+    AudioSettings(
+        activity_detection="local", silence_hangover_ms=300, endpoint_silence_ms=400
+    )
+    AudioSettings(
+        silence_gate=True,
+        activity_detection="local",
+        silence_hangover_ms=600,
+        endpoint_silence_ms=400,
+    )
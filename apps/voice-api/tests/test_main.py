@@ -1,9 +1,16 @@
 """Tests for main app endpoints."""
 
+import subprocess
+import sys
+
 from fastapi.testclient import TestClient
 
 from voice_api.main import app
 
+# Cold start budget for `import voice_api.main`, before uvicorn can serve
+# health checks. google-adk alone takes seconds, and loads during warmup.
+IMPORT_BUDGET_MS = 2000
+
 
 def test_root_endpoint():
     """Test that the root endpoint returns ok status."""
@@ -12,3 +19,18 @@ def test_root_endpoint():
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
+
+
+def test_import_stays_within_budget():
+    """Test that importing the app does not load google-adk."""
+    statement = (
+        "import sys, time; start = time.perf_counter(); import voice_api.main; "
+        "print(time.perf_counter() - start); "
+        "assert not any(m.startswith('google.adk') for m in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", statement], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout) * 1000 < IMPORT_BUDGET_MS
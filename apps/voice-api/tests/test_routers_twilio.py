@@ -1,18 +1,22 @@
-import types
+import asyncio
+import base64
 from datetime import datetime, timezone
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from agent_core.runtime import live_messaging
+
 
 def _mount_twilio_router_with_fakes(is_local: bool = True):
     # Import module under test
     import voice_api.routers.twilio as tw
     import voice_api.utils.twilio_security as sec
 
-    # Patch settings to control protocol selection and avoid env dependency
-    dummy_settings = types.SimpleNamespace(is_local=is_local)
-    tw.settings = dummy_settings
+    # Patch settings to control protocol selection
+    environment = "LOCAL" if is_local else "PROD"
+    tw.settings = tw.settings.model_copy(update={"app_environment": environment})
 
     # Disable request signature validation dependency on routes
     async def _noop_validate(_req=None):
@@ -66,6 +70,28 @@ def test_connect_generates_twiML_prod_urls():
     assert "https://" in body
 
 
+def test_calls_are_turned_away_until_warm(monkeypatch):
+    from starlette.websockets import WebSocketDisconnect
+
+    from voice_api.utils.warmup import warmup
+
+    app, tw = _mount_twilio_router_with_fakes(is_local=False)
+    session = tw.settings.session.model_copy(update={"warmup_wait": 0.1})
+    settings = tw.settings.model_copy(update={"session": session})
+    monkeypatch.setattr(tw, "settings", settings)
+    monkeypatch.setattr(warmup, "running", True)
+    client = TestClient(app)
+
+    form = {"From": "+15551234567", "To": "+15557654321", "Direction": "inbound"}
+    res = client.post("/twilio/connect", data=form)
+    assert res.status_code == 503
+
+    with pytest.raises(WebSocketDisconnect) as disconnect:
+        with client.websocket_connect("/twilio/stream"):
+            pass
+    assert disconnect.value.code == 1013
+
+
 def test_callback_returns_204():
     app, _tw = _mount_twilio_router_with_fakes(is_local=True)
     client = TestClient(app)
@@ -94,34 +120,42 @@ def test_websocket_minimal_handshake(monkeypatch):
         def send_content(self, item):
             self.sent.append(item)
 
+        def send_realtime(self, blob):
+            self.sent.append(blob)
+
         def close(self):  # pragma: no cover - graceful shutdown
             pass
 
-    async def fake_start_agent_session(_from_phone, _call_sid):
+    queue = DummyQueue()
+
+    async def fake_start_agent_session(_agent, _from_phone, _call_sid, *_args):
         # live_events: an async iterable that's quickly exhausted
         async def _events():
             if False:
                 yield None  # pragma: no cover
 
-        return _events(), DummyQueue()
+        return _events(), queue
 
-    async def fake_agent_to_client_messaging(_handler, _events):
-        return None
-
-    def fake_send_pcm_to_agent(_pcm, _queue):
-        return None
+    async def fake_agent_to_client_messaging(_handler, _events, *_args):
+        # Agent side stays open, so the call only ends on Twilio's stop
+        await asyncio.Event().wait()
 
     def fake_text_to_content(text, role):  # echo as tuple for visibility
         return (text, role)
 
+    # The router imports these from live_messaging when a call starts
+    monkeypatch.setattr(
+        live_messaging, "start_agent_session", fake_start_agent_session, raising=True
+    )
     monkeypatch.setattr(
-        tw, "start_agent_session", fake_start_agent_session, raising=True
+        live_messaging,
+        "agent_to_client_fast",
+        fake_agent_to_client_messaging,
+        raising=True,
     )
     monkeypatch.setattr(
-        tw, "agent_to_client_messaging", fake_agent_to_client_messaging, raising=True
+        live_messaging, "text_to_content", fake_text_to_content, raising=True
     )
-    monkeypatch.setattr(tw, "send_pcm_to_agent", fake_send_pcm_to_agent, raising=True)
-    monkeypatch.setattr(tw, "text_to_content", fake_text_to_content, raising=True)
 
     client = TestClient(app)
 
@@ -137,5 +171,231 @@ def test_websocket_minimal_handshake(monkeypatch):
                 "streamSid": "MZ123",
             }
         )
-        # Immediately stop to exit the loop
+        for _ in range(10):
+            ws.send_json(
+                {
+                    "event": "media",
+                    "media": {"payload": base64.b64encode(b"\x10" * 160).decode()},
+                    "streamSid": "MZ123",
+                }
+            )
         ws.send_json({"event": "stop"})
+        assert ws.receive()["type"] == "websocket.close"
+
+    # The greeting, then the caller audio as 16kHz PCM
+    assert queue.sent[0][1] == "user"
+    audio = queue.sent[1:]
+    assert audio and all(blob.mime_type == "audio/pcm;rate=16000" for blob in audio)
+
+
+def test_websocket_claims_prewarmed_session(monkeypatch):
+    app, tw = _mount_twilio_router_with_fakes(is_local=True)
+    session = tw.settings.session.model_copy(update={"prewarm": True})
+    settings = tw.settings.model_copy(update={"session": session})
+    monkeypatch.setattr(tw, "settings", settings)
+    started = []
+
+    class DummyQueue:
+        def send_content(self, item):
+            pass
+
+        def send_realtime(self, blob):
+            pass
+
+        def close(self):
+            pass
+
+    async def fake_start_agent_session(_agent, _from_phone, call_sid, *_args):
+        started.append(call_sid)
+
+        async def _events():
+            if False:
+                yield None  # pragma: no cover
+
+        return _events(), DummyQueue()
+
+    monkeypatch.setattr(live_messaging, "start_agent_session", fake_start_agent_session)
+    monkeypatch.setattr(
+        live_messaging, "end_agent_session", lambda *_args: asyncio.sleep(0)
+    )
+
+    form = {
+        "From": "+15551234567",
+        "To": "+15557654321",
+        "Direction": "inbound",
+        "CallSid": "CA456",
+    }
+
+    with TestClient(app) as client:
+        assert client.post("/twilio/connect", data=form).status_code == 200
+        with client.websocket_connect("/twilio/stream") as ws:
+            ws.send_json({"event": "connected"})
+            ws.send_json(
+                {
+                    "event": "start",
+                    "start": {
+                        "callSid": "CA456",
+                        "customParameters": {"from_phone": "+15551234567"},
+                    },
+                    "streamSid": "MZ456",
+                }
+            )
+            ws.send_json({"event": "stop"})
+
+    # Started once from /connect; the websocket claimed it instead of starting
+    assert started == ["CA456"]
+    assert tw.session_prewarmer.claimed >= 1
+
+
+def test_stream_with_fake_live_backend(monkeypatch):
+    import numpy as np
+
+    from agent_core.runtime.fake_live import FakeLiveBackend
+    from voice_api.utils.audio import ulaw_encode
+
+    from voice_api.utils import metrics
+
+    app, tw = _mount_twilio_router_with_fakes(is_local=True)
+    backend = FakeLiveBackend("echo")
+    monkeypatch.setattr(tw, "fake_live_backend", backend)
+    setups = metrics.call_setup_seconds.labels().count
+    responses = metrics.response_seconds.labels().count
+
+    tone = (8000 * np.sin(np.arange(160) * 0.3)).astype(np.int16)
+    payload = base64.b64encode(ulaw_encode(tone).tobytes()).decode()
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/twilio/stream") as ws:
+            ws.send_json({"event": "connected"})
+            ws.send_json(
+                {
+                    "event": "start",
+                    "start": {
+                        "callSid": "CA789",
+                        "customParameters": {"from_phone": "+15551234567"},
+                    },
+                    "streamSid": "MZ789",
+                }
+            )
+            media = {"event": "media", "media": {"payload": payload}}
+            for _ in range(5):
+                ws.send_json(media)
+            message = ws.receive_json()
+            ws.send_json({"event": "stop"})
+
+    # The caller's audio came back through the fake agent
+    assert message["event"] == "media"
+    assert message["streamSid"] == "MZ789"
+    assert backend.sessions == 1
+    assert metrics.call_setup_seconds.labels().count == setups + 1
+    # Timed from the caller's speech, with the silence gate off
+    assert metrics.response_seconds.labels().count == responses + 1
+    assert metrics.inbound_codec_seconds.count >= 5
+    assert metrics.active_calls.labels().value == 0
+    assert metrics.outbound_lag_seconds.labels().count >= 1
+    assert metrics.outbound_queue_frames.labels().value == 0
+
+
+@pytest.mark.parametrize("activity_detection", ["server", "local"])
+def test_stream_only_checks_speech_when_used(monkeypatch, activity_detection):
+    from agent_core.runtime.fake_live import FakeLiveBackend
+    from voice_api.utils.vad import SilenceGate
+
+    app, tw = _mount_twilio_router_with_fakes(is_local=True)
+    monkeypatch.setattr(tw, "fake_live_backend", FakeLiveBackend("echo"))
+    audio = tw.settings.audio.model_copy(
+        update={"activity_detection": activity_detection}
+    )
+    monkeypatch.setattr(tw, "settings", tw.settings.model_copy(update={"audio": audio}))
+    checked = []
+    is_speech = SilenceGate.is_speech
+    monkeypatch.setattr(
+        SilenceGate,
+        "is_speech",
+        lambda self, frame: checked.append(frame) or is_speech(self, frame),
+    )
+
+    payload = base64.b64encode(b"\xff" * 160).decode()
+    with TestClient(app) as client:
+        with client.websocket_connect("/twilio/stream") as ws:
+            ws.send_json({"event": "connected"})
+            ws.send_json(
+                {
+                    "event": "start",
+                    "start": {
+                        "callSid": "CA790",
+                        "customParameters": {"from_phone": "+15551234567"},
+                    },
+                    "streamSid": "MZ790",
+                }
+            )
+            for _ in range(5):
+                ws.send_json({"event": "media", "media": {"payload": payload}})
+            ws.send_json({"event": "stop"})
+
+    # Local mode times responses from the endpointer instead
+    assert len(checked) == (5 if activity_detection == "server" else 0)
+
+
+def test_stream_closes_when_ending_agent_session_fails(monkeypatch):
+    from agent_core.runtime.fake_live import FakeLiveBackend
+
+    app, tw = _mount_twilio_router_with_fakes(is_local=True)
+
+    class FailingBackend(FakeLiveBackend):
+        async def end_session(self, *_args):
+            raise RuntimeError("model connection gone")
+
+    monkeypatch.setattr(tw, "fake_live_backend", FailingBackend("echo"))
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/twilio/stream") as ws:
+            ws.send_json({"event": "connected"})
+            ws.send_json(
+                {
+                    "event": "start",
+                    "start": {
+                        "callSid": "CA790",
+                        "customParameters": {"from_phone": "+15551234567"},
+                    },
+                    "streamSid": "MZ790",
+                }
+            )
+            ws.send_json({"event": "stop"})
+            # The rest of the cleanup still ran, up to closing the websocket
+            assert ws.receive()["type"] == "websocket.close"
+
+
+def test_stream_clears_twilio_on_interruption(monkeypatch):
+    from google.adk.events import Event
+
+    from agent_core.runtime.fake_live import FakeLiveBackend
+    from voice_api.utils import metrics
+
+    app, tw = _mount_twilio_router_with_fakes(is_local=True)
+    # Recorded long ago; the clear time counts from the event's arrival
+    interrupted = Event(author="voice_agent", interrupted=True, timestamp=1.0)
+    backend = FakeLiveBackend("replay", replay=[(0.0, interrupted)])
+    monkeypatch.setattr(tw, "fake_live_backend", backend)
+    clears = metrics.interrupt_clear_seconds.labels()
+    count, total = clears.count, clears.sum
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/twilio/stream") as ws:
+            ws.send_json({"event": "connected"})
+            ws.send_json(
+                {
+                    "event": "start",
+                    "start": {
+                        "callSid": "CA791",
+                        "customParameters": {"from_phone": "+15551234567"},
+                    },
+                    "streamSid": "MZ791",
+                }
+            )
+            message = ws.receive_json()
+            ws.send_json({"event": "stop"})
+
+    assert message == {"event": "clear", "streamSid": "MZ791"}
+    assert clears.count == count + 1
+    assert 0 <= clears.sum - total < 1.0
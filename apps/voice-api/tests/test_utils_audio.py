@@ -1,11 +1,14 @@
 import math
 
-import audioop
 import numpy as np
+import pytest
 
 from voice_api.utils.audio import (
+    AudioCodecPipeline,
     adk_pcm24k_to_twilio_ulaw8k,
     twilio_ulaw8k_to_adk_pcm16k,
+    ulaw_decode,
+    ulaw_encode,
 )
 
 
@@ -17,10 +20,42 @@ def _tone_int16(sample_rate_hz: int, seconds: float, freq_hz: float = 440.0) ->
     return pcm.tobytes()
 
 
+def _lin2ulaw(pcm: bytes) -> bytes:
+    return ulaw_encode(np.frombuffer(pcm, dtype=np.int16)).tobytes()
+
+
+def test_ulaw_decode_matches_audioop():
+    audioop = pytest.importorskip("audioop")
+    codes = bytes(range(256))
+
+    expected = np.frombuffer(audioop.ulaw2lin(codes, 2), dtype=np.int16)
+
+    assert np.array_equal(ulaw_decode(codes), expected)
+
+
+def test_ulaw_decode_float32_is_scaled_pcm():
+    codes = bytes(range(256))
+    out = np.empty(256, dtype=np.float32)
+
+    result = ulaw_decode(codes, out)
+
+    assert result is out
+    assert np.array_equal(out * 32768.0, ulaw_decode(codes).astype(np.float32))
+
+
+def test_ulaw_encode_matches_audioop_for_every_sample():
+    audioop = pytest.importorskip("audioop")
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16)
+
+    expected = np.frombuffer(audioop.lin2ulaw(pcm.tobytes(), 2), dtype=np.uint8)
+
+    assert np.array_equal(ulaw_encode(pcm), expected)
+
+
 def test_twilio_ulaw8k_to_adk_pcm16k_output_length():
     # 1 second @ 8kHz μ-law should become 1 second @ 16kHz 16-bit PCM
     pcm8k = _tone_int16(8000, 1.0)
-    ulaw = audioop.lin2ulaw(pcm8k, 2)
+    ulaw = _lin2ulaw(pcm8k)
 
     out = twilio_ulaw8k_to_adk_pcm16k(ulaw)
 
@@ -36,3 +71,88 @@ def test_adk_pcm24k_to_twilio_ulaw8k_output_length():
 
     assert isinstance(out, (bytes, bytearray))
     assert len(out) == 8000  # 1 sec * 8k samples/sec * 1 byte/sample
+
+
+def _frames(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("dtype", ["int16", "float32"])
+def test_one_shot_dtypes_agree(dtype):
+    pcm24k = _tone_int16(24000, 0.5)
+
+    reference = adk_pcm24k_to_twilio_ulaw8k(pcm24k, "float32")
+    out = adk_pcm24k_to_twilio_ulaw8k(pcm24k, dtype)
+
+    assert len(out) == len(reference)
+    assert len(twilio_ulaw8k_to_adk_pcm16k(out, dtype)) == len(out) * 4
+
+
+@pytest.mark.parametrize("dtype", ["int16", "float32"])
+def test_pipeline_inbound_streams_twilio_frames(dtype):
+    # 1 second of 20 ms Twilio frames should come out as ~1 second @ 16kHz
+    ulaw = _lin2ulaw(_tone_int16(8000, 1.0))
+    pipeline = AudioCodecPipeline(dtype=dtype)
+
+    out = b"".join(pipeline.inbound(frame) for frame in _frames(ulaw, 160))
+
+    assert isinstance(out, bytes)
+    assert len(out) % 2 == 0
+    # The resampler holds back less than 100 ms of audio
+    assert 16000 * 2 - len(out) < 1600 * 2
+
+
+@pytest.mark.parametrize("dtype", ["int16", "float32"])
+def test_pipeline_outbound_streams_agent_chunks(dtype):
+    pcm24k = _tone_int16(24000, 1.0)
+    pipeline = AudioCodecPipeline(dtype=dtype)
+
+    # ADK chunks are not frame aligned
+    out = b"".join(pipeline.outbound(chunk) for chunk in _frames(pcm24k, 1234))
+
+    assert 8000 - len(out) < 800
+
+
+def test_pipeline_has_no_frame_boundary_clicks():
+    # A pure tone has no large sample-to-sample jumps; zero-padded frame
+    # edges in one-shot resampling do.
+    ulaw = _lin2ulaw(_tone_int16(8000, 1.0, freq_hz=200.0))
+    pipeline = AudioCodecPipeline()
+
+    streamed = b"".join(pipeline.inbound(frame) for frame in _frames(ulaw, 160))
+    one_shot = b"".join(
+        twilio_ulaw8k_to_adk_pcm16k(frame) for frame in _frames(ulaw, 160)
+    )
+
+    def max_jump(pcm: bytes) -> int:
+        x = np.frombuffer(pcm, dtype=np.int16).astype(np.int32)
+        # Skip the resampler warm-up
+        return int(np.abs(np.diff(x[1600:])).max())
+
+    assert max_jump(streamed) < max_jump(one_shot)
+
+
+def test_pipeline_reset_outbound_drops_buffered_audio():
+    pipeline = AudioCodecPipeline()
+    pipeline.outbound(_tone_int16(24000, 0.1))
+
+    pipeline.reset_outbound()
+    out = pipeline.outbound(b"")
+
+    assert out == b""
+
+
+def test_pipeline_int16_matches_float32_reference():
+    pcm24k = _tone_int16(24000, 1.0)
+    chunks = _frames(pcm24k, 960)
+    fast = AudioCodecPipeline(dtype="int16")
+    reference = AudioCodecPipeline(dtype="float32")
+
+    fast_out = b"".join(fast.inbound(fast.outbound(chunk)) for chunk in chunks)
+    ref_out = b"".join(reference.inbound(reference.outbound(chunk)) for chunk in chunks)
+
+    x = np.frombuffer(fast_out, dtype=np.int16).astype(np.int32)
+    y = np.frombuffer(ref_out, dtype=np.int16).astype(np.int32)
+    assert len(x) == len(y)
+    # Both paths quantize to μ-law in between, so allow a couple of steps
+    assert np.abs(x - y).max() < 0.02 * 32768
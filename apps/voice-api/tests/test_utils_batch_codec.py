@@ -0,0 +1,105 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from voice_api.utils.audio import AudioCodecPipeline, ulaw_decode
+from voice_api.utils.batch_codec import BatchTranscoder
+from voice_api.utils.codec_executor import CodecExecutor
+
+
+def _inbound_frames(seed: int) -> list[bytes]:
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, 160, dtype=np.uint8).tobytes() for _ in range(25)]
+
+
+def _outbound_chunks(seed: int) -> list[bytes]:
+    rng = np.random.default_rng(seed)
+    return [
+        rng.integers(-8000, 8000, 960, dtype=np.int16).tobytes() for _ in range(10)
+    ]
+
+
+def _max_diff(out: bytes, expected: bytes, dtype) -> int:
+    # soxr dithers int16 output, so runs can differ by an LSB
+    assert len(out) == len(expected)
+    x = np.frombuffer(out, dtype=dtype).astype(np.int32)
+    y = np.frombuffer(expected, dtype=dtype).astype(np.int32)
+    return int(np.abs(x - y).max(initial=0))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dtype", ["int16", "float32"])
+async def test_batches_frames_across_calls(dtype):
+    transcoder = BatchTranscoder(tick_ms=5, dtype=dtype)
+    calls = [AudioCodecPipeline(dtype=dtype) for _ in range(3)]
+    references = [AudioCodecPipeline(dtype=dtype) for _ in range(3)]
+
+    async def run_call(i: int) -> tuple[bytes, bytes]:
+        inbound = [await transcoder.inbound(calls[i], f) for f in _inbound_frames(i)]
+        outbound = [
+            await transcoder.outbound(calls[i], c) for c in _outbound_chunks(i)
+        ]
+        return b"".join(inbound), b"".join(outbound)
+
+    try:
+        results = await asyncio.gather(*(run_call(i) for i in range(3)))
+    finally:
+        transcoder.stop()
+
+    for i, (pcm16, ulaw) in enumerate(results):
+        reference = references[i]
+        expected_in = b"".join(map(reference.inbound, _inbound_frames(i)))
+        expected_out = b"".join(map(reference.outbound, _outbound_chunks(i)))
+        assert _max_diff(pcm16, expected_in, np.int16) <= 2
+        # An LSB of dither can flip a μ-law code, at most one step apart
+        assert len(ulaw) == len(expected_out)
+        diff = ulaw_decode(ulaw).astype(np.int32) - ulaw_decode(expected_out)
+        assert np.abs(diff).max(initial=0) <= 1024
+
+    # Three calls submit a frame each before every tick
+    assert transcoder.frames == 3 * (25 + 10)
+    assert transcoder.max_batch == 3
+    assert transcoder.mean_batch > 2
+    assert sum(transcoder.batch_sizes.values()) == transcoder.ticks
+
+
+@pytest.mark.asyncio
+async def test_keeps_order_for_frames_in_one_tick():
+    transcoder = BatchTranscoder(tick_ms=5)
+    pipeline = AudioCodecPipeline()
+    reference = AudioCodecPipeline()
+    frames = _inbound_frames(0)
+
+    try:
+        out = await asyncio.gather(*(transcoder.inbound(pipeline, f) for f in frames))
+    finally:
+        transcoder.stop()
+
+    assert transcoder.ticks == 1
+    assert transcoder.batch_sizes == {len(frames): 1}
+    expected = b"".join(map(reference.inbound, frames))
+    assert _max_diff(b"".join(out), expected, np.int16) <= 2
+
+
+@pytest.mark.asyncio
+async def test_executor_batch_mode():
+    executor = CodecExecutor("batch", tick_ms=2)
+
+    try:
+        first = executor.open("CA1")
+        second = executor.open("CA2")
+        results = await asyncio.gather(
+            first.inbound(b"\xff" * 1600), second.outbound(b"\x00\x00" * 4800)
+        )
+        await first.reset_outbound()
+        first.close()
+        second.close()
+    finally:
+        executor.shutdown()
+
+    pcm16, ulaw = results
+    assert len(pcm16) > 0 and len(ulaw) > 0
+    assert executor.transcoder.max_batch == 2
+    assert executor.submitted == 2
+    assert executor.queue_depth == 0
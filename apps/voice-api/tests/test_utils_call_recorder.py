@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+
+from voice_api.utils.call_recorder import CallRecorder, agent_events, read_recording
+
+
+def _audio_event(data: bytes) -> Event:
+    blob = Blob(data=data, mime_type="audio/pcm;rate=24000")
+    return Event(author="voice_agent", content=Content(parts=[Part(inline_data=blob)]))
+
+
+async def _events(*events: Event):
+    for event in events:
+        yield event
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["call.jsonl", "call.jsonl.gz"])
+async def test_records_and_reads_back(tmp_path, name):
+    path = str(tmp_path / name)
+    recorder = CallRecorder(path, flush_lines=2)
+    recorder.twilio_in(json.dumps({"event": "connected"}))
+    recorder.twilio_in(json.dumps({"event": "start", "streamSid": "MZ1"}))
+    tapped = [e async for e in recorder.tap(_events(_audio_event(b"\x00\xff")))]
+    recorder.twilio_out('{"event":"media","media":{"payload":"/w=="}}')
+    await recorder.close()
+
+    records = list(read_recording(path))
+    assert [source for _, source, _ in records] == ["in", "in", "agent", "out"]
+    assert records[2][2].content.parts[0].inline_data.data == b"\x00\xff"
+    assert records[2][2].id == tapped[0].id
+    assert [t for t, _, _ in records] == sorted(t for t, _, _ in records)
+    assert recorder.lines == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, 2, 4])
+async def test_reads_back_multiples_of_flush_lines(tmp_path, count):
+    path = str(tmp_path / "call.jsonl.gz")
+    recorder = CallRecorder(path, flush_lines=2)
+    for i in range(count):
+        recorder.twilio_in(json.dumps({"event": "media", "sequenceNumber": i}))
+    await recorder.close()
+
+    # Nothing is left pending at close, which wrote no blank line
+    assert len(list(read_recording(path))) == count
+    assert agent_events(path) == []
+
+
+def test_read_skips_blank_lines(tmp_path):
+    path = str(tmp_path / "call.jsonl")
+    with open(path, "w") as f:
+        f.write('{"t":0.5,"in":"{\\"event\\": \\"connected\\"}"}\n\n')
+
+    assert [source for _, source, _ in read_recording(path)] == ["in"]
+
+
+@pytest.mark.asyncio
+async def test_agent_events_are_timed_from_start(tmp_path):
+    path = str(tmp_path / "call.jsonl")
+    with open(path, "w") as f:
+        f.write('{"t":0.5,"in":"{\\"event\\": \\"connected\\"}"}\n')
+        f.write('{"t":1.0,"in":"{\\"event\\": \\"start\\"}"}\n')
+        event = Event(author="voice_agent", turn_complete=True)
+        f.write(f'{{"t":3.5,"agent":{event.model_dump_json()}}}\n')
+
+    [(offset, replayed)] = agent_events(path)
+    assert offset == 2.5
+    assert replayed.turn_complete
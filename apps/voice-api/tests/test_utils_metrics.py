@@ -0,0 +1,111 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voice_api.main import app
+from voice_api.utils.metrics import MetricsRegistry
+
+SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})? (\S+)$")
+SUFFIXES = {
+    "counter": ("",),
+    "gauge": ("",),
+    "histogram": ("_bucket", "_sum", "_count"),
+}
+
+
+def _parse_exposition(text: str) -> dict[str, list[str]]:
+    """Sample names per family, checking the text format along the way"""
+    families: dict[str, list[str]] = {}
+    helped = set()
+    family = kind = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            helped.add(line.split(" ")[2])
+        elif line.startswith("# TYPE "):
+            _, _, family, kind = line.split(" ")
+            assert family in helped, f"TYPE without HELP for {family}"
+            assert family not in families, f"{family} declared twice"
+            families[family] = []
+        else:
+            name, _, value = SAMPLE.match(line).groups()
+            float(value.replace("Inf", "inf"))
+            assert name in [family + suffix for suffix in SUFFIXES[kind]], name
+            families[family].append(name)
+    return families
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_counter_family_has_total_suffix():
+    registry = MetricsRegistry()
+    registry.counter("calls", "Calls").inc()
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        "calls_total 1",
+    ]
+
+
+def test_counter_and_gauge_with_labels():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames", "Frames", ("direction",))
+    active = registry.gauge("active", "Active")
+    frames.labels(direction="in").inc()
+    frames.labels(direction="in").inc(2)
+    frames.labels(direction='"out"').inc()
+    active.inc()
+    active.inc()
+    active.dec()
+
+    lines = registry.render().splitlines()
+    assert 'frames_total{direction="in"} 3' in lines
+    assert 'frames_total{direction="\\"out\\""} 1' in lines
+    assert "active 1" in lines
+
+
+def test_gauge_reports_function_value():
+    registry = MetricsRegistry()
+    queued = [3, 4]
+    registry.gauge("queued_frames", "Frames").set_function(lambda: sum(queued))
+
+    assert "queued_frames 7" in registry.render().splitlines()
+    queued.append(1)
+    assert "queued_frames 8" in registry.render().splitlines()
+
+
+def test_duplicate_metric_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("calls", "Calls")
+    with pytest.raises(ValueError):
+        registry.gauge("calls", "Calls")
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE voice_active_calls gauge" in response.text
+    assert 'voice_codec_seconds_bucket{direction="inbound",le="+Inf"}' in response.text
+    families = _parse_exposition(response.text)
+    assert families["voice_calls_total"] == ["voice_calls_total"]
+    assert "voice_codec_seconds_count" in families["voice_codec_seconds"]
+    assert "voice_codec_queue_depth 0" in response.text.splitlines()
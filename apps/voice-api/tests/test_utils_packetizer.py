@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from voice_api.utils.packetizer import (
+    FRAME_BYTES,
+    FRAME_SECONDS,
+    FrameRingBuffer,
+    OutboundPacketizer,
+)
+
+
+def test_ring_buffer_wraps_around():
+    buffer = FrameRingBuffer(capacity=8)
+
+    buffer.write(b"abcdef")
+    assert buffer.read(4) == b"abcd"
+    buffer.write(b"ghijk")  # wraps past the end of the 8-byte buffer
+
+    assert len(buffer) == 7
+    assert buffer.read(100) == b"efghijk"
+    assert len(buffer) == 0
+
+
+def test_ring_buffer_grows_and_keeps_order():
+    buffer = FrameRingBuffer(capacity=4)
+    buffer.write(b"abc")
+    buffer.read(2)
+
+    buffer.write(b"defghij")
+
+    assert buffer.read(100) == b"cdefghij"
+
+
+def test_ring_buffer_clear_returns_dropped_bytes():
+    buffer = FrameRingBuffer()
+    buffer.write(b"x" * 500)
+
+    assert buffer.clear() == 500
+    assert len(buffer) == 0
+
+
+async def _collect(packetizer: OutboundPacketizer, seconds: float):
+    task = asyncio.create_task(packetizer.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_packetizer_sends_fixed_size_frames():
+    frames = []
+
+    async def send(frame: bytes):
+        frames.append(frame)
+
+    packetizer = OutboundPacketizer(send, lead=1.0)
+    packetizer.write(b"\x01" * 400)  # 2.5 frames, not frame aligned
+    packetizer.flush()
+
+    await _collect(packetizer, 0.05)
+
+    assert [len(f) for f in frames] == [FRAME_BYTES] * 3
+    # The partial tail is padded with μ-law silence
+    assert frames[-1] == b"\x01" * 80 + b"\xff" * 80
+
+
+@pytest.mark.asyncio
+async def test_packetizer_paces_close_to_real_time():
+    loop = asyncio.get_running_loop()
+    sent_at = []
+
+    async def send(_frame: bytes):
+        sent_at.append(loop.time())
+
+    lead = 0.04
+    packetizer = OutboundPacketizer(send, lead=lead)
+    packetizer.write(b"\x00" * FRAME_BYTES * 50)  # one second of audio at once
+    start = loop.time()
+
+    await _collect(packetizer, 0.3)
+
+    # Only the lead plus elapsed time worth of audio may be sent
+    expected = (0.3 + lead) / FRAME_SECONDS + 1
+    assert len(sent_at) <= expected + 1
+    assert len(sent_at) >= 0.3 / FRAME_SECONDS - 3
+    assert sent_at[0] - start < 0.01
+    assert packetizer.buffered_seconds > 0.5
+
+
+@pytest.mark.asyncio
+async def test_packetizer_paces_audio_arriving_in_small_chunks():
+    sent = []
+
+    async def send(frame: bytes):
+        sent.append(frame)
+
+    packetizer = OutboundPacketizer(send, lead=0.04)
+    task = asyncio.create_task(packetizer.run())
+    # 40 ms chunks arriving 4x faster than real time, each drained at once
+    for _ in range(30):
+        packetizer.write(b"\x00" * FRAME_BYTES * 2)
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    # Sending stays near real time instead of restarting with every chunk
+    assert len(sent) <= (0.3 + 0.04) / FRAME_SECONDS + 3
+    assert packetizer.buffered_seconds > 0.5
+
+
+@pytest.mark.asyncio
+async def test_packetizer_clear_drops_pending_audio():
+    frames = []
+
+    async def send(frame: bytes):
+        frames.append(frame)
+
+    packetizer = OutboundPacketizer(send, lead=0.0)
+    packetizer.write(b"\x00" * FRAME_BYTES * 50)
+    task = asyncio.create_task(packetizer.run())
+    await asyncio.sleep(0.05)
+
+    dropped = packetizer.clear()
+    sent_before_clear = len(frames)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert dropped > 0
+    assert packetizer.buffered_seconds == 0
+    assert len(frames) <= sent_before_clear + 1
+
+
+def test_ring_buffer_skip_drops_oldest_bytes():
+    buffer = FrameRingBuffer(capacity=8)
+    buffer.write(b"abcdef")
+    buffer.read(4)
+    buffer.write(b"ghij")  # wraps around
+
+    assert buffer.skip(3) == 3
+    assert buffer.read(100) == b"hij"
+
+
+async def _noop_send(_frame: bytes):
+    pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow, kept",
+    [("drop_oldest", b"\x02" * FRAME_BYTES), ("drop_newest", b"\x01" * FRAME_BYTES)],
+)
+async def test_packetizer_overflow_policies(overflow, kept):
+    packetizer = OutboundPacketizer(
+        _noop_send, max_seconds=2 * FRAME_SECONDS, overflow=overflow
+    )
+
+    packetizer.write(b"\x01" * FRAME_BYTES * 2)
+    packetizer.write(b"\x02" * FRAME_BYTES)
+
+    assert packetizer.depth_frames == 2
+    assert packetizer.bytes_overflowed == FRAME_BYTES
+    assert packetizer._buffer.read(FRAME_BYTES * 2)[FRAME_BYTES:] == kept
+
+
+@pytest.mark.asyncio
+async def test_packetizer_block_policy_waits_for_room():
+    frames = []
+
+    async def send(frame: bytes):
+        frames.append(frame)
+
+    packetizer = OutboundPacketizer(
+        send, lead=0.0, max_seconds=2 * FRAME_SECONDS, overflow="block"
+    )
+    await packetizer.put(b"\x00" * FRAME_BYTES * 2)
+    put_task = asyncio.create_task(packetizer.put(b"\x01" * FRAME_BYTES))
+    await asyncio.sleep(0.005)
+    assert not put_task.done()  # full, nothing sent yet
+
+    await _collect(packetizer, 0.01)  # the pacer sends a frame, making room
+    await asyncio.wait_for(put_task, 0.1)
+
+    assert packetizer.bytes_overflowed == 0
+    assert packetizer.max_buffered_seconds <= 2 * FRAME_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_packetizer_clear_unblocks_writers():
+    packetizer = OutboundPacketizer(
+        _noop_send, max_seconds=FRAME_SECONDS, overflow="block"
+    )
+    await packetizer.put(b"\x00" * FRAME_BYTES)
+    put_task = asyncio.create_task(packetizer.put(b"\x01" * FRAME_BYTES))
+    await asyncio.sleep(0)
+
+    packetizer.clear()  # agent interrupted
+    await asyncio.wait_for(put_task, 0.1)
+
+    assert packetizer.depth_frames == 1
+
+
+@pytest.mark.asyncio
+async def test_packetizer_reports_lag_behind_real_time():
+    async def slow_send(_frame: bytes):
+        await asyncio.sleep(0.03)  # slower than one frame per 20 ms
+
+    packetizer = OutboundPacketizer(slow_send, lead=0.0)
+    packetizer.write(b"\x00" * FRAME_BYTES * 10)
+
+    await _collect(packetizer, 0.1)
+
+    assert packetizer.max_lag_seconds > 0.005
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from voice_api.utils.prewarm import SessionPrewarmer
+
+
+class DummyQueue:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _session_factory(events: list[str], started: list[tuple]):
+    async def start_session(*args):
+        started.append(args)
+
+        async def live_events():
+            for event in events:
+                yield event
+            await asyncio.Event().wait()  # stay connected
+
+        return live_events(), DummyQueue()
+
+    return start_session
+
+
+@pytest.mark.asyncio
+async def test_claim_replays_events_received_before_the_stream():
+    started = []
+    prewarmer = SessionPrewarmer(_session_factory(["greeting", "audio"], started))
+
+    prewarmer.start("CA1", "+15551234567", "CA1")
+    await asyncio.sleep(0.01)  # Twilio negotiating the media stream
+    warm = await prewarmer.claim("CA1")
+
+    assert started == [("+15551234567", "CA1")]
+    assert warm.buffered_events == 2
+    events = warm.live_events()
+    assert [await anext(events), await anext(events)] == ["greeting", "audio"]
+    assert len(prewarmer) == 0 and prewarmer.claimed == 1
+
+    warm.close()
+    assert warm.live_request_queue.closed
+
+
+@pytest.mark.asyncio
+async def test_claim_waits_for_a_session_still_starting():
+    async def slow_start(*_args):
+        await asyncio.sleep(0.02)
+        return _events(), DummyQueue()
+
+    async def _events():
+        yield "greeting"
+
+    prewarmer = SessionPrewarmer(slow_start)
+    prewarmer.start("CA1")
+    warm = await prewarmer.claim("CA1")
+
+    assert [event async for event in warm.live_events()] == ["greeting"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_failed_sessions_are_not_claimed():
+    async def failing_start(*_args):
+        raise RuntimeError("model unavailable")
+
+    prewarmer = SessionPrewarmer(failing_start)
+    prewarmer.start("CA1")
+
+    assert await prewarmer.claim("CA1") is None
+    assert await prewarmer.claim("CA2") is None
+    assert prewarmer.claimed == 0
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_sessions_are_reaped():
+    ended = []
+
+    async def end_session(*args):
+        ended.append(args)
+
+    prewarmer = SessionPrewarmer(_session_factory([], []), end_session, timeout=0.02)
+    warm = prewarmer.start("CA1", "+15551234567", "CA1")
+    await asyncio.sleep(0.05)
+
+    assert len(prewarmer) == 0 and prewarmer.reaped == 1
+    assert warm.live_request_queue.closed
+    assert ended == [("+15551234567", "CA1")]
+    assert await prewarmer.claim("CA1") is None
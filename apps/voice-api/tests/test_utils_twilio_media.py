@@ -0,0 +1,50 @@
+import base64
+import json
+
+from voice_api.utils.twilio_media import MediaMessageEncoder, parse_media_payload
+
+FRAME = bytes(range(157)) + b"\xff" * 3  # base64 ends in "////"
+
+
+def _message(**kwargs) -> str:
+    # Twilio's field order and compact separators
+    message = {
+        "event": "media",
+        "sequenceNumber": "2",
+        "media": {
+            "track": "inbound",
+            "chunk": "1",
+            "timestamp": "57",
+            "payload": base64.b64encode(FRAME).decode(),
+        },
+        "streamSid": "MZ123",
+    }
+    return json.dumps(message, **kwargs)
+
+
+def test_parse_compact_media_message():
+    assert parse_media_payload(_message(separators=(",", ":"))) == FRAME
+
+
+def test_other_messages_fall_back_to_json():
+    assert parse_media_payload(_message()) is None  # spaced separators
+    assert parse_media_payload('{"event":"stop","streamSid":"MZ123"}') is None
+    assert parse_media_payload('{"event":"mark","mark":{"name":"a"}}') is None
+    escaped = _message(separators=(",", ":")).replace("/", "\\/")
+    assert parse_media_payload(escaped) is None
+
+
+def test_encoder_matches_generic_json():
+    message = MediaMessageEncoder("MZ123").encode(FRAME)
+
+    assert json.loads(message) == {
+        "event": "media",
+        "streamSid": "MZ123",
+        "media": {"payload": base64.b64encode(FRAME).decode()},
+    }
+
+
+def test_encoder_escapes_stream_sid():
+    message = MediaMessageEncoder('MZ"1').encode(b"")
+
+    assert json.loads(message)["streamSid"] == 'MZ"1'
@@ -0,0 +1,163 @@
+import math
+
+import numpy as np
+
+from voice_api.utils.audio import ulaw_encode
+from voice_api.utils.vad import (
+    Endpointer,
+    LocalTurnSender,
+    SilenceGate,
+    pcm16_dbfs,
+    ulaw_frame_dbfs,
+)
+
+SILENCE = b"\xff" * 160
+PCM_SILENCE = b"\x00\x00" * 320  # 20 ms @ 16kHz
+
+
+def _tone_frame(amplitude: float, index: int = 0) -> bytes:
+    t = (np.arange(160) + 160 * index) / 8000
+    x = amplitude * np.sin(2 * math.pi * 440 * t) * 32767
+    return ulaw_encode(x.astype(np.int16)).tobytes()
+
+
+def test_ulaw_frame_dbfs():
+    assert ulaw_frame_dbfs(SILENCE) == -math.inf
+    # A full-scale sine is -3 dBFS
+    assert abs(ulaw_frame_dbfs(_tone_frame(1.0)) + 3.0) < 0.5
+    assert abs(ulaw_frame_dbfs(_tone_frame(0.01)) + 43.0) < 1.0
+
+
+def test_gate_suppresses_silence_after_hangover():
+    gate = SilenceGate(hangover_ms=100, preroll_ms=0)
+
+    assert gate.process(_tone_frame(0.5)) == [_tone_frame(0.5)]
+    forwarded = [gate.process(SILENCE) for _ in range(20)]
+
+    # 100 ms of hangover is forwarded, the rest is dropped
+    assert sum(len(frames) for frames in forwarded) == 5
+    assert gate.frames_in == 21
+    assert gate.frames_suppressed == 15
+
+
+def test_gate_keeps_time_of_last_speech():
+    gate = SilenceGate()
+    assert gate.last_speech_at is None
+
+    gate.process(_tone_frame(0.5))
+    spoke_at = gate.last_speech_at
+    gate.process(SILENCE)
+
+    assert spoke_at is not None
+    assert gate.last_speech_at == spoke_at
+
+
+def test_gate_times_speech_without_gating():
+    gate = SilenceGate()
+
+    assert not gate.is_speech(SILENCE)
+    assert gate.last_speech_at is None
+    assert gate.is_speech(_tone_frame(0.5))
+    assert gate.last_speech_at is not None
+    assert gate.frames_in == 0
+
+
+def test_gate_releases_preroll_in_order_on_speech_onset():
+    gate = SilenceGate(hangover_ms=0, preroll_ms=40)
+    quiet = [bytes([0xFE - i]) * 160 for i in range(5)]  # distinct, near silent
+
+    for frame in quiet:
+        assert gate.process(frame) == []
+    onset = gate.process(_tone_frame(0.5))
+
+    assert onset == [quiet[-2], quiet[-1], _tone_frame(0.5)]
+    assert gate.frames_suppressed == 3
+
+
+def test_gate_thins_out_silence():
+    gate = SilenceGate(hangover_ms=0, preroll_ms=0, keep_every=5)
+
+    forwarded = sum(len(gate.process(SILENCE)) for _ in range(50))
+
+    assert forwarded == 10
+
+
+def _pcm_tone(amplitude: float) -> bytes:
+    t = np.arange(320) / 16000
+    x = amplitude * np.sin(2 * math.pi * 440 * t) * 32767
+    return x.astype(np.int16).tobytes()
+
+
+def test_pcm16_dbfs():
+    assert pcm16_dbfs(PCM_SILENCE) == -math.inf
+    assert abs(pcm16_dbfs(_pcm_tone(1.0)) + 3.0) < 0.5
+
+
+def test_endpointer_marks_turn_start_and_end():
+    endpointer = Endpointer(threshold_dbfs=-40, min_speech_ms=40, silence_ms=100)
+    speech = _pcm_tone(0.3)
+
+    assert endpointer.process(speech) == (False, False)
+    assert endpointer.process(speech) == (True, False)
+    assert endpointer.in_turn
+    # Short pauses inside the turn do not end it
+    assert endpointer.process(PCM_SILENCE) == (False, False)
+    assert endpointer.process(speech) == (False, False)
+
+    signals = [endpointer.process(PCM_SILENCE) for _ in range(5)]
+
+    assert signals[-1] == (False, True)
+    assert signals[:-1] == [(False, False)] * 4
+    assert endpointer.turns == 1
+    assert endpointer.last_turn_end is not None
+    assert not endpointer.in_turn
+
+
+def test_endpointer_ignores_short_blips():
+    endpointer = Endpointer(threshold_dbfs=-40, min_speech_ms=60, silence_ms=100)
+
+    for _ in range(10):
+        assert endpointer.process(_pcm_tone(0.3)) == (False, False)
+        assert endpointer.process(PCM_SILENCE) == (False, False)
+
+    assert not endpointer.in_turn
+    assert endpointer.turns == 0
+
+
+def _turn_sender(sent: list, preroll_ms: int = 40) -> LocalTurnSender:
+    endpointer = Endpointer(threshold_dbfs=-40, min_speech_ms=60, silence_ms=100)
+    return LocalTurnSender(
+        endpointer,
+        lambda pcm: sent.append(pcm),
+        lambda: sent.append("FLUSH"),
+        lambda: sent.append("START"),
+        lambda: sent.append("END"),
+        preroll_ms=preroll_ms,
+    )
+
+
+def test_turn_sender_sends_onset_after_activity_start():
+    sent = []
+    turn_sender = _turn_sender(sent)
+    speech = [_pcm_tone(0.3 + i / 100) for i in range(5)]
+    quiet = [bytes([i, 0]) * 320 for i in range(1, 5)]  # distinct, below -40 dBFS
+
+    for chunk in [*quiet, *speech, *[PCM_SILENCE] * 5]:
+        turn_sender.send(chunk)
+
+    # Nothing before the start; 40 ms of pre-roll, then the onset in order
+    assert sent[0] == "START"
+    assert sent[1:8] == [*quiet[-2:], *speech]
+    assert sent[-2:] == ["FLUSH", "END"]
+    assert sent[8:-2] == [PCM_SILENCE] * 5
+
+
+def test_turn_sender_drops_audio_between_turns():
+    sent = []
+    turn_sender = _turn_sender(sent, preroll_ms=0)
+
+    for _ in range(10):
+        turn_sender.send(_pcm_tone(0.3))  # blips too short for a turn
+        turn_sender.send(PCM_SILENCE)
+
+    assert sent == []
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agent_core.runtime.live_messaging import runner_registry
+
+from voice_api.main import app
+from voice_api.utils.warmup import Warmup, warmup
+
+
+@pytest.mark.asyncio
+async def test_ready_after_all_steps():
+    ran = []
+
+    async def prime():
+        ran.append("codec")
+
+    w = Warmup()
+    await w.run([("agents", lambda: ran.append("agents")), ("codec", prime)])
+
+    assert ran == ["agents", "codec"]
+    assert w.ready and w.error is None
+    assert list(w.status()["steps_ms"]) == ["agents", "codec"]
+
+
+@pytest.mark.asyncio
+async def test_failed_step_stays_not_ready():
+    def load_agents():
+        raise ImportError("no adk")
+
+    w = Warmup()
+    await w.run([("agents", load_agents), ("codec", lambda: None)])
+
+    assert not w.ready
+    assert w.status()["status"] == "failed"
+    assert "no adk" in w.error
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_once_warm():
+    w = Warmup()
+    task = w.start([("agents", lambda: None)])
+
+    await w.wait(timeout=5)
+
+    assert w.ready and not w.running
+    await task
+
+
+@pytest.mark.asyncio
+async def test_wait_raises_when_warmup_is_slow_or_failed():
+    async def load_agents_slowly():
+        await asyncio.sleep(0.2)
+
+    w = Warmup()
+    task = w.start([("agents", load_agents_slowly)])
+    with pytest.raises(TimeoutError):
+        await w.wait(timeout=0.05)
+    await task
+
+    def load_agents():
+        raise ImportError("no adk")
+
+    await w.run([("agents", load_agents)])
+    with pytest.raises(RuntimeError, match="no adk"):
+        await w.wait(timeout=5)
+
+
+def test_readiness_reports_warming_until_done(monkeypatch):
+    monkeypatch.setattr(warmup, "ready", False)
+    client = TestClient(app)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming"
+    assert client.get("/health/").status_code == 200
+
+
+def test_lifespan_warms_up(monkeypatch):
+    # The lifespan configures the shared registry, restored after the test
+    monkeypatch.setattr(runner_registry, "session_service", None)
+    monkeypatch.setattr(runner_registry, "_runners", {})
+
+    with TestClient(app) as client:
+        for _ in range(100):
+            response = client.get("/health/ready")
+            if response.status_code == 200:
+                break
+            client.portal.call(asyncio.sleep, 0.05)
+
+        assert response.status_code == 200
+        assert set(response.json()["steps_ms"]) == {"sessions", "agents", "codec"}
+        # Session storage is set up by the warmup, with its eviction task
+        assert runner_registry.session_service is not None
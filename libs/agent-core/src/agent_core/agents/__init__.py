@@ -1,7 +1,47 @@
-from .rag_agent.agent import root_agent as rag_agent
-from .scheduling_agent.agent import root_agent as scheduling_agent
-from .voice_agent.agent import root_agent as voice_agent
-from .faq_agent.agent import root_agent as faq_agent
-from .menu_agent.agent import root_agent as menu_agent
+"""
+Agents, each imported the first time it is used.
+
+Importing an agent imports google-adk, which takes seconds on a cold start.
+`from agent_core.agents import voice_agent` still works, and loads only that
+agent and its sub-agents; `load_agents` loads them ahead of time, e.g.
+during warmup.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Agent name -> module defining it as `root_agent`
+AGENT_MODULES = {
+    "rag_agent": ".rag_agent.agent",
+    "scheduling_agent": ".scheduling_agent.agent",
+    "voice_agent": ".voice_agent.agent",
+    "faq_agent": ".faq_agent.agent",
+    "menu_agent": ".menu_agent.agent",
+}
 
 __all__ = ["rag_agent", "scheduling_agent", "voice_agent", "faq_agent", "menu_agent"]
+
+if TYPE_CHECKING:
+    from .faq_agent.agent import root_agent as faq_agent
+    from .menu_agent.agent import root_agent as menu_agent
+    from .rag_agent.agent import root_agent as rag_agent
+    from .scheduling_agent.agent import root_agent as scheduling_agent
+    from .voice_agent.agent import root_agent as voice_agent
+
+
+def __getattr__(name: str) -> Any:
+    module = AGENT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    agent = importlib.import_module(module, __name__).root_agent
+    globals()[name] = agent  # later lookups skip __getattr__
+    return agent
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
+
+
+def load_agents(*names: str) -> list[Any]:
+    """Import the named agents now, all of them by default"""
+    return [__getattr__(name) for name in names or AGENT_MODULES]
@@ -0,0 +1,158 @@
+"""
+Context management for long calls.
+
+Every transcription fragment, tool call and state change of a call is kept
+as an event in its session, and the session's events are what the model is
+sent as history when a live connection starts or resumes. On a long ordering
+call that history, and the memory behind it, keeps growing.
+
+`ContextCompactor` keeps it bounded: state deltas for keys which are always
+rewritten whole, like `order`, are only kept on the latest event setting
+them, and only a sliding window of recent events is kept, by count and by
+estimated tokens. `ContextUsage` tracks the estimate per call.
+
+The live model's own context is bounded separately, by the
+`context_window_compression` of the RunConfig; see `build_run_config`.
+
+Usage:
+```python
+session_service = BoundedSessionService(
+    compactor=ContextCompactor(max_events=200, max_tokens=8000),
+)
+```
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+
+# Gemini counts audio at 32 tokens per second, and text at ~4 characters per
+# token. Estimates only, the live API does not report usage per turn.
+AUDIO_TOKENS_PER_SECOND = 32
+CHARS_PER_TOKEN = 4
+# The rate parameter of a PCM mime type, like audio/pcm;rate=16000;channels=1
+_RATE = re.compile(r"rate=(\d+)")
+
+
+def estimate_tokens(event: Event) -> int:
+    """Rough number of tokens an event adds to the history sent to the model"""
+    chars = 0
+    audio_seconds = 0.0
+    if event.content and event.content.parts:
+        for part in event.content.parts:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(json.dumps(part.function_call.args or {}, default=str))
+                chars += len(part.function_call.name or "")
+            elif part.function_response:
+                response = part.function_response.response or {}
+                chars += len(json.dumps(response, default=str))
+            elif part.inline_data and part.inline_data.data:
+                # 16-bit PCM, at the rate in the mime type or 16 kHz
+                rate = _RATE.search(part.inline_data.mime_type or "")
+                bytes_per_second = (int(rate.group(1)) if rate else 16000) * 2
+                audio_seconds += len(part.inline_data.data) / bytes_per_second
+    for transcription in (event.input_transcription, event.output_transcription):
+        if transcription and transcription.text:
+            chars += len(transcription.text)
+    tokens = chars / CHARS_PER_TOKEN + audio_seconds * AUDIO_TOKENS_PER_SECOND
+    return round(tokens)
+
+
+@dataclass(slots=True)
+class ContextUsage:
+    """Estimated context of one call's session"""
+
+    tokens: int = 0
+    peak_tokens: int = 0
+    events: int = 0
+    # Events added over the call, and dropped from the window
+    events_added: int = 0
+    events_dropped: int = 0
+    # State deltas removed from older events, by key
+    deltas_compacted: dict[str, int] = field(default_factory=dict)
+
+
+class ContextCompactor:
+    """
+    Keeps sessions' events bounded as they are appended.
+
+    Args:
+        max_events: Events kept per session, the most recent.
+        max_tokens: Estimated tokens kept per session, the most recent.
+        compact_keys: State keys whose value is always written whole. Only
+            the latest event setting one keeps it in its state delta; the
+            session state has the same value.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 200,
+        max_tokens: int = 8000,
+        compact_keys: tuple[str, ...] = ("order",),
+    ):
+        self.max_events = max_events
+        self.max_tokens = max_tokens
+        self.compact_keys = compact_keys
+        # Session ID -> usage, while the session is held
+        self.usage: dict[str, ContextUsage] = {}
+        # Estimated tokens per event in a window, by id(event)
+        self._tokens: dict[int, int] = {}
+
+    def appended(self, session: Session, event: Event) -> ContextUsage:
+        """Account for `event`, just appended to `session`, and compact it"""
+        usage = self.usage.setdefault(session.id, ContextUsage())
+        tokens = self._tokens.setdefault(id(event), estimate_tokens(event))
+        usage.tokens += tokens
+        usage.events_added += 1
+
+        state_delta = event.actions.state_delta if event.actions else None
+        if state_delta:
+            for key in self.compact_keys:
+                if key in state_delta:
+                    self._compact_key(session.events, event, key, usage)
+
+        self._slide(session.events, usage)
+        usage.events = len(session.events)
+        usage.peak_tokens = max(usage.peak_tokens, usage.tokens)
+        return usage
+
+    def forget(self, session: Session) -> ContextUsage | None:
+        """Stop tracking a released session, returning its usage"""
+        for event in session.events:
+            self._tokens.pop(id(event), None)
+        return self.usage.pop(session.id, None)
+
+    def _compact_key(
+        self, events: list[Event], latest: Event, key: str, usage: ContextUsage
+    ) -> None:
+        for event in reversed(events):
+            if event is latest:
+                continue
+            state_delta = event.actions.state_delta if event.actions else None
+            if state_delta and key in state_delta:
+                # Older ones were compacted when this one was appended
+                del state_delta[key]
+                usage.deltas_compacted[key] = usage.deltas_compacted.get(key, 0) + 1
+                return
+
+    def _slide(self, events: list[Event], usage: ContextUsage) -> None:
+        drop = 0
+        tokens = usage.tokens
+        while drop < len(events) - 1 and (
+            len(events) - drop > self.max_events or tokens > self.max_tokens
+        ):
+            tokens -= self._tokens.pop(id(events[drop]), 0)
+            drop += 1
+        # A window starting with a function response would have no call
+        while drop < len(events) - 1 and events[drop].get_function_responses():
+            tokens -= self._tokens.pop(id(events[drop]), 0)
+            drop += 1
+        if drop:
+            del events[:drop]
+            usage.tokens = tokens
+            usage.events_dropped += drop
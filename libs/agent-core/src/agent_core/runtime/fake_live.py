@@ -0,0 +1,259 @@
+"""
+Local stand-in for the live model, for benchmarks and tests without network.
+
+`FakeLiveBackend.start_session` has the contract of `start_agent_session`:
+it returns live events and a `LiveRequestQueue`, and the events end once
+the queue is closed. Nothing is sent to a model and no session is stored.
+
+Three modes:
+- `echo`: caller audio comes straight back as agent audio at 24kHz, and
+  each caller turn ends with `turn_complete`.
+- `script`: each caller turn, and each text content such as the greeting,
+  is answered after `think_ms` with the next scripted 24kHz response,
+  streamed in `chunk_ms` chunks and followed by `turn_complete`. Caller
+  speech during a response cancels it with `interrupted`, like barge-in.
+- `replay`: recorded events are sent again at their recorded offsets from
+  the start of the session, divided by `speed`, whatever the caller says.
+  They are stamped with the time they are sent.
+
+Caller turns end on `send_activity_end`, or after `turn_silence_ms` of
+quiet audio when the model would detect activity itself. A text content of
+exactly `interrupted` or `turn_complete` emits that event, as a cue.
+
+Usage:
+```python
+backend = FakeLiveBackend("script", [load_pcm("hello.wav")], think_ms=300)
+live_events, live_request_queue = await backend.start_session(...)
+```
+"""
+
+import array
+import asyncio
+import math
+import sys
+import time
+import wave
+from typing import AsyncGenerator, Literal
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.live_request_queue import LiveRequest, LiveRequestQueue
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+
+LiveEvents = AsyncGenerator[Event, None]
+
+FakeLiveMode = Literal["echo", "script", "replay"]
+
+OUTPUT_SAMPLE_RATE = 24000
+OUTPUT_MIME_TYPE = f"audio/pcm;rate={OUTPUT_SAMPLE_RATE}"
+INPUT_BYTES_PER_MS = 16000 * 2 // 1000  # 16-bit mono
+OUTPUT_BYTES_PER_MS = OUTPUT_SAMPLE_RATE * 2 // 1000
+CUES = ("interrupted", "turn_complete")
+
+
+def load_pcm(path: str) -> bytes:
+    """The samples of a 16-bit mono 24kHz WAV file, as a scripted response"""
+    with wave.open(path, "rb") as wav:
+        params = (wav.getsampwidth(), wav.getnchannels(), wav.getframerate())
+        if params != (2, 1, OUTPUT_SAMPLE_RATE):
+            raise ValueError(f"{path} is not 16-bit mono {OUTPUT_SAMPLE_RATE} Hz")
+        return wav.readframes(wav.getnframes())
+
+
+def tone(seconds: float = 1.5, frequency: float = 440.0) -> bytes:
+    """A plain tone as 24kHz PCM, the response when none is scripted"""
+    samples = array.array(
+        "h",
+        (
+            int(8000 * math.sin(2 * math.pi * frequency * i / OUTPUT_SAMPLE_RATE))
+            for i in range(int(seconds * OUTPUT_SAMPLE_RATE))
+        ),
+    )
+    return _little_endian(samples).tobytes()
+
+
+def _little_endian(samples: array.array) -> array.array:
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def upsample_16k_to_24k(pcm16: bytes) -> bytes:
+    """Repeats every other sample; crude, but cheap and enough for an echo"""
+    samples = _little_endian(array.array("h", pcm16[: len(pcm16) // 4 * 4]))
+    out = array.array("h", bytes(len(samples) * 3))
+    out[0::3] = samples[0::2]
+    out[1::3] = samples[1::2]
+    out[2::3] = samples[1::2]
+    return _little_endian(out).tobytes()
+
+
+def _peak(pcm16: bytes) -> int:
+    samples = _little_endian(array.array("h", pcm16[: len(pcm16) // 2 * 2]))
+    return max(max(samples), -min(samples)) if samples else 0
+
+
+class FakeLiveBackend:
+    """
+    Fake live model, selected in place of `start_agent_session`.
+
+    Args:
+        mode: `echo`, `script` or `replay`, see the module docstring.
+        responses: 24kHz PCM responses used in turn, in `script` mode.
+        replay: Events and their offsets in seconds, in `replay` mode.
+        think_ms: Delay before a scripted response starts.
+        chunk_ms: Audio per event of a scripted response.
+        speed: How much faster than real time responses and replayed
+            events are sent.
+        turn_silence_ms: Quiet caller audio ending a turn, without local
+            activity detection.
+        speech_peak: Peak sample level of caller audio counted as speech.
+    """
+
+    def __init__(
+        self,
+        mode: FakeLiveMode = "echo",
+        responses: list[bytes] | None = None,
+        think_ms: int = 300,
+        chunk_ms: int = 40,
+        speed: float = 1.0,
+        turn_silence_ms: int = 500,
+        speech_peak: int = 1000,
+        replay: list[tuple[float, Event]] | None = None,
+    ):
+        self.mode = mode
+        self.responses = responses or [tone()]
+        self.replay = replay or []
+        self.think_ms = think_ms
+        self.chunk_ms = chunk_ms
+        self.speed = speed
+        self.turn_silence_ms = turn_silence_ms
+        self.speech_peak = speech_peak
+        self.sessions = 0
+
+    async def start_session(
+        self,
+        agent: BaseAgent,
+        user_id: str,
+        session_id: str,
+        activity_detection: Literal["server", "local"] = "server",
+        resume: bool = False,
+    ) -> tuple[LiveEvents, LiveRequestQueue]:
+        """Same arguments and result as `start_agent_session`"""
+        self.sessions += 1
+        live_request_queue = LiveRequestQueue()
+        session = FakeLiveSession(self, agent.name, activity_detection == "server")
+        return session.live_events(live_request_queue), live_request_queue
+
+    async def end_session(self, agent: BaseAgent, user_id: str, session_id: str):
+        """Same arguments as `end_agent_session`; there is nothing to release"""
+
+
+class FakeLiveSession:
+    """One connection of a `FakeLiveBackend`"""
+
+    def __init__(self, backend: FakeLiveBackend, author: str, detect_turns: bool):
+        self.backend = backend
+        self.author = author
+        self.detect_turns = detect_turns
+        self.turns = 0
+        self._events: asyncio.Queue[Event | None] = asyncio.Queue()
+        self._response: asyncio.Task | None = None
+        self._speaking = False
+        self._silence_ms = 0.0
+
+    async def live_events(self, live_request_queue: LiveRequestQueue) -> LiveEvents:
+        reader = asyncio.create_task(self._read(live_request_queue))
+        if self.backend.mode == "replay":
+            self._response = asyncio.create_task(self._replay())
+        try:
+            while (event := await self._events.get()) is not None:
+                yield event
+        finally:
+            reader.cancel()
+            if self._response is not None:
+                self._response.cancel()
+
+    async def _read(self, live_request_queue: LiveRequestQueue) -> None:
+        while True:
+            request = await live_request_queue.get()
+            if request.close:
+                self._events.put_nowait(None)
+                return
+            if self.backend.mode != "replay":
+                self._handle(request)
+
+    def _handle(self, request: LiveRequest) -> None:
+        if request.blob is not None and request.blob.data:
+            self._caller_audio(request.blob.data)
+        elif request.activity_start is not None:
+            self._caller_started()
+        elif request.activity_end is not None:
+            self._caller_finished()
+        elif request.content is not None:
+            parts = request.content.parts or []
+            text = "".join(part.text or "" for part in parts).strip()
+            if text in CUES:
+                self._emit(**{text: True})
+            elif self.backend.mode == "script":
+                self._respond()
+
+    def _caller_audio(self, pcm16: bytes) -> None:
+        if self.backend.mode == "echo":
+            self._emit_audio(upsample_16k_to_24k(pcm16))
+        if not self.detect_turns:
+            return
+        if _peak(pcm16) >= self.backend.speech_peak:
+            self._silence_ms = 0.0
+            if not self._speaking:
+                self._caller_started()
+        elif self._speaking:
+            self._silence_ms += len(pcm16) / INPUT_BYTES_PER_MS
+            if self._silence_ms >= self.backend.turn_silence_ms:
+                self._caller_finished()
+
+    def _caller_started(self) -> None:
+        self._speaking = True
+        if self._response is not None and not self._response.done():
+            self._response.cancel()
+            self._emit(interrupted=True)
+
+    def _caller_finished(self) -> None:
+        self._speaking = False
+        self._silence_ms = 0.0
+        if self.backend.mode == "script":
+            self._respond()
+        else:
+            self._emit(turn_complete=True)
+
+    def _respond(self) -> None:
+        if self._response is not None:
+            self._response.cancel()
+        responses = self.backend.responses
+        response = responses[self.turns % len(responses)]
+        self.turns += 1
+        self._response = asyncio.create_task(self._stream(response))
+
+    async def _stream(self, pcm24: bytes) -> None:
+        backend = self.backend
+        await asyncio.sleep(backend.think_ms / 1000)
+        chunk_bytes = backend.chunk_ms * OUTPUT_BYTES_PER_MS
+        for start in range(0, len(pcm24), chunk_bytes):
+            self._emit_audio(pcm24[start : start + chunk_bytes])
+            await asyncio.sleep(backend.chunk_ms / 1000 / backend.speed)
+        self._emit(turn_complete=True)
+
+    async def _replay(self) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for offset, event in self.backend.replay:
+            await asyncio.sleep(start + offset / self.backend.speed - loop.time())
+            # Stamped on arrival, like events from the model
+            self._events.put_nowait(event.model_copy(update={"timestamp": time.time()}))
+
+    def _emit_audio(self, pcm24: bytes) -> None:
+        blob = Blob(data=pcm24, mime_type=OUTPUT_MIME_TYPE)
+        self._emit(content=Content(role="model", parts=[Part(inline_data=blob)]))
+
+    def _emit(self, **fields) -> None:
+        self._events.put_nowait(Event(author=self.author, **fields))
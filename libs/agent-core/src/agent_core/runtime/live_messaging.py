@@ -24,18 +24,28 @@ finally:
 ```
 """
 
-from typing import AsyncGenerator, Awaitable, Callable, Literal
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, ClassVar, Literal
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.errors.already_exists_error import AlreadyExistsError
 from google.adk.events import Event
-from google.adk.runners import InMemoryRunner
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.sessions import BaseSessionService
 from google.adk.agents.live_request_queue import LiveRequestQueue
 
 from google.genai import types
 from google.genai.types import Part, Blob, Content
 from pydantic import BaseModel, Field
 
+from agent_core.runtime.resumption import ResumableLiveSession, ResumptionTracker
+from agent_core.runtime.transcripts import TranscriptRole
+
 
 def text_to_content(text: str, role: Literal["user", "model"] = "user") -> Content:
     """Helper to create a Content object from text"""
@@ -44,28 +54,35 @@ def text_to_content(text: str, role: Literal["user", "model"] = "user") -> Conte
 
 APP_NAME = "THE VOICE AGENT"
 
+INPUT_SAMPLE_RATE = 16000
+INPUT_BYTES_PER_MS = INPUT_SAMPLE_RATE * 2 // 1000  # 16-bit mono
+
 LiveEvents = AsyncGenerator[Event, None]
 
+# "server" lets the model detect speech, "local" means the caller of
+# start_agent_session sends activity start/end signals itself
+ActivityDetection = Literal["server", "local"]
 
-# TODO: Make this *dynamic*
-async def start_agent_session(
-    agent: BaseAgent, user_id: str, session_id: str
-) -> tuple[LiveEvents, LiveRequestQueue]:
-    """Starts an agent session"""
+# The live model's context is cut back to the target, oldest turns first,
+# whenever it reaches the trigger, so per-turn cost stays flat on long calls
+CONTEXT_TRIGGER_TOKENS = 32_000
+CONTEXT_TARGET_TOKENS = 16_000
 
-    # Create a Runner
-    runner = InMemoryRunner(
-        agent,
-        app_name=APP_NAME,
-    )
 
-    # Create a Session
-    session = await runner.session_service.create_session(
-        app_name=APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+def build_run_config(
+    activity_detection: ActivityDetection = "server",
+    trigger_tokens: int = CONTEXT_TRIGGER_TOKENS,
+    target_tokens: int = CONTEXT_TARGET_TOKENS,
+) -> RunConfig:
+    """
+    Builds the RunConfig for one activity detection profile.
+
+    With "local" the model's automatic activity detection is disabled, and
+    turns must be marked with `send_activity_start` and `send_activity_end`.
 
+    The model's context window slides to `target_tokens` once it reaches
+    `trigger_tokens`. A trigger of 0 disables compression.
+    """
     speech_config = types.SpeechConfig(
         voice_config=types.VoiceConfig(
             # https://ai.google.dev/gemini-api/docs/speech-generation#voices
@@ -76,7 +93,7 @@ async def start_agent_session(
     )
 
     automatic_activity_detection = types.AutomaticActivityDetection(
-        disabled=False,
+        disabled=activity_detection == "local",
         start_of_speech_sensitivity=types.StartSensitivity.START_SENSITIVITY_HIGH,
         end_of_speech_sensitivity=types.EndSensitivity.END_SENSITIVITY_HIGH,
         prefix_padding_ms=150,
@@ -86,7 +103,14 @@ async def start_agent_session(
         automatic_activity_detection=automatic_activity_detection
     )
 
-    run_config = RunConfig(
+    context_window_compression = None
+    if trigger_tokens:
+        context_window_compression = types.ContextWindowCompressionConfig(
+            trigger_tokens=trigger_tokens,
+            sliding_window=types.SlidingWindow(target_tokens=target_tokens),
+        )
+
+    return RunConfig(
         speech_config=speech_config,
         # response_modalities=["AUDIO"], # Setting this gives Pydantic warning
         streaming_mode=StreamingMode.BIDI,
@@ -94,8 +118,168 @@ async def start_agent_session(
         input_audio_transcription=types.AudioTranscriptionConfig(),
         output_audio_transcription=types.AudioTranscriptionConfig(),
         realtime_input_config=realtime_input_config,
+        context_window_compression=context_window_compression,
     )
 
+
+class RunnerRegistry:
+    """
+    Runners and run configs shared by all calls in the process.
+
+    Building an `InMemoryRunner` and the nested RunConfig objects on every
+    call adds to call setup, which the caller hears as dead air. The registry
+    builds one runner per agent and one RunConfig per activity detection
+    profile, the first time each is needed or up front with `prepare`, and
+    only the session is created per call.
+
+    ADK fills in unset RunConfig fields while a live run starts, and writes
+    resumption handles into its nested configs, so each call gets a deep copy
+    of the profile's config, which itself stays untouched.
+
+    Args:
+        session_service: Session service shared by all runners, e.g. a
+            `BoundedSessionService`. None gives each runner ADK's in-memory one.
+    """
+
+    def __init__(self, session_service: BaseSessionService | None = None):
+        self.session_service = session_service
+        # Latest live session resumption handle per call, from all runners
+        self.resumption = ResumptionTracker()
+        self.context_tokens = (CONTEXT_TRIGGER_TOKENS, CONTEXT_TARGET_TOKENS)
+        self._runners: dict[int, Runner] = {}
+        self._run_configs: dict[ActivityDetection, RunConfig] = {}
+        # Time it took to build each runner and config, keyed like the caches
+        self._build_seconds: dict[int | str, float] = {}
+        # Time spent building, and time not spent thanks to reuse
+        self.setup_seconds = 0.0
+        self.seconds_saved = 0.0
+
+    def set_session_service(self, session_service: BaseSessionService) -> None:
+        """Use `session_service` for runners built from now on"""
+        self.session_service = session_service
+        self._runners.clear()
+
+    def set_context_window(self, trigger_tokens: int, target_tokens: int) -> None:
+        """Use this context window compression for configs built from now on"""
+        self.context_tokens = (trigger_tokens, target_tokens)
+        self._run_configs.clear()
+
+    def runner(self, agent: BaseAgent) -> Runner:
+        # The runner references the agent, so its id stays unique while cached
+        key = id(agent)
+        runner = self._runners.get(key)
+        if runner is not None:
+            self.seconds_saved += self._build_seconds[key]
+            return runner
+
+        start = time.perf_counter()
+        if self.session_service is None:
+            runner = InMemoryRunner(agent, app_name=APP_NAME)
+        else:
+            runner = Runner(
+                app_name=APP_NAME,
+                agent=agent,
+                session_service=self.session_service,
+                artifact_service=InMemoryArtifactService(),
+                memory_service=InMemoryMemoryService(),
+            )
+        # Registered directly, the runners' `plugins` argument is deprecated
+        runner.plugin_manager.register_plugin(self.resumption)
+        self._record(key, start)
+        self._runners[key] = runner
+        return runner
+
+    def run_config(self, activity_detection: ActivityDetection = "server") -> RunConfig:
+        """A per-call copy of the profile's RunConfig"""
+        run_config = self._run_configs.get(activity_detection)
+        if run_config is not None:
+            self.seconds_saved += self._build_seconds[activity_detection]
+        else:
+            start = time.perf_counter()
+            run_config = build_run_config(activity_detection, *self.context_tokens)
+            self._record(activity_detection, start)
+            self._run_configs[activity_detection] = run_config
+        # Deep, since ADK writes resumption handles into the nested configs
+        return run_config.model_copy(deep=True)
+
+    def prepare(
+        self,
+        agents: list[BaseAgent],
+        profiles: tuple[ActivityDetection, ...] = ("server", "local"),
+    ) -> float:
+        """Build runners and configs ahead of the first call, returning seconds"""
+        before = self.setup_seconds
+        for agent in agents:
+            if id(agent) not in self._runners:
+                self.runner(agent)
+        for profile in profiles:
+            if profile not in self._run_configs:
+                self.run_config(profile)
+        return self.setup_seconds - before
+
+    async def end_session(self, agent: BaseAgent, user_id: str, session_id: str):
+        """Delete a call's session from the shared runner's session service"""
+        self.resumption.forget(session_id)
+        runner = self._runners.get(id(agent))
+        if runner is None:
+            return
+        await runner.session_service.delete_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session_id
+        )
+
+    def _record(self, key: int | str, start: float) -> None:
+        seconds = time.perf_counter() - start
+        self._build_seconds[key] = seconds
+        self.setup_seconds += seconds
+
+
+runner_registry = RunnerRegistry()
+
+
+# TODO: Make this *dynamic*
+async def start_agent_session(
+    agent: BaseAgent,
+    user_id: str,
+    session_id: str,
+    activity_detection: ActivityDetection = "server",
+    resume: bool = False,
+) -> tuple[LiveEvents, LiveRequestQueue]:
+    """
+    Starts an agent session
+
+    The runner and RunConfig come from `runner_registry`; only the session is
+    created per call. Call `end_agent_session` once the call is over.
+
+    With `activity_detection="local"` the model's automatic activity detection
+    is disabled, and turns must be marked with `send_activity_start` and
+    `send_activity_end` on the returned LiveRequestQueue.
+
+    With `resume=True` the new live connection continues the session's last
+    one, using the latest resumption handle; see `ResumableLiveSession`.
+    """
+
+    runner = runner_registry.runner(agent)
+
+    # Create a Session
+    try:
+        session = await runner.session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id,
+        )
+    except AlreadyExistsError:  # e.g. the media stream reconnected
+        session = await runner.session_service.get_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id,
+        )
+
+    run_config = runner_registry.run_config(activity_detection)
+    handle = runner_registry.resumption.handle(session_id) if resume else None
+    if handle:
+        # Replaced rather than mutated, the profile's config is shared
+        run_config.session_resumption = types.SessionResumptionConfig(handle=handle)
+
     live_request_queue = LiveRequestQueue()
 
     live_events = runner.run_live(
@@ -108,6 +292,11 @@ async def start_agent_session(
     return live_events, live_request_queue
 
 
+async def end_agent_session(agent: BaseAgent, user_id: str, session_id: str):
+    """Releases the session of a call started with `start_agent_session`"""
+    await runner_registry.end_session(agent, user_id, session_id)
+
+
 class AgentInterruptedEvent(BaseModel):
     type: Literal["interrupted"] = "interrupted"
     timestamp: float = Field(description="Unix timestamp of interruption")
@@ -127,9 +316,24 @@ AgentEvent = AgentInterruptedEvent | AgentTurnCompleteEvent | AgentDataEvent
 
 OnAgentEvent = Callable[[AgentEvent], Awaitable[None]]
 
+# Sync callback for transcription fragments: role, text, finished. Called
+# inline with the audio, so it must not block; see TranscriptSink.
+OnTranscript = Callable[[TranscriptRole, str, bool], None]
+
+
+def _send_transcripts(event: Event, on_transcript: OnTranscript) -> None:
+    if event.input_transcription and event.input_transcription.text:
+        transcription = event.input_transcription
+        on_transcript("caller", transcription.text, bool(transcription.finished))
+    if event.output_transcription and event.output_transcription.text:
+        transcription = event.output_transcription
+        on_transcript("agent", transcription.text, bool(transcription.finished))
+
 
 async def agent_to_client_messaging(
-    on_agent_event: OnAgentEvent, live_events: LiveEvents
+    on_agent_event: OnAgentEvent,
+    live_events: LiveEvents,
+    on_transcript: OnTranscript | None = None,
 ) -> None:
     """
     Agent to client communication.
@@ -139,10 +343,14 @@ async def agent_to_client_messaging(
     Args:
         on_agent_event: Async callback invoked per AgentEvent.
         live_events: Async generator of ADK Event objects to send to client.
+        on_transcript: Optional callback for input and output transcriptions.
     """
     async for event in live_events:
         message: AgentEvent
 
+        if on_transcript is not None:
+            _send_transcripts(event, on_transcript)
+
         if event.turn_complete:
             message = AgentTurnCompleteEvent(timestamp=event.timestamp)
             await on_agent_event(message)
@@ -183,7 +391,76 @@ async def agent_to_client_messaging(
                 continue
 
 
-def send_pcm_to_agent(pcm_audio: bytes, live_request_queue: LiveRequestQueue):
+# Lightweight events for the audio hot path. Same attributes as the pydantic
+# models above, without validation or per-instance dicts.
+
+
+@dataclass(slots=True)
+class FastInterruptedEvent:
+    timestamp: float
+    type: ClassVar[Literal["interrupted"]] = "interrupted"
+
+
+@dataclass(slots=True)
+class FastTurnCompleteEvent:
+    timestamp: float
+    type: ClassVar[Literal["complete"]] = "complete"
+
+
+@dataclass(slots=True)
+class FastDataEvent:
+    payload: bytes  # Output PCM bytes (16-bit, 24kHz), not copied
+    type: ClassVar[Literal["data"]] = "data"
+
+
+FastAgentEvent = FastInterruptedEvent | FastTurnCompleteEvent | FastDataEvent
+
+OnFastAgentEvent = Callable[[FastAgentEvent], Awaitable[None]]
+
+
+async def agent_to_client_fast(
+    on_agent_event: OnFastAgentEvent,
+    live_events: LiveEvents,
+    on_transcript: OnTranscript | None = None,
+) -> None:
+    """
+    Like `agent_to_client_messaging`, but sends slotted dataclass events.
+
+    The model's audio arrives in chunks of ~40 ms per call, so this runs for
+    every chunk of every call. The audio bytes are passed on as received.
+    """
+    async for event in live_events:
+        if on_transcript is not None:
+            _send_transcripts(event, on_transcript)
+
+        if event.turn_complete:
+            await on_agent_event(FastTurnCompleteEvent(event.timestamp))
+            continue
+
+        if event.interrupted:
+            await on_agent_event(FastInterruptedEvent(event.timestamp))
+            continue
+
+        content = event.content
+        if not content or not content.parts:
+            continue
+
+        for part in content.parts:
+            blob = part.inline_data
+            if (
+                blob is not None
+                and blob.data
+                and blob.mime_type
+                and blob.mime_type.startswith("audio/pcm")
+            ):
+                await on_agent_event(FastDataEvent(blob.data))
+
+
+# Where caller audio goes; a ResumableLiveSession sends to its current queue
+AudioQueue = LiveRequestQueue | ResumableLiveSession
+
+
+def send_pcm_to_agent(pcm_audio: bytes, live_request_queue: AudioQueue):
     """
     Sends audio data to the agent.
 
@@ -196,3 +473,55 @@ def send_pcm_to_agent(pcm_audio: bytes, live_request_queue: LiveRequestQueue):
     live_request_queue.send_realtime(
         Blob(data=pcm_audio, mime_type="audio/pcm;rate=16000")
     )
+
+
+class RealtimeAudioBatcher:
+    """
+    Coalesces small PCM frames into larger `send_realtime` chunks.
+
+    Every `send_realtime` call becomes its own message toward the model, so
+    forwarding each 20 ms telephony frame costs 50 messages per second per
+    caller. The batcher sends once `batch_ms` of audio has accumulated, or
+    when `batch_ms` has passed since the oldest pending frame, whichever comes
+    first. Larger batches mean fewer messages but add up to `batch_ms` of
+    latency before the model hears the caller.
+
+    Args:
+        live_request_queue: The live request queue to send audio to
+        batch_ms: Target chunk size in milliseconds. 0 disables batching.
+    """
+
+    def __init__(self, live_request_queue: AudioQueue, batch_ms: int = 40):
+        self.live_request_queue = live_request_queue
+        self.batch_ms = batch_ms
+        self.batch_bytes = batch_ms * INPUT_BYTES_PER_MS
+        self.frames_received = 0
+        self.messages_sent = 0
+        self._pending = bytearray()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def send(self, pcm_audio: bytes) -> None:
+        """
+        Queue audio for the agent.
+
+        Args:
+            pcm_audio: bytes - Input PCM bytes (16-bit, 16kHz)
+        """
+        self.frames_received += 1
+        self._pending += pcm_audio
+        if len(self._pending) >= self.batch_bytes:
+            self.flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.batch_ms / 1000, self.flush)
+
+    def flush(self) -> None:
+        """Send any pending audio now"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        send_pcm_to_agent(bytes(self._pending), self.live_request_queue)
+        self.messages_sent += 1
+        self._pending.clear()
@@ -0,0 +1,187 @@
+"""
+Live session resumption across upstream disconnects.
+
+The model's live connection can drop mid-call, and is closed by the server
+once it reaches its duration limit. With `session_resumption` enabled the
+model sends resumption handles as the call goes on; reconnecting with the
+latest handle continues the same conversation.
+
+ADK keeps the latest handle on the invocation context and does not surface
+it in events, so `ResumptionTracker` reads it there as each event passes the
+runner. `ResumableLiveSession` reconnects when the live events end or fail,
+buffering inbound audio until the new connection is up.
+
+Usage:
+```python
+session = ResumableLiveSession(
+    live_events,
+    live_request_queue,
+    reconnect=lambda: start_agent_session(..., resume=True),
+)
+# Send to `session` in place of the LiveRequestQueue
+await agent_to_client_fast(handle_agent_event, session.live_events())
+```
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.live_request_queue import LiveRequest, LiveRequestQueue
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai.types import ActivityEnd, ActivityStart, Blob, Content
+
+logger = logging.getLogger(__name__)
+
+LiveEvents = AsyncGenerator[Event, None]
+
+Reconnect = Callable[[], Awaitable[tuple[LiveEvents, LiveRequestQueue]]]
+
+
+class ResumptionTracker(BasePlugin):
+    """Runner plugin keeping the latest resumption handle per session ID"""
+
+    def __init__(self, name: str = "resumption_tracker"):
+        super().__init__(name)
+        self.handles: dict[str, str] = {}
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        handle = invocation_context.live_session_resumption_handle
+        if handle:
+            self.handles[invocation_context.session.id] = handle
+        return None
+
+    def handle(self, session_id: str) -> str | None:
+        return self.handles.get(session_id)
+
+    def forget(self, session_id: str) -> None:
+        self.handles.pop(session_id, None)
+
+
+class ResumableLiveSession:
+    """
+    A call's live session which reconnects when the upstream connection drops.
+
+    Has the sending side of a `LiveRequestQueue`, so it can be used in place
+    of one. While reconnecting, requests are held and sent once the new
+    connection is up; realtime audio beyond `buffer_bytes` drops the oldest.
+
+    Args:
+        live_events: Events of the current connection.
+        live_request_queue: Queue of the current connection.
+        reconnect: Starts a new connection, resuming the session.
+        max_reconnects: Reconnects in a row without an event in between
+            before giving up and ending the events.
+        reconnect_delay: Seconds before each reconnect, times the attempt.
+        buffer_bytes: Realtime audio held while reconnecting. 5 s of 16 kHz
+            PCM by default.
+    """
+
+    def __init__(
+        self,
+        live_events: LiveEvents,
+        live_request_queue: LiveRequestQueue,
+        reconnect: Reconnect,
+        max_reconnects: int = 3,
+        reconnect_delay: float = 0.5,
+        buffer_bytes: int = 160_000,
+    ):
+        self.live_request_queue = live_request_queue
+        self.reconnect = reconnect
+        self.max_reconnects = max_reconnects
+        self.reconnect_delay = reconnect_delay
+        self.buffer_bytes = buffer_bytes
+        self.reconnects = 0
+        self.bytes_dropped = 0
+        self._live_events = live_events
+        self._closed = False
+        self._gap: deque[LiveRequest] | None = None  # held while reconnecting
+        self._gap_bytes = 0
+
+    @property
+    def reconnecting(self) -> bool:
+        return self._gap is not None
+
+    async def live_events(self) -> LiveEvents:
+        """Events of the call, across reconnects, until `close`"""
+        attempts = 0
+        while True:
+            try:
+                async for event in self._live_events:
+                    attempts = 0
+                    yield event
+                if not self._closed:
+                    logger.warning("Live connection ended, resuming")
+            except Exception as ex:
+                if not self._closed:
+                    logger.warning(f"Live connection failed, resuming: {ex!r}")
+            if self._closed:
+                return
+
+            if self._gap is None:
+                self._gap = deque()
+            while True:
+                if attempts == self.max_reconnects:
+                    logger.error(f"Gave up resuming after {attempts} attempts")
+                    return
+                attempts += 1
+                await asyncio.sleep(self.reconnect_delay * (attempts - 1))
+                try:
+                    live_events, live_request_queue = await self.reconnect()
+                    break
+                except Exception as ex:
+                    logger.warning(f"Reconnect attempt {attempts} failed: {ex!r}")
+            self._live_events = live_events
+            self._resume(live_request_queue)
+
+    def _resume(self, live_request_queue: LiveRequestQueue) -> None:
+        self.reconnects += 1
+        self.live_request_queue.close()
+        self.live_request_queue = live_request_queue
+        gap, self._gap, self._gap_bytes = self._gap or (), None, 0
+        logger.info(f"Live session resumed, replaying {len(gap)} requests")
+        for request in gap:
+            live_request_queue.send(request)
+
+    def _hold(self, request: LiveRequest) -> None:
+        assert self._gap is not None
+        self._gap.append(request)
+        if request.blob is None:
+            return
+        self._gap_bytes += len(request.blob.data or b"")
+        while self._gap_bytes > self.buffer_bytes:
+            oldest = next(r for r in self._gap if r.blob is not None)
+            self._gap.remove(oldest)
+            size = len(oldest.blob.data or b"")
+            self._gap_bytes -= size
+            self.bytes_dropped += size
+
+    def send(self, request: LiveRequest) -> None:
+        if self._gap is None:
+            return self.live_request_queue.send(request)
+        self._hold(request)
+
+    def send_content(self, content: Content) -> None:
+        self.send(LiveRequest(content=content))
+
+    def send_realtime(self, blob: Blob) -> None:
+        if self._gap is None:  # skip building a LiveRequest per audio chunk
+            return self.live_request_queue.send_realtime(blob)
+        self._hold(LiveRequest(blob=blob))
+
+    def send_activity_start(self) -> None:
+        self.send(LiveRequest(activity_start=ActivityStart()))
+
+    def send_activity_end(self) -> None:
+        self.send(LiveRequest(activity_end=ActivityEnd()))
+
+    def close(self) -> None:
+        """End the call's session; no further reconnects"""
+        self._closed = True
+        self.live_request_queue.close()
+
@@ -0,0 +1,243 @@
+"""
+Bounded session storage for long-running voice agent processes.
+
+ADK's `InMemorySessionService` keeps every session, with all of its events
+and state, until it is deleted. `BoundedSessionService` caps how many
+sessions stay in memory and for how long, and can hand sessions to a
+`SessionArchive` when they are released or evicted, e.g. to keep completed
+calls in SQLite. With a `ContextCompactor`, each session's events are kept
+to a sliding window as well.
+
+Usage:
+```python
+session_service = BoundedSessionService(
+    max_sessions=500,
+    ttl_seconds=3600,
+    archive=SQLiteSessionArchive("calls.db"),
+    compactor=ContextCompactor(),
+)
+runner_registry.set_session_service(session_service)
+eviction_task = asyncio.create_task(session_service.run_eviction())
+```
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from agent_core.runtime.context import ContextCompactor
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[str, str, str]  # app name, user ID, session ID
+
+
+class SessionArchive(Protocol):
+    """Storage for sessions which are no longer kept in memory"""
+
+    def archive(self, session: Session) -> None: ...
+
+
+class SQLiteSessionArchive:
+    """
+    Archives sessions to a SQLite database, one row per session.
+
+    Args:
+        path: Database file, created if missing. ":memory:" works for tests.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Written from worker threads, one archive at a time
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                last_update_time REAL NOT NULL,
+                archived_at REAL NOT NULL,
+                session_json TEXT NOT NULL,
+                PRIMARY KEY (app_name, user_id, session_id)
+            )
+            """
+        )
+        self._db.commit()
+
+    def archive(self, session: Session) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    session.app_name,
+                    session.user_id,
+                    session.id,
+                    session.last_update_time,
+                    time.time(),
+                    session.model_dump_json(),
+                ),
+            )
+            self._db.commit()
+
+    def load(self, app_name: str, user_id: str, session_id: str) -> Session | None:
+        """Read an archived session back"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT session_json FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+        return Session.model_validate_json(row[0]) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    In-memory sessions with LRU and TTL eviction.
+
+    Sessions are evicted, least recently used first, once more than
+    `max_sessions` are held, and after `ttl_seconds` without being touched.
+    Eviction runs on each new session, and periodically with `run_eviction`.
+    Deleted and evicted sessions go to `archive`, if one is given.
+
+    Args:
+        max_sessions: Sessions kept in memory. Keep above the concurrent
+            call capacity, since evicting a live call's session loses the
+            rest of its events.
+        ttl_seconds: Idle time after which a session is evicted.
+        archive: Where released sessions go. None drops them.
+        compactor: Keeps each session's events to a window. None keeps all.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 3600.0,
+        archive: SessionArchive | None = None,
+        compactor: ContextCompactor | None = None,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.archive = archive
+        self.compactor = compactor
+        self.evicted = 0
+        # Session key -> time.monotonic() of last use, least recent first
+        self._last_used: OrderedDict[SessionKey, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._last_used)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id))
+        await self.evict()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        key = (session.app_name, session.user_id, session.id)
+        if key not in self._last_used:
+            return event
+        self._touch(key)
+        if self.compactor is not None and not event.partial:
+            stored = self.sessions[session.app_name][session.user_id][session.id]
+            self.compactor.appended(stored, event)
+            # The runner's copy has the same events appended, cut it to match
+            excess = len(session.events) - len(stored.events)
+            if session is not stored and excess > 0:
+                del session.events[:excess]
+        return event
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        """Release a session, archiving it first if there is an archive"""
+        await self._release((app_name, user_id, session_id))
+
+    async def evict(self) -> int:
+        """Evict expired sessions and any over the limit, returning the count"""
+        expired_before = time.monotonic() - self.ttl_seconds
+        evict = []
+        for key, last_used in self._last_used.items():
+            over_limit = len(self._last_used) - len(evict) > self.max_sessions
+            if not over_limit and last_used > expired_before:
+                break
+            evict.append(key)
+
+        for key in evict:
+            await self._release(key)
+        self.evicted += len(evict)
+        return len(evict)
+
+    async def run_eviction(self, interval: float = 60.0) -> None:
+        """
+        Evict every `interval` seconds until cancelled, so idle sessions expire
+        even when no new session is created. Run it as a background task.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict()
+            except Exception:
+                logger.exception("Error while evicting sessions")
+
+    def _touch(self, key: SessionKey) -> None:
+        self._last_used[key] = time.monotonic()
+        self._last_used.move_to_end(key)
+
+    async def _release(self, key: SessionKey) -> None:
+        app_name, user_id, session_id = key
+        self._last_used.pop(key, None)
+        user_sessions = self.sessions.get(app_name, {}).get(user_id, {})
+        session = user_sessions.pop(session_id, None)
+        if not user_sessions:  # one entry per caller would pile up otherwise
+            self.sessions.get(app_name, {}).pop(user_id, None)
+        if session is not None and self.compactor is not None:
+            usage = self.compactor.forget(session)
+            if usage is not None:
+                logger.info(
+                    f"Session {session_id} context: {usage.tokens} tokens "
+                    f"(peak {usage.peak_tokens}) in {usage.events} events, "
+                    f"{usage.events_dropped} of {usage.events_added} events dropped, "
+                    f"state deltas compacted {usage.deltas_compacted}"
+                )
+        if session is not None and self.archive is not None:
+            await asyncio.to_thread(self.archive.archive, session)
@@ -0,0 +1,176 @@
+"""
+Batched transcript storage for live calls.
+
+The model's input and output transcriptions arrive as small fragments mixed
+in with the audio. `TranscriptSink.add` only appends to an in-memory batch;
+a background task writes batches to a `TranscriptWriter` from a worker
+thread, so storage never holds up the audio loop.
+
+Usage:
+```python
+sink = TranscriptSink(JsonlTranscriptWriter("transcripts.jsonl"))
+
+sink.add(call_sid, "caller", "I'd like a latte", finished=True)
+...
+await sink.close()  # on shutdown, writes what is left
+```
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Literal, Protocol
+
+logger = logging.getLogger(__name__)
+
+TranscriptRole = Literal["caller", "agent"]
+
+
+@dataclass(slots=True)
+class TranscriptFragment:
+    call_id: str
+    role: TranscriptRole
+    text: str
+    # Whether the model marked this transcription as complete
+    finished: bool
+    timestamp: float
+
+
+class TranscriptWriter(Protocol):
+    """Storage for transcript batches. Called from a worker thread."""
+
+    def write(self, fragments: list[TranscriptFragment]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlTranscriptWriter:
+    """Appends fragments to a JSON Lines file, one object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, fragments: list[TranscriptFragment]) -> None:
+        self._file.write("".join(json.dumps(asdict(f)) + "\n" for f in fragments))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SQLiteTranscriptWriter:
+    """Inserts fragments into a `transcripts` table, one transaction per batch"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                call_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                finished INTEGER NOT NULL,
+                timestamp REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS transcripts_call ON transcripts (call_id)"
+        )
+        self._db.commit()
+
+    def write(self, fragments: list[TranscriptFragment]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (f.call_id, f.role, f.text, f.finished, f.timestamp)
+                    for f in fragments
+                ],
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class TranscriptSink:
+    """
+    Collects transcript fragments from all calls and writes them in batches.
+
+    Args:
+        writer: Where batches go.
+        flush_interval: Seconds between writes while fragments are pending.
+        max_pending: Fragments held while the writer is behind. Beyond this
+            new fragments are dropped, and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        writer: TranscriptWriter,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+    ):
+        self.writer = writer
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._pending: list[TranscriptFragment] = []
+        self._task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(
+        self, call_id: str, role: TranscriptRole, text: str, finished: bool = False
+    ) -> None:
+        """Queue a fragment. Never blocks; the write happens later."""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(
+            TranscriptFragment(call_id, role, text, finished, time.time())
+        )
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        async with self._write_lock:
+            await self._write_pending()
+
+    async def close(self) -> None:
+        """Stop the background task, write what is left and close the writer"""
+        # Holding the lock, the task is not in the middle of a write
+        async with self._write_lock:
+            if self._task is not None:
+                self._task.cancel()
+                await asyncio.gather(self._task, return_exceptions=True)
+                self._task = None
+            await self._write_pending()
+            self.writer.close()
+
+    async def _write_pending(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.writer.write, batch)
+        except Exception as ex:
+            logger.error(f"Failed to write {len(batch)} transcript fragments: {ex}")
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,61 @@
+"""Tests for the lazy agent registry in agent_core.agents."""
+
+import subprocess
+import sys
+
+import pytest
+
+from agent_core import agents
+
+# Cold start budget for `import agent_core.agents`, which callers pay before
+# any agent is used. Loading google-adk alone takes seconds.
+IMPORT_BUDGET_MS = 50
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, in a fresh process"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_stays_within_budget():
+    """Test that importing the package loads no agent and no SDK."""
+    times = _import_times(
+        "import sys, agent_core.agents; "
+        "assert 'google.adk' not in sys.modules, 'google.adk imported'; "
+        "assert 'agent_core.agents.voice_agent' not in sys.modules"
+    )
+
+    assert times["agent_core.agents"] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_agents_load_on_first_use():
+    """Test that an agent is imported on access and cached."""
+    voice_agent = agents.voice_agent
+
+    assert voice_agent.name == "voice_agent"
+    assert "voice_agent" in vars(agents)
+    assert agents.voice_agent is voice_agent
+    assert [a.name for a in agents.load_agents("faq_agent", "menu_agent")] == [
+        "faq_agent",
+        "menu_agent",
+    ]
+
+
+def test_unknown_agent_raises_attribute_error():
+    """Test that unknown names behave like missing attributes."""
+    with pytest.raises(AttributeError):
+        agents.missing_agent
+    with pytest.raises(ImportError):
+        from agent_core.agents import missing_agent  # noqa: F401
@@ -0,0 +1,138 @@
+"""Tests for context module."""
+
+import pytest
+from google.adk.events import Event, EventActions
+from google.genai.types import (
+    Blob,
+    Content,
+    FunctionCall,
+    FunctionResponse,
+    Part,
+    Transcription,
+)
+
+from agent_core.runtime.context import ContextCompactor, estimate_tokens
+from agent_core.runtime.live_messaging import APP_NAME, build_run_config
+from agent_core.runtime.session_store import BoundedSessionService
+
+
+def _said(text: str) -> Event:
+    return Event(author="user", input_transcription=Transcription(text=text))
+
+
+def _order_event(order: list[dict]) -> Event:
+    return Event(
+        author="menu_agent",
+        content=Content(role="model", parts=[Part(text="Added to your order")]),
+        actions=EventActions(state_delta={"order": order}),
+    )
+
+
+def _parts(part: Part) -> Event:
+    return Event(author="menu_agent", content=Content(parts=[part]))
+
+
+async def _session(service: BoundedSessionService):
+    return await service.create_session(
+        app_name=APP_NAME, user_id="+1555", session_id="CA1"
+    )
+
+
+def test_estimate_tokens():
+    """Test that text counts ~4 characters and audio 32 per second a token."""
+    audio = Blob(data=b"\x00" * 32000, mime_type="audio/pcm;rate=16000")
+
+    assert estimate_tokens(_said("x" * 40)) == 10
+    assert estimate_tokens(_parts(Part(inline_data=audio))) == 32
+    assert estimate_tokens(Event(author="a", turn_complete=True)) == 0
+
+
+@pytest.mark.parametrize(
+    "mime_type",
+    ["audio/pcm;rate=16000;channels=1", "audio/pcm; rate=16000", "audio/pcm"],
+)
+def test_estimate_tokens_reads_only_the_rate(mime_type):
+    """Test that parameters after the rate, or no rate, don't break the estimate."""
+    audio = Blob(data=b"\x00" * 32000, mime_type=mime_type)
+
+    assert estimate_tokens(_parts(Part(inline_data=audio))) == 32
+
+
+@pytest.mark.asyncio
+class TestContextCompactor:
+    """Tests for ContextCompactor with BoundedSessionService."""
+
+    async def test_only_latest_order_delta_is_kept(self):
+        """Test that repeated order deltas are compacted away."""
+        compactor = ContextCompactor()
+        service = BoundedSessionService(compactor=compactor)
+        session = await _session(service)
+
+        order = []
+        for item in ("latte", "muffin", "bagel"):
+            order = order + [{"item": item, "quantity": 1}]
+            await service.append_event(session, _order_event(order))
+
+        deltas = [event.actions.state_delta for event in session.events]
+        assert deltas == [{}, {}, {"order": order}]
+        assert session.state["order"] == order
+        assert compactor.usage["CA1"].deltas_compacted == {"order": 2}
+
+    async def test_keeps_a_sliding_window_of_events(self):
+        """Test that history stays bounded in events and tokens."""
+        compactor = ContextCompactor(max_events=5, max_tokens=12)
+        service = BoundedSessionService(compactor=compactor)
+        session = await _session(service)
+
+        for i in range(20):
+            await service.append_event(session, _said(f"word {i:02d}"))  # 2 tokens
+
+        stored = await service.get_session(
+            app_name=APP_NAME, user_id="+1555", session_id="CA1"
+        )
+        texts = [event.input_transcription.text for event in session.events]
+        assert texts == [f"word {i:02d}" for i in range(15, 20)]
+        assert len(stored.events) == 5
+
+        await service.append_event(session, _said("x" * 40))  # 10 tokens
+        usage = compactor.usage["CA1"]
+        assert usage.tokens <= 12 and usage.events == 2
+        assert usage.peak_tokens <= 12
+        assert usage.events_added == 21 and usage.events_dropped == 19
+
+    async def test_window_does_not_start_with_a_function_response(self):
+        """Test that a function response is not kept without its call."""
+        compactor = ContextCompactor(max_events=2)
+        service = BoundedSessionService(compactor=compactor)
+        session = await _session(service)
+
+        call = FunctionCall(name="add_item_to_order", args={"item": "latte"})
+        await service.append_event(session, _parts(Part(function_call=call)))
+        response = FunctionResponse(name="add_item_to_order", response={})
+        await service.append_event(session, _parts(Part(function_response=response)))
+        await service.append_event(session, _said("thanks"))
+
+        assert [e.input_transcription for e in session.events][0].text == "thanks"
+        assert len(session.events) == 1
+
+    async def test_release_stops_tracking(self):
+        """Test that usage is dropped with the session."""
+        compactor = ContextCompactor()
+        service = BoundedSessionService(compactor=compactor)
+        session = await _session(service)
+        await service.append_event(session, _said("hello"))
+
+        await service.delete_session(
+            app_name=APP_NAME, user_id="+1555", session_id="CA1"
+        )
+
+        assert compactor.usage == {}
+
+
+def test_run_config_slides_the_context_window():
+    """Test that the live model's context is compressed past the trigger."""
+    compression = build_run_config("server", 20_000, 10_000).context_window_compression
+
+    assert compression.trigger_tokens == 20_000
+    assert compression.sliding_window.target_tokens == 10_000
+    assert build_run_config("server", 0).context_window_compression is None
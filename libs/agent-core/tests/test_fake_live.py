@@ -0,0 +1,160 @@
+"""Tests for fake_live module."""
+
+import array
+import asyncio
+import wave
+from unittest.mock import MagicMock
+
+import pytest
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+
+from agent_core.runtime.fake_live import (
+    FakeLiveBackend,
+    load_pcm,
+    upsample_16k_to_24k,
+)
+
+AGENT = MagicMock()
+AGENT.name = "voice_agent"
+
+SPEECH = array.array("h", [4000, -4000] * 320).tobytes()  # 40 ms at 16kHz
+SILENCE = bytes(640 * 2)
+
+
+def _audio(data: bytes) -> Blob:
+    return Blob(data=data, mime_type="audio/pcm;rate=16000")
+
+
+def _kind(event) -> str:
+    if event.interrupted:
+        return "interrupted"
+    if event.turn_complete:
+        return "turn_complete"
+    return "audio"
+
+
+async def _collect(events, until: str) -> list:
+    collected = []
+    async for event in events:
+        collected.append(event)
+        if _kind(event) == until:
+            return collected
+    return collected
+
+
+def test_upsample_16k_to_24k():
+    """Test that the echo keeps the duration of the caller audio."""
+    pcm16 = array.array("h", [1, 2, 3, 4]).tobytes()
+    assert array.array("h", upsample_16k_to_24k(pcm16)).tolist() == [1, 2, 2, 3, 4, 4]
+
+
+def test_load_pcm_checks_format(tmp_path):
+    """Test that scripted responses must be 24kHz mono 16-bit WAV files."""
+    path = tmp_path / "response.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setparams((1, 2, 16000, 0, "NONE", "not compressed"))
+        wav.writeframes(SILENCE)
+
+    with pytest.raises(ValueError):
+        load_pcm(str(path))
+
+
+@pytest.mark.asyncio
+class TestFakeLiveBackend:
+    """Tests for FakeLiveBackend."""
+
+    async def test_echo(self):
+        """Test that caller audio comes back at 24kHz, ending each turn."""
+        backend = FakeLiveBackend("echo", turn_silence_ms=80)
+        events, queue = await backend.start_session(AGENT, "user", "call")
+
+        queue.send_realtime(_audio(SPEECH))
+        for _ in range(2):
+            queue.send_realtime(_audio(SILENCE))
+        collected = await _collect(events, "turn_complete")
+
+        assert [_kind(event) for event in collected] == ["audio"] * 3 + [
+            "turn_complete"
+        ]
+        blob = collected[0].content.parts[0].inline_data
+        assert blob.mime_type == "audio/pcm;rate=24000"
+        assert len(blob.data) == len(SPEECH) * 3 // 2
+        assert collected[0].author == "voice_agent"
+
+        queue.close()
+        assert [event async for event in events] == []
+
+    async def test_scripted_response_after_think_time(self):
+        """Test that a turn is answered with the script, then turn_complete."""
+        response = bytes(48 * 100)  # 100 ms at 24kHz
+        backend = FakeLiveBackend(
+            "script", [response], think_ms=50, chunk_ms=40, speed=10
+        )
+        events, queue = await backend.start_session(
+            AGENT, "user", "call", activity_detection="local"
+        )
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        queue.send_activity_start()
+        queue.send_activity_end()
+        collected = await _collect(events, "turn_complete")
+
+        assert loop.time() - start >= 0.05
+        audio = [event.content.parts[0].inline_data.data for event in collected[:-1]]
+        assert [len(chunk) for chunk in audio] == [1920, 1920, 960]
+        assert b"".join(audio) == response
+        assert collected[-1].turn_complete
+        queue.close()
+
+    async def test_barge_in_interrupts_response(self):
+        """Test that caller speech during a response emits interrupted."""
+        backend = FakeLiveBackend("script", [bytes(48 * 1000)], think_ms=0)
+        events, queue = await backend.start_session(AGENT, "user", "call")
+
+        queue.send_content(Content(role="user", parts=[Part(text="Hello")]))
+        assert _kind(await anext(events)) == "audio"
+        queue.send_realtime(_audio(SPEECH))
+
+        collected = await _collect(events, "interrupted")
+        assert collected[-1].interrupted
+        assert not any(event.turn_complete for event in collected)
+        queue.close()
+
+    async def test_cues(self):
+        """Test that text cues emit the matching event."""
+        backend = FakeLiveBackend("echo")
+        events, queue = await backend.start_session(AGENT, "user", "call")
+
+        for cue in ("interrupted", "turn_complete"):
+            queue.send_content(Content(role="user", parts=[Part(text=cue)]))
+        queue.close()
+
+        assert [_kind(event) async for event in events] == [
+            "interrupted",
+            "turn_complete",
+        ]
+
+    async def test_replay(self):
+        """Test that recorded events are replayed at their offsets."""
+        recorded = [
+            (0.1, Event(author="voice_agent", interrupted=True, timestamp=1.0)),
+            (0.2, Event(author="voice_agent", turn_complete=True, timestamp=1.0)),
+        ]
+        backend = FakeLiveBackend("replay", replay=recorded, speed=2)
+        events, queue = await backend.start_session(AGENT, "user", "call")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        queue.send_realtime(_audio(SPEECH))  # ignored
+        collected = await _collect(events, "turn_complete")
+
+        assert [_kind(event) for event in collected] == [
+            "interrupted",
+            "turn_complete",
+        ]
+        assert 0.09 <= loop.time() - start < 0.2
+        # Stamped when sent, like live events, not when recorded
+        assert all(event.timestamp > 1.0 for event in collected)
+        queue.close()
@@ -1,16 +1,25 @@
 """Tests for live_messaging module."""
 
+import asyncio
 from collections.abc import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from google.genai.types import Content, Blob
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.genai.types import Content, Blob, Part
 
 from agent_core.runtime.live_messaging import (
     text_to_content,
     start_agent_session,
     agent_to_client_messaging,
     send_pcm_to_agent,
+    RealtimeAudioBatcher,
+    RunnerRegistry,
+    runner_registry,
+    agent_to_client_fast,
+    FastAgentEvent,
+    FastDataEvent,
     AgentInterruptedEvent,
     AgentTurnCompleteEvent,
     AgentDataEvent,
@@ -159,6 +168,159 @@ class TestStartAgentSession:
         assert run_config.speech_config.language_code == "en-US"
         assert run_config.streaming_mode.value == "bidi"
         assert run_config.realtime_input_config is not None
+        detection = run_config.realtime_input_config.automatic_activity_detection
+        assert detection.disabled is False
+
+    @patch("agent_core.runtime.live_messaging.InMemoryRunner")
+    @patch("agent_core.runtime.live_messaging.LiveRequestQueue")
+    async def test_start_agent_session_local_activity_detection(
+        self, mock_queue_class, mock_runner_class
+    ):
+        """Test that local activity detection disables the model's VAD."""
+        mock_runner = MagicMock()
+        mock_runner_class.return_value = mock_runner
+        mock_runner.session_service.create_session = AsyncMock()
+
+        await start_agent_session(
+            agent=MagicMock(),
+            user_id="user123",
+            session_id="session456",
+            activity_detection="local",
+        )
+
+        run_config = mock_runner.run_live.call_args[1]["run_config"]
+        detection = run_config.realtime_input_config.automatic_activity_detection
+        assert detection.disabled is True
+
+
+class TestRunnerRegistry:
+    """Tests for RunnerRegistry."""
+
+    @patch("agent_core.runtime.live_messaging.InMemoryRunner")
+    def test_runner_is_built_once_per_agent(self, mock_runner_class):
+        """Test that calls for the same agent share one runner."""
+        registry = RunnerRegistry()
+        agent, other_agent = MagicMock(), MagicMock()
+
+        first = registry.runner(agent)
+        second = registry.runner(agent)
+        registry.runner(other_agent)
+
+        assert first is second
+        assert mock_runner_class.call_count == 2
+        assert registry.seconds_saved > 0
+
+    def test_run_config_is_copied_per_call(self):
+        """Test that per-call changes do not leak into the shared config."""
+        registry = RunnerRegistry()
+
+        first = registry.run_config("server")
+        first.response_modalities = ["AUDIO"]  # as ADK does when a run starts
+        second = registry.run_config("server")
+
+        assert first is not second
+        assert second.response_modalities is None
+        detection = registry.run_config("local").realtime_input_config
+        assert detection.automatic_activity_detection.disabled is True
+
+    def test_run_config_resumption_is_not_shared(self):
+        """Test that one call's resumption handle does not reach the next call."""
+        registry = RunnerRegistry()
+
+        first = registry.run_config("server")
+        # As ADK's reconnect loop does after a GoAway or agent transfer
+        first.session_resumption.handle = "caller-1-handle"
+        first.session_resumption.transparent = True
+        second = registry.run_config("server")
+
+        assert second.session_resumption is not first.session_resumption
+        assert second.session_resumption.handle is None
+        assert second.session_resumption.transparent is None
+
+    @patch("agent_core.runtime.live_messaging.InMemoryRunner")
+    def test_prepare_builds_everything_once(self, mock_runner_class):
+        """Test building runners and configs ahead of the first call."""
+        registry = RunnerRegistry()
+        agent = MagicMock()
+
+        setup_seconds = registry.prepare([agent])
+        assert setup_seconds > 0
+        assert registry.prepare([agent]) == 0
+        registry.runner(agent)
+
+        mock_runner_class.assert_called_once()
+        assert registry.setup_seconds == setup_seconds
+
+    @pytest.mark.asyncio
+    @patch("agent_core.runtime.live_messaging.InMemoryRunner")
+    async def test_end_session_deletes_session(self, mock_runner_class):
+        """Test that ending a call frees its session on the shared runner."""
+        registry = RunnerRegistry()
+        agent = MagicMock()
+        mock_runner = mock_runner_class.return_value
+        mock_runner.session_service.delete_session = AsyncMock()
+
+        await registry.end_session(MagicMock(), "user123", "session456")
+        registry.runner(agent)
+        await registry.end_session(agent, "user123", "session456")
+
+        mock_runner.session_service.delete_session.assert_awaited_once_with(
+            app_name=APP_NAME, user_id="user123", session_id="session456"
+        )
+
+    @pytest.mark.asyncio
+    async def test_start_agent_session_reuses_existing_session(self):
+        """Test that a reconnect with the same session id gets the old session."""
+        mock_runner = MagicMock()
+        mock_runner.session_service.create_session = AsyncMock(
+            side_effect=AlreadyExistsError("exists")
+        )
+        mock_session = MagicMock()
+        mock_runner.session_service.get_session = AsyncMock(return_value=mock_session)
+
+        with patch.object(runner_registry, "runner", return_value=mock_runner):
+            await start_agent_session(MagicMock(), "user123", "session456")
+
+        assert mock_runner.run_live.call_args[1]["session"] is mock_session
+
+
+@pytest.mark.asyncio
+class TestAgentToClientFast:
+    """Tests for the agent_to_client_fast hot path."""
+
+    async def test_matches_pydantic_events(self):
+        """Test that both paths send the same events in the same order."""
+        audio = Blob(data=b"\x01\x02", mime_type="audio/pcm;rate=24000")
+        text = Part(text="hi")
+        live_events = [
+            Event(author="agent", content=Content(parts=[Part(inline_data=audio)])),
+            Event(author="agent", content=Content(parts=[text])),
+            Event(author="agent", interrupted=True, timestamp=1.0),
+            Event(author="agent", turn_complete=True, timestamp=2.0),
+            Event(author="agent"),
+        ]
+
+        async def event_generator():
+            for event in live_events:
+                yield event
+
+        slow, fast = [], []
+
+        async def on_slow(event: AgentEvent):
+            slow.append(event)
+
+        async def on_fast(event: FastAgentEvent):
+            fast.append(event)
+
+        await agent_to_client_messaging(on_slow, event_generator())
+        await agent_to_client_fast(on_fast, event_generator())
+
+        assert [e.type for e in fast] == [e.type for e in slow]
+        assert [e.type for e in fast] == ["data", "interrupted", "complete"]
+        assert isinstance(fast[0], FastDataEvent)
+        assert fast[0].payload == b"\x01\x02"
+        assert fast[2].timestamp == 2.0
+        assert not hasattr(fast[0], "__dict__")
 
 
 @pytest.mark.asyncio
@@ -417,3 +579,59 @@ class TestSendPcmToAgent:
         mock_queue.send_realtime.assert_called_once()
         call_arg = mock_queue.send_realtime.call_args[0][0]
         assert call_arg.data == empty_audio
+
+
+@pytest.mark.asyncio
+class TestRealtimeAudioBatcher:
+    """Tests for RealtimeAudioBatcher."""
+
+    async def test_coalesces_frames_up_to_batch_size(self):
+        """Test that 20 ms frames are sent as one 60 ms chunk."""
+        mock_queue = MagicMock()
+        batcher = RealtimeAudioBatcher(mock_queue, batch_ms=60)
+        frame = b"\x01\x00" * 320  # 20 ms @ 16kHz
+
+        batcher.send(frame)
+        batcher.send(frame)
+        mock_queue.send_realtime.assert_not_called()
+        batcher.send(frame)
+
+        mock_queue.send_realtime.assert_called_once()
+        blob = mock_queue.send_realtime.call_args[0][0]
+        assert blob.data == frame * 3
+        assert blob.mime_type == "audio/pcm;rate=16000"
+        assert batcher.frames_received == 3
+        assert batcher.messages_sent == 1
+
+    async def test_timer_flushes_partial_batch(self):
+        """Test that a partial batch is sent after batch_ms."""
+        mock_queue = MagicMock()
+        batcher = RealtimeAudioBatcher(mock_queue, batch_ms=20)
+
+        batcher.send(b"\x00\x00" * 100)
+        await asyncio.sleep(0.05)
+
+        mock_queue.send_realtime.assert_called_once()
+        assert mock_queue.send_realtime.call_args[0][0].data == b"\x00\x00" * 100
+
+    async def test_zero_batch_ms_sends_every_frame(self):
+        """Test that batching can be disabled."""
+        mock_queue = MagicMock()
+        batcher = RealtimeAudioBatcher(mock_queue, batch_ms=0)
+
+        batcher.send(b"a")
+        batcher.send(b"b")
+
+        assert mock_queue.send_realtime.call_count == 2
+
+    async def test_flush_sends_pending_audio_once(self):
+        """Test explicit flush, e.g. at the end of a call."""
+        mock_queue = MagicMock()
+        batcher = RealtimeAudioBatcher(mock_queue, batch_ms=100)
+
+        batcher.send(b"\x00\x00")
+        batcher.flush()
+        batcher.flush()
+        await asyncio.sleep(0.12)
+
+        mock_queue.send_realtime.assert_called_once()
@@ -0,0 +1,171 @@
+"""Tests for resumption module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.events import Event
+from google.genai.types import Blob
+from websockets.exceptions import ConnectionClosedError
+
+from agent_core.runtime import live_messaging
+from agent_core.runtime.live_messaging import RunnerRegistry, start_agent_session
+from agent_core.runtime.resumption import ResumableLiveSession, ResumptionTracker
+
+
+def _drain(queue: LiveRequestQueue) -> list:
+    requests = []
+    while not queue._queue.empty():
+        requests.append(queue._queue.get_nowait())
+    return requests
+
+
+def _audio(data: bytes) -> Blob:
+    return Blob(data=data, mime_type="audio/pcm;rate=16000")
+
+
+async def _stream(events: list[Event], disconnect: bool = False):
+    """Fake live events, optionally dropping the connection after them"""
+    for event in events:
+        yield event
+        await asyncio.sleep(0)
+    if disconnect:
+        raise ConnectionClosedError(None, None)
+    await asyncio.Event().wait()  # stay connected
+
+
+@pytest.mark.asyncio
+class TestResumableLiveSession:
+    """Tests for ResumableLiveSession."""
+
+    async def test_resumes_after_disconnect_and_replays_audio(self):
+        """Test that a dropped connection is resumed without ending the call."""
+        first = [Event(author="agent", turn_complete=True)]
+        second = [Event(author="agent", interrupted=True)]
+        old_queue, new_queue = LiveRequestQueue(), LiveRequestQueue()
+        connected = asyncio.Event()
+
+        async def reconnect():
+            await connected.wait()
+            return _stream(second), new_queue
+
+        session = ResumableLiveSession(
+            _stream(first, disconnect=True), old_queue, reconnect
+        )
+        events = session.live_events()
+
+        assert (await anext(events)).turn_complete
+        session.send_realtime(_audio(b"before"))
+        next_event = asyncio.create_task(anext(events))
+        await asyncio.sleep(0.01)
+
+        # The connection is down, the caller keeps talking
+        assert session.reconnecting
+        session.send_realtime(_audio(b"during"))
+        session.send_activity_end()
+        connected.set()
+
+        assert (await next_event).interrupted
+        assert session.reconnects == 1 and not session.reconnecting
+        session.send_realtime(_audio(b"after"))
+
+        old = _drain(old_queue)
+        assert [r.blob.data for r in old if r.blob] == [b"before"]
+        assert old[-1].close  # the dropped connection's queue is closed
+        new = _drain(new_queue)
+        assert new[0].blob.data == b"during"
+        assert new[1].activity_end is not None
+        assert new[2].blob.data == b"after"
+
+        session.close()
+        await events.aclose()
+
+    async def test_buffer_drops_oldest_audio(self):
+        """Test that audio held during the gap is bounded."""
+        session = ResumableLiveSession(
+            _stream([], disconnect=True),
+            LiveRequestQueue(),
+            AsyncMock(side_effect=RuntimeError("unavailable")),
+            max_reconnects=1,
+            reconnect_delay=0,
+            buffer_bytes=4,
+        )
+        assert [event async for event in session.live_events()] == []
+
+        session.send_activity_start()
+        for chunk in (b"aa", b"bb", b"cc"):
+            session.send_realtime(_audio(chunk))
+
+        assert [r.blob.data for r in session._gap if r.blob] == [b"bb", b"cc"]
+        assert session._gap[0].activity_start is not None
+        assert session.bytes_dropped == 2
+
+    async def test_gives_up_after_max_reconnects(self):
+        """Test that the events end once reconnecting keeps failing."""
+        reconnect = AsyncMock(side_effect=RuntimeError("unavailable"))
+        session = ResumableLiveSession(
+            _stream([], disconnect=True),
+            LiveRequestQueue(),
+            reconnect,
+            max_reconnects=2,
+            reconnect_delay=0,
+        )
+
+        assert [event async for event in session.live_events()] == []
+        assert reconnect.await_count == 2
+        assert session.reconnects == 0
+
+    async def test_close_ends_without_reconnecting(self):
+        """Test that the end of a call is not mistaken for a dropped connection."""
+        reconnect = AsyncMock()
+        queue = LiveRequestQueue()
+
+        async def live_events():
+            # Like ADK, the events end once the queue is closed
+            while not (await queue.get()).close:
+                pass
+            return
+            yield
+
+        session = ResumableLiveSession(live_events(), queue, reconnect)
+        events = asyncio.create_task(anext(session.live_events(), None))
+        await asyncio.sleep(0)
+        session.close()
+
+        assert await events is None
+        reconnect.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_tracker_records_latest_handle():
+    """Test that the tracker reads handles from the invocation context."""
+    tracker = ResumptionTracker()
+    context = MagicMock(live_session_resumption_handle="handle-1")
+    context.session.id = "CA1"
+
+    await tracker.on_event_callback(invocation_context=context, event=Event(author="a"))
+    assert tracker.handle("CA1") == "handle-1"
+
+    tracker.forget("CA1")
+    assert tracker.handle("CA1") is None
+
+
+@pytest.mark.asyncio
+async def test_start_agent_session_resumes_with_latest_handle(monkeypatch):
+    """Test that resume=True connects with the session's resumption handle."""
+    registry = RunnerRegistry()
+    runner = MagicMock()
+    runner.session_service.create_session = AsyncMock()
+    monkeypatch.setattr(registry, "runner", lambda _agent: runner)
+    monkeypatch.setattr(live_messaging, "runner_registry", registry)
+    registry.resumption.handles["CA1"] = "handle-1"
+
+    await start_agent_session(MagicMock(), "+1555", "CA1")
+    fresh = runner.run_live.call_args.kwargs["run_config"]
+    await start_agent_session(MagicMock(), "+1555", "CA1", resume=True)
+    resumed = runner.run_live.call_args.kwargs["run_config"]
+
+    assert fresh.session_resumption.handle is None
+    assert resumed.session_resumption.handle == "handle-1"
+    assert registry.run_config().session_resumption.handle is None
@@ -0,0 +1,115 @@
+"""Tests for session_store module."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+
+from agent_core.runtime.live_messaging import APP_NAME, RunnerRegistry
+from agent_core.runtime.session_store import (
+    BoundedSessionService,
+    SQLiteSessionArchive,
+)
+
+
+async def _create(service: BoundedSessionService, session_id: str, user="+1555"):
+    return await service.create_session(
+        app_name=APP_NAME, user_id=user, session_id=session_id
+    )
+
+
+async def _get(service: BoundedSessionService, session_id: str, user="+1555"):
+    return await service.get_session(
+        app_name=APP_NAME, user_id=user, session_id=session_id
+    )
+
+
+@pytest.mark.asyncio
+class TestBoundedSessionService:
+    """Tests for BoundedSessionService."""
+
+    async def test_evicts_least_recently_used_over_limit(self):
+        """Test that the oldest untouched session goes first."""
+        service = BoundedSessionService(max_sessions=2)
+
+        await _create(service, "CA1")
+        await _create(service, "CA2")
+        await _get(service, "CA1")  # CA2 is now the least recently used
+        await _create(service, "CA3")
+
+        assert len(service) == 2
+        assert service.evicted == 1
+        assert await _get(service, "CA2") is None
+        assert await _get(service, "CA1") is not None
+
+    async def test_evicts_idle_sessions_after_ttl(self):
+        """Test that idle sessions expire when the next one is created."""
+        service = BoundedSessionService(ttl_seconds=0)
+
+        await _create(service, "CA1")
+        await _create(service, "CA2")
+
+        assert await _get(service, "CA1") is None
+        assert service.evicted == 2  # both expired by the time they are checked
+
+    async def test_periodic_eviction_expires_idle_sessions(self):
+        """Test that idle sessions expire without another being created."""
+        service = BoundedSessionService(ttl_seconds=0.05)
+        await _create(service, "CA1")
+
+        task = asyncio.create_task(service.run_eviction(interval=0.02))
+        await asyncio.sleep(0.15)
+        task.cancel()
+
+        assert len(service) == 0
+        assert service.evicted == 1
+
+    async def test_delete_frees_memory_per_caller(self):
+        """Test that a released call leaves nothing behind for its caller."""
+        service = BoundedSessionService()
+
+        await _create(service, "CA1", user="+15551234567")
+        await service.delete_session(
+            app_name=APP_NAME, user_id="+15551234567", session_id="CA1"
+        )
+
+        assert len(service) == 0
+        assert service.sessions[APP_NAME] == {}
+
+    async def test_archives_released_sessions_to_sqlite(self):
+        """Test that completed calls can be read back from the archive."""
+        archive = SQLiteSessionArchive(":memory:")
+        service = BoundedSessionService(max_sessions=1, archive=archive)
+
+        session = await _create(service, "CA1")
+        event = Event(
+            author="user",
+            invocation_id="inv1",
+            actions=EventActions(state_delta={"order": [{"item": "latte"}]}),
+        )
+        await service.append_event(session, event)
+        await service.delete_session(
+            app_name=APP_NAME, user_id="+1555", session_id="CA1"
+        )
+        await _create(service, "CA2")
+        await _create(service, "CA3")  # evicts CA2
+
+        archived = archive.load(APP_NAME, "+1555", "CA1")
+        assert archived.state == {"order": [{"item": "latte"}]}
+        assert len(archived.events) == 1
+        assert archive.load(APP_NAME, "+1555", "CA2") is not None
+        archive.close()
+
+
+def test_registry_runners_share_the_session_service():
+    """Test that runners built by the registry use the configured service."""
+    service = BoundedSessionService()
+    registry = RunnerRegistry()
+    registry.set_session_service(service)
+
+    runner = registry.runner(MagicMock(name="agent"))
+
+    assert isinstance(runner, Runner)
+    assert runner.session_service is service
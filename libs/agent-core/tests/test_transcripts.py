@@ -0,0 +1,131 @@
+"""Tests for transcripts module."""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+from google.adk.events import Event
+from google.genai.types import Transcription
+
+from agent_core.runtime.live_messaging import agent_to_client_fast
+from agent_core.runtime.transcripts import (
+    JsonlTranscriptWriter,
+    SQLiteTranscriptWriter,
+    TranscriptSink,
+)
+
+
+class SlowWriter:
+    """Writer which takes a while, like a busy disk"""
+
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write(self, fragments):
+        import time
+
+        time.sleep(0.05)
+        self.batches.append(list(fragments))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+class TestTranscriptSink:
+    """Tests for TranscriptSink."""
+
+    async def test_add_does_not_wait_for_the_writer(self):
+        """Test that adding fragments returns before anything is written."""
+        writer = SlowWriter()
+        sink = TranscriptSink(writer, flush_interval=0.01)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(100):
+            sink.add("CA1", "caller", f"word {i}")
+        assert loop.time() - start < 0.01
+        assert writer.batches == []
+
+        await asyncio.sleep(0.1)
+        await sink.close()
+
+        assert sum(map(len, writer.batches)) == 100
+        assert len(writer.batches) < 100  # written in batches
+        assert sink.written == 100 and sink.pending == 0
+        assert writer.closed
+
+    async def test_drops_fragments_over_max_pending(self):
+        """Test that memory stays bounded when the writer falls behind."""
+        sink = TranscriptSink(SlowWriter(), flush_interval=10, max_pending=3)
+
+        for _ in range(5):
+            sink.add("CA1", "agent", "hello")
+        await sink.close()
+
+        assert sink.written == 3
+        assert sink.dropped == 2
+
+    async def test_jsonl_writer(self, tmp_path):
+        """Test that fragments are appended as JSON lines."""
+        path = tmp_path / "transcripts.jsonl"
+        sink = TranscriptSink(JsonlTranscriptWriter(str(path)))
+
+        sink.add("CA1", "caller", "one latte please", finished=True)
+        sink.add("CA1", "agent", "Sure")
+        await sink.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(line["role"], line["text"]) for line in lines] == [
+            ("caller", "one latte please"),
+            ("agent", "Sure"),
+        ]
+        assert lines[0]["finished"] is True and lines[0]["call_id"] == "CA1"
+
+    async def test_sqlite_writer(self, tmp_path):
+        """Test that fragments are inserted into the transcripts table."""
+        path = tmp_path / "transcripts.db"
+        sink = TranscriptSink(SQLiteTranscriptWriter(str(path)))
+
+        sink.add("CA1", "caller", "hi")
+        await sink.flush()
+        sink.add("CA2", "agent", "hello")
+        await sink.close()
+
+        rows = sqlite3.connect(path).execute(
+            "SELECT call_id, role, text FROM transcripts ORDER BY rowid"
+        )
+        assert rows.fetchall() == [("CA1", "caller", "hi"), ("CA2", "agent", "hello")]
+
+
+@pytest.mark.asyncio
+async def test_agent_to_client_fast_forwards_transcriptions():
+    """Test that transcriptions reach on_transcript instead of being dropped."""
+    live_events = [
+        Event(author="user", input_transcription=Transcription(text="a latte")),
+        Event(
+            author="agent",
+            output_transcription=Transcription(text="Coming up", finished=True),
+        ),
+        Event(author="agent", turn_complete=True),
+    ]
+
+    async def event_generator():
+        for event in live_events:
+            yield event
+
+    agent_events, transcripts = [], []
+
+    async def on_agent_event(event):
+        agent_events.append(event.type)
+
+    await agent_to_client_fast(
+        on_agent_event,
+        event_generator(),
+        lambda role, text, finished: transcripts.append((role, text, finished)),
+    )
+
+    assert transcripts == [("caller", "a latte", False), ("agent", "Coming up", True)]
+    assert agent_events == ["complete"]